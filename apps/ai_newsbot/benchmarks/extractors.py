@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Compares the HTML-to-text extractors on a corpus of saved pages: speed per
+page, throughput, and how their output differs from the original
+BeautifulSoup extractor ('soup').
+
+Usage:
+    python benchmarks/extractors.py [--repeat 5] [--processes 4] [--dump out/]
+    python benchmarks/extractors.py --save https://example.com/news ...
+
+The optional extractors (selectolax, lxml) are included when installed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'src'))
+from extractor import EXTRACTORS, html_to_text
+
+REFERENCE = 'soup'
+_WORD = re.compile(r"\w+")
+
+def load_corpus(corpus_dir):
+    """Returns {file name: html} for every .html page in the corpus."""
+    pages = {}
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith('.html'):
+            with open(os.path.join(corpus_dir, name), 'r', encoding='utf-8', errors='replace') as f:
+                pages[name] = f.read()
+    return pages
+
+def save_pages(urls, corpus_dir):
+    """Downloads pages into the corpus (kept as served, for repeatable runs)."""
+    import httpx
+    os.makedirs(corpus_dir, exist_ok=True)
+    for url in urls:
+        response = httpx.get(url, follow_redirects=True, timeout=30)
+        response.raise_for_status()
+        parts = urlsplit(url)
+        name = re.sub(r'[^A-Za-z0-9]+', '_', f"{parts.netloc}{parts.path}").strip('_') + '.html'
+        with open(os.path.join(corpus_dir, name), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"Saved {url} -> {name} ({len(response.content) / 1024:.0f} KB)")
+
+def _words(text):
+    return set(_WORD.findall(text.lower()))
+
+def time_extractor(extract, html, repeat):
+    """Median milliseconds of one extraction."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(html)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def compare_outputs(text, reference):
+    """How an extractor's output relates to the reference output."""
+    words, reference_words = _words(text), _words(reference)
+    return {
+        'chars': len(text),
+        'lines': text.count('\n') + 1 if text else 0,
+        # Share of the reference's words still present (boilerplate removal lowers it)
+        'reference_recall': round(len(words & reference_words) / len(reference_words), 3) if reference_words else 1.0,
+        # Words the reference lacks, e.g. ones it glued together across tags
+        'new_words': len(words - reference_words),
+    }
+
+def process_pool_throughput(pages, extractor, processes, rounds):
+    """Pages per second extracting the corpus `rounds` times in-process vs in a process pool."""
+    batch = [html for _ in range(rounds) for html in pages.values()]
+    start = time.perf_counter()
+    for html in batch:
+        html_to_text(html, extractor)
+    in_process = len(batch) / (time.perf_counter() - start)
+    with ProcessPoolExecutor(processes) as executor:
+        list(executor.map(html_to_text, batch[:processes], [extractor] * processes))  # warm up the workers
+        start = time.perf_counter()
+        list(executor.map(html_to_text, batch, [extractor] * len(batch), chunksize=4))
+        pooled = len(batch) / (time.perf_counter() - start)
+    return {'in_process_pages_per_s': round(in_process, 1), 'process_pool_pages_per_s': round(pooled, 1)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML-to-text extractors")
+    parser.add_argument('--corpus', default=CORPUS_DIR, help="Directory of saved .html pages")
+    parser.add_argument('--extractors', nargs='+', default=list(EXTRACTORS), choices=list(EXTRACTORS))
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per page and extractor")
+    parser.add_argument('--processes', type=int, default=0, help="Also measure a process pool of this size")
+    parser.add_argument('--dump', default=None, help="Write each extractor's text here for diffing")
+    parser.add_argument('--save', nargs='+', metavar='URL', help="Download pages into the corpus and exit")
+    parser.add_argument('--output', default=None, help="Result file (default: benchmarks/results/<timestamp>_extractors.json)")
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages(args.save, args.corpus)
+        return
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        sys.exit(f"No .html pages in {args.corpus}")
+    total_kb = sum(len(html.encode('utf-8')) for html in pages.values()) / 1024
+    print(f"Corpus: {len(pages)} page(s), {total_kb:.0f} KB; extractors: {', '.join(args.extractors)}\n")
+
+    references = {name: EXTRACTORS[REFERENCE](html) for name, html in pages.items()}
+    results = {}
+    print(f"{'page':<28}{'extractor':<12}{'ms':>9}{'speedup':>9}{'chars':>8}{'recall':>8}{'new words':>11}")
+    for page, html in pages.items():
+        results[page] = {'kb': round(len(html.encode('utf-8')) / 1024, 1), 'extractors': {}}
+        for name in args.extractors:
+            extract = EXTRACTORS[name]
+            text = extract(html)
+            row = {'ms': round(time_extractor(extract, html, args.repeat), 3),
+                   **compare_outputs(text, references[page])}
+            results[page]['extractors'][name] = row
+            if args.dump:
+                os.makedirs(args.dump, exist_ok=True)
+                with open(os.path.join(args.dump, f"{page}.{name}.txt"), 'w', encoding='utf-8') as f:
+                    f.write(text)
+        reference_ms = results[page]['extractors'].get(REFERENCE, {}).get('ms')
+        for name, row in results[page]['extractors'].items():
+            speedup = f"{reference_ms / row['ms']:.1f}x" if reference_ms and row['ms'] else '-'
+            print(f"{page[:27]:<28}{name:<12}{row['ms']:>9.2f}{speedup:>9}{row['chars']:>8}"
+                  f"{row['reference_recall']:>8.2f}{row['new_words']:>11}")
+
+    totals = {}
+    print("\nWhole corpus:")
+    for name in args.extractors:
+        ms = sum(page['extractors'][name]['ms'] for page in results.values())
+        totals[name] = {'ms': round(ms, 2), 'mb_per_s': round(total_kb / 1024 / (ms / 1000), 2) if ms else None}
+        print(f"  {name:<12}{ms:>9.1f} ms  {totals[name]['mb_per_s']:>7} MB/s")
+
+    pool = {}
+    if args.processes:
+        print(f"\nProcess pool ({args.processes} processes, {os.cpu_count()} CPU(s)):")
+        for name in args.extractors:
+            pool[name] = process_pool_throughput(pages, name, args.processes, rounds=max(1, args.repeat))
+            print(f"  {name:<12}{pool[name]['in_process_pages_per_s']:>9} pages/s in process, "
+                  f"{pool[name]['process_pool_pages_per_s']} pages/s pooled")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'corpus_kb': round(total_kb, 1),
+        },
+        'pages': results,
+        'totals': totals,
+        'process_pool': pool,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_extractors.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+if __name__ == '__main__':
+    main()
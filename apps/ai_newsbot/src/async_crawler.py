@@ -0,0 +1,206 @@
+import asyncio
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+from extractor import DEFAULT_EXTRACTOR, EXTRACTORS, html_to_text
+
+# Crawl limits (all overridable from .env)
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", 20))  # requests in flight across all hosts
+CRAWL_PER_HOST_CONCURRENCY = int(os.getenv("CRAWL_PER_HOST_CONCURRENCY", 2))  # requests in flight per host
+CRAWL_HOST_DELAY_SECONDS = float(os.getenv("CRAWL_HOST_DELAY_SECONDS", 1.0))  # min gap between requests to a host
+CRAWL_TIMEOUT_SECONDS = float(os.getenv("CRAWL_TIMEOUT_SECONDS", 10))  # per request
+CRAWL_DEADLINE_SECONDS = float(os.getenv("CRAWL_DEADLINE_SECONDS", 600))  # whole crawl
+CRAWL_EXTRACT_PROCESSES = int(os.getenv("CRAWL_EXTRACT_PROCESSES", 0))  # 0 extracts text in threads
+CRAWL_USER_AGENT = os.getenv("CRAWL_USER_AGENT", "AI_NewsBot_Aladdin/1.0 (+https://homecouver.com)")
+
+# One source to crawl, with the validators of its last processed response (ETag / Last-Modified)
+CrawlSource = namedtuple("CrawlSource", ["id", "url", "source_type", "etag", "last_modified"],
+                         defaults=(None, None))
+# A downloaded page; on a 304 content is None and the validators are the ones still current
+Page = namedtuple("Page", ["content", "not_modified", "etag", "last_modified", "body_bytes"])
+# The outcome of crawling a source (content is None on error or when not modified);
+# extractor names the HTML extractor that produced a website's content
+CrawlResult = namedtuple("CrawlResult", ["source", "content", "error", "elapsed_seconds",
+                                         "not_modified", "etag", "last_modified", "body_bytes", "extractor"],
+                         defaults=(False, None, None, 0, None))
+
+class ExtractionError(Exception):
+    """The HTML extractor failed on a downloaded page."""
+
+class _HostGate:
+    """Per-host politeness: at most `concurrency` requests in flight, started at least `delay` seconds apart."""
+
+    def __init__(self, concurrency, delay):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self.next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            # Reserve the next start time before sleeping so waiters queue up in order
+            start = max(loop.time(), self.next_start)
+            self.next_start = start + self.delay
+            await asyncio.sleep(start - loop.time())
+            yield
+
+class AsyncCrawler:
+    """Fetches many sources concurrently over one pooled HTTP client."""
+
+    def __init__(self, concurrency=CRAWL_CONCURRENCY, per_host_concurrency=CRAWL_PER_HOST_CONCURRENCY,
+                 host_delay=CRAWL_HOST_DELAY_SECONDS, timeout=CRAWL_TIMEOUT_SECONDS, user_agent=CRAWL_USER_AGENT,
+                 extractor=DEFAULT_EXTRACTOR, extract_processes=CRAWL_EXTRACT_PROCESSES):
+        if extractor not in EXTRACTORS:
+            raise ValueError(f"Unknown HTML extractor '{extractor}' (available: {', '.join(EXTRACTORS)})")
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.extractor = extractor
+        self.extract_processes = extract_processes
+        self.client = None
+        self._semaphore = None
+        self._executor = None  # None runs extraction in the default thread pool
+        self._hosts = {}
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": self.user_agent},
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        if self.extract_processes:
+            # Extraction is pure CPU work; processes let it use more than one core
+            self._executor = ProcessPoolExecutor(self.extract_processes)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, cancel_futures=True)
+            self._executor = None
+
+    def _host_gate(self, url):
+        host = urlsplit(url).netloc.lower()
+        gate = self._hosts.get(host)
+        if gate is None:
+            gate = self._hosts[host] = _HostGate(self.per_host_concurrency, self.host_delay)
+        return gate
+
+    async def fetch_page(self, url, etag=None, last_modified=None):
+        """
+        Fetches a page and extracts its text (raises httpx.HTTPError on failure, or
+        ExtractionError if the extractor fails on the page).
+
+        With the validators of the last response the request is conditional: if the
+        server answers 304 Not Modified, nothing is downloaded or parsed.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        # Wait for the host's turn before taking one of the global slots
+        async with self._host_gate(url).slot():
+            async with self._semaphore:
+                response = await self.client.get(url, headers=headers)
+        if response.status_code == 304 and headers:
+            # A 304 may refresh the validators; otherwise the ones we sent stay valid
+            return Page(None, True, response.headers.get("ETag", etag),
+                        response.headers.get("Last-Modified", last_modified), 0)
+        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
+        # Parsing is CPU-bound; keep it off the event loop so other downloads progress
+        try:
+            content = await asyncio.get_running_loop().run_in_executor(
+                self._executor, html_to_text, response.text, self.extractor)
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            # One malformed page must not end the crawl of the other sources
+            raise ExtractionError(f"{self.extractor} extractor failed: {type(e).__name__}: {e}") from e
+        return Page(content, False, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                    len(response.content))
+
+    async def fetch_website_content(self, url):
+        """Fetches a page and extracts its text (raises httpx.HTTPError on failure)."""
+        return (await self.fetch_page(url)).content
+
+    async def fetch(self, source):
+        """Fetches one source, returning a CrawlResult instead of raising."""
+        started = time.perf_counter()
+        page, content, error = None, None, None
+        try:
+            if source.source_type == 'website':
+                page = await self.fetch_page(source.url, source.etag, source.last_modified)
+                content = page.content
+            elif source.source_type == 'document':
+                content = await asyncio.to_thread(_read_document, source.url)
+            else:
+                error = f"Unsupported source type: {source.source_type}"
+        except (httpx.HTTPError, OSError, UnicodeDecodeError, BrokenProcessPool, ExtractionError) as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - started
+        if page is None:
+            return CrawlResult(source, content, error, elapsed)
+        return CrawlResult(source, content, error, elapsed, page.not_modified, page.etag, page.last_modified,
+                           page.body_bytes, self.extractor)
+
+    async def crawl(self, sources, deadline=CRAWL_DEADLINE_SECONDS):
+        """
+        Fetches all sources concurrently and yields a CrawlResult for each as soon as it finishes.
+
+        Sources still unfinished when `deadline` seconds have passed are cancelled and
+        yielded last with error 'deadline exceeded'; ones that finished meanwhile are
+        yielded as usual.
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + deadline
+        tasks = {asyncio.ensure_future(self.fetch(source)): source for source in sources}
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = end - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+            if pending:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                # Some finished while the caller was handling earlier results; keep those
+                finished = [task for task in pending if not task.cancelled()]
+                timed_out = [task for task in pending if task.cancelled()]
+                pending = set()
+                for task in finished:
+                    yield task.result()
+                for task in timed_out:
+                    yield CrawlResult(tasks[task], None, "deadline exceeded", deadline)
+        finally:
+            # Also reached when the caller stops iterating early
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+def _read_document(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+async def crawl_sources(sources, deadline=CRAWL_DEADLINE_SECONDS, **crawler_options):
+    """Crawls sources with a new AsyncCrawler and returns all results (in completion order)."""
+    async with AsyncCrawler(**crawler_options) as crawler:
+        return [result async for result in crawler.crawl(sources, deadline)]
@@ -1,5 +1,26 @@
 
+import base64
+import difflib
 import hashlib
+import heapq
+import json
+import os
+import re
+from collections import namedtuple
+
+# A change is meaningful when the page's word shingles are less similar than this to the
+# baseline, or when paragraphs with at least CHANGE_MIN_NEW_WORDS new words in total appeared
+CHANGE_SIMILARITY_THRESHOLD = float(os.getenv("CHANGE_SIMILARITY_THRESHOLD", 0.9))
+CHANGE_MIN_NEW_WORDS = int(os.getenv("CHANGE_MIN_NEW_WORDS", 25))
+CHANGE_CONTEXT_PARAGRAPHS = int(os.getenv("CHANGE_CONTEXT_PARAGRAPHS", 1))  # Unchanged paragraphs kept around a change
+SHINGLE_SIZE = 4  # Words per shingle
+MINHASH_SIZE = 128  # Hashes kept in the MinHash sketch (1 KB per source)
+
+# Outcome of comparing a page with its baseline fingerprint
+ChangeReport = namedtuple("ChangeReport", ["changed", "similarity", "added_paragraphs", "removed_paragraphs",
+                                           "fingerprint"])
+
+_WORD = re.compile(r"\w+")
 
 def calculate_sha256(content):
     """Calculates the SHA256 hash of the given content."""
@@ -21,6 +42,97 @@ def detect_change(current_content, last_hash):
     else:
         return False, current_hash
 
+def _words(text):
+    return _WORD.findall(text.lower())
+
+def _hash(text, size):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=size).digest(), "big")
+
+def minhash(words, size=MINHASH_SIZE):
+    """Bottom-k MinHash sketch: the `size` smallest 64-bit hashes of the word shingles, sorted."""
+    count = max(1, len(words) - SHINGLE_SIZE + 1) if words else 0
+    shingles = {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(count)}
+    return heapq.nsmallest(size, {_hash(shingle, 8) for shingle in shingles})
+
+def minhash_similarity(a, b, size=MINHASH_SIZE):
+    """Estimated Jaccard similarity of the shingle sets behind two MinHash sketches."""
+    if not a and not b:
+        return 1.0
+    a, b = set(a), set(b)
+    union = heapq.nsmallest(size, a | b)
+    return sum(1 for h in union if h in a and h in b) / len(union)
+
+def _paragraphs(text):
+    """Paragraphs (non-empty lines) with a 32-bit key of their words, first occurrence only."""
+    paragraphs = {}
+    for line in text.splitlines():
+        words = _words(line)
+        if words:
+            paragraphs.setdefault(_hash(' '.join(words), 4), (line.strip(), len(words)))
+    return paragraphs
+
+def _pack(values, size):
+    return base64.b64encode(b"".join(value.to_bytes(size, "big") for value in values)).decode("ascii")
+
+def _unpack(packed, size):
+    data = base64.b64decode(packed)
+    return [int.from_bytes(data[i:i + size], "big") for i in range(0, len(data), size)]
+
+def _fingerprint(sketch, paragraphs):
+    return json.dumps({"minhash": _pack(sketch, 8), "paragraphs": _pack(paragraphs, 4)})
+
+def calculate_fingerprint(content):
+    """Compact fingerprint of the content: a MinHash sketch plus one key per paragraph (JSON)."""
+    return _fingerprint(minhash(_words(content)), _paragraphs(content))
+
+def detect_meaningful_change(current_content, last_fingerprint, threshold=CHANGE_SIMILARITY_THRESHOLD,
+                             min_new_words=CHANGE_MIN_NEW_WORDS):
+    """
+    Compares content with the fingerprint of a baseline, ignoring small edits (timestamps,
+    counters, rotating ads) that exact hashing would report as changes.
+
+    Returns a ChangeReport with the estimated similarity, the paragraphs that are new or
+    edited, the number of baseline paragraphs that are gone and the content's fingerprint.
+    """
+    sketch, paragraphs = minhash(_words(current_content)), _paragraphs(current_content)
+    fingerprint = _fingerprint(sketch, paragraphs)
+    try:
+        last = json.loads(last_fingerprint) if last_fingerprint else None
+        last_sketch, last_paragraphs = _unpack(last["minhash"], 8), set(_unpack(last["paragraphs"], 4))
+    except (TypeError, KeyError, ValueError):
+        # No usable baseline: everything is new
+        return ChangeReport(True, 0.0, [text for text, _ in paragraphs.values()], 0, fingerprint)
+
+    similarity = minhash_similarity(sketch, last_sketch)
+    added = [(text, words) for key, (text, words) in paragraphs.items() if key not in last_paragraphs]
+    removed = len(last_paragraphs - paragraphs.keys())
+    changed = similarity < threshold or sum(words for _, words in added) >= min_new_words
+    return ChangeReport(changed, round(similarity, 3), [text for text, _ in added], removed, fingerprint)
+
+def changed_sections(previous_content, current_content, context=CHANGE_CONTEXT_PARAGRAPHS):
+    """
+    Paragraph-level diff: the new or edited paragraphs of current_content, grouped into sections
+    of consecutive paragraphs with up to `context` unchanged paragraphs before and after each.
+    Removed paragraphs are left out (there is nothing new to say about them).
+    """
+    def paragraphs(text):
+        lines = [(' '.join(_words(line)), line.strip()) for line in text.splitlines()]
+        return [(key, line) for key, line in lines if key]
+
+    old, new = paragraphs(previous_content), paragraphs(current_content)
+    # Compare normalized words, so whitespace and punctuation-only edits don't count
+    matcher = difflib.SequenceMatcher(None, [key for key, _ in old], [key for key, _ in new], autojunk=False)
+    ranges = []
+    for tag, _, _, start, end in matcher.get_opcodes():
+        if tag not in ("replace", "insert"):
+            continue
+        start, end = max(0, start - context), min(len(new), end + context)
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    return ['\n'.join(line for _, line in new[start:end]) for start, end in ranges]
+
 if __name__ == '__main__':
     # Example usage
     content1 = "This is some sample content."
@@ -47,3 +159,12 @@ if __name__ == '__main__':
     changed, new_hash = detect_change(None, "some_hash")
     print(f"Test 4 (Empty content): Changed={changed}, New Hash={new_hash}")
 
+    # Test 5: A new timestamp is not a meaningful change, a new paragraph is
+    page = "Renovation news\nUpdated 10:02\n" + "City council approves faster permits for basement suites. " * 20
+    baseline = calculate_fingerprint(page)
+    report = detect_meaningful_change(page.replace("10:02", "10:07"), baseline)
+    print(f"\nTest 5 (Timestamp): Changed={report.changed}, Similarity={report.similarity}, Added={report.added_paragraphs}")
+    update = page + "\nThe province will also fund heat pump rebates for homeowners who add a legal suite this year, starting in January with a new online application."
+    report = detect_meaningful_change(update, baseline)
+    print(f"Test 6 (New paragraph): Changed={report.changed}, Similarity={report.similarity}, Added={report.added_paragraphs}")
+
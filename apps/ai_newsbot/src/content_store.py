@@ -0,0 +1,31 @@
+import gzip
+import hashlib
+import os
+
+class ContentStore:
+    """Keeps the last extracted text of each source, gzip-compressed, one file per source."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, source_id):
+        # Source IDs can be URLs; hash them into safe file names
+        name = hashlib.blake2b(source_id.encode("utf-8"), digest_size=12).hexdigest()
+        return os.path.join(self.directory, f"{name}.txt.gz")
+
+    def load(self, source_id):
+        """Returns the stored text of a source, or None if there is none (or it is unreadable)."""
+        try:
+            with gzip.open(self._path(source_id), "rt", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+
+    def save(self, source_id, text):
+        """Stores the text of a source, replacing the previous one atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(source_id)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
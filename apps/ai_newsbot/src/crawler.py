@@ -1,25 +1,15 @@
 
 import requests
-from bs4 import BeautifulSoup
 import os
 
+from extractor import html_to_text
+
 def fetch_website_content(url):
     """Fetches content from a given URL."""
     try:
         response = requests.get(url, timeout=10)
         response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        # Extract text from common content areas, ignoring scripts and styles
-        for script in soup(["script", "style"]):
-            script.extract()
-        text = soup.get_text()
-        # Break into lines and remove leading/trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        return text
+        return html_to_text(response.text)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching {url}: {e}")
         return None
@@ -1,6 +1,6 @@
 
 import os
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Boolean
+from sqlalchemy import create_engine, inspect, text, Column, String, Text, DateTime, Boolean, Integer
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -17,7 +17,33 @@ class Source(Base):
     monitoring_frequency_seconds = Column(String, default=3600) # How often to check
     last_checked = Column(DateTime, default=datetime.now)
     last_hash = Column(String)
+    extractor = Column(String) # HTML extractor whose text last_hash was computed from
+    fingerprint = Column(Text) # Similarity fingerprint of the content posts were last generated for
     is_active = Column(Boolean, default=True)
+    # Validators of the last processed response, sent back as If-None-Match / If-Modified-Since
+    etag = Column(String)
+    last_modified = Column(String)
+    # Conditional fetch statistics
+    content_bytes = Column(Integer, default=0) # Body size of the last full download
+    fetch_count = Column(Integer, default=0)
+    not_modified_count = Column(Integer, default=0) # 304 responses
+    bytes_downloaded = Column(Integer, default=0)
+    bytes_saved = Column(Integer, default=0) # Bodies not downloaded thanks to a 304
+
+    @property
+    def not_modified_rate(self):
+        """Share of fetches answered with 304 Not Modified."""
+        return (self.not_modified_count or 0) / self.fetch_count if self.fetch_count else 0.0
+
+    def record_fetch(self, not_modified, body_bytes=0):
+        """Updates the fetch statistics (a 304 saves downloading the last body again)."""
+        self.fetch_count = (self.fetch_count or 0) + 1
+        if not_modified:
+            self.not_modified_count = (self.not_modified_count or 0) + 1
+            self.bytes_saved = (self.bytes_saved or 0) + (self.content_bytes or 0)
+        else:
+            self.bytes_downloaded = (self.bytes_downloaded or 0) + body_bytes
+            self.content_bytes = body_bytes
 
     def __repr__(self):
         return f"<Source(url='{self.url}', type='{self.source_type}')>"
@@ -36,11 +62,28 @@ class GeneratedPost(Base):
     def __repr__(self):
         return f"<GeneratedPost(platform='{self.platform}', status='{self.status}')>"
 
+def add_missing_columns(engine):
+    """Adds model columns missing from existing tables (create_all only creates new tables)."""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                if column.default is not None and isinstance(column.default.arg, int):
+                    ddl += f" DEFAULT {int(column.default.arg)}"
+                connection.execute(text(ddl))
+
 def init_db(db_path='aladdin-sandbox/apps/ai_newsbot/data/newsbot.db'):
     # Ensure the directory exists
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     engine = create_engine(f'sqlite:///{db_path}')
     Base.metadata.create_all(engine)
+    add_missing_columns(engine)
     Session = sessionmaker(bind=engine)
     return Session
 
@@ -0,0 +1,141 @@
+import os
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+# Elements that never hold article text: code, embeds and page chrome (menus, footers, sidebars)
+BOILERPLATE_TAGS = ("script", "style", "noscript", "template", "svg", "iframe", "nav", "footer", "aside")
+# Elements that start a new line of text
+BLOCK_TAGS = frozenset((
+    "address", "article", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure", "h1", "h2",
+    "h3", "h4", "h5", "h6", "header", "hr", "li", "main", "ol", "p", "pre", "section", "table", "td", "th",
+    "title", "tr", "ul",
+))
+
+_SPACES = re.compile(r"[ \t\r\f\v\xa0]+")
+
+def _clean_lines(text):
+    """Strips each line, collapses runs of spaces and drops blank lines."""
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+def soup_html_to_text(html):
+    """Extracts readable text with BeautifulSoup's html.parser (the original, slow extractor)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    # Extract text from common content areas, ignoring scripts and styles
+    for script in soup(["script", "style"]):
+        script.extract()
+    text = soup.get_text()
+    # Break into lines and remove leading/trailing space on each
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Drop blank lines
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+class _TextCollector(HTMLParser):
+    """Collects text while the page is tokenized, without building a tree."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0  # > 0 while inside a boilerplate element
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BOILERPLATE_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing tags (<br/>, <svg/>) have no content to skip
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in BOILERPLATE_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+def stream_html_to_text(html):
+    """Extracts readable text in one streaming pass with the standard library tokenizer."""
+    collector = _TextCollector()
+    collector.feed(html)
+    collector.close()
+    return _clean_lines(''.join(collector.parts))
+
+EXTRACTORS = {"soup": soup_html_to_text, "stream": stream_html_to_text}
+
+# Optional C-based parsers, used when installed (pip install selectolax / lxml)
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    _BLOCK_SELECTOR = ','.join(sorted(BLOCK_TAGS))
+
+    def selectolax_html_to_text(html):
+        """Extracts readable text with selectolax (lexbor, C)."""
+        tree = LexborHTMLParser(html)
+        if tree.root is None:
+            return ''
+        tree.strip_tags(list(BOILERPLATE_TAGS))
+        # Line breaks around blocks, so adjacent paragraphs don't run together
+        for node in tree.css(_BLOCK_SELECTOR):
+            node.insert_before("\n")
+            node.insert_after("\n")
+        return _clean_lines(tree.root.text(separator='', strip=False))
+
+    EXTRACTORS["selectolax"] = selectolax_html_to_text
+except ImportError:
+    pass
+
+try:
+    import lxml.html
+    from lxml import etree
+
+    # Parse UTF-8 bytes: lxml refuses str input that carries an XML encoding declaration
+    _LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+    def lxml_html_to_text(html):
+        """Extracts readable text with lxml (libxml2, C)."""
+        try:
+            tree = lxml.html.document_fromstring(html.encode('utf-8', 'replace'), parser=_LXML_PARSER)
+        except etree.ParserError:  # Empty document
+            return ''
+        etree.strip_elements(tree, *BOILERPLATE_TAGS, etree.Comment, with_tail=False)
+        parts = []
+        for event, element in etree.iterwalk(tree, events=("start", "end")):
+            if event == "start":
+                if element.tag in BLOCK_TAGS:
+                    parts.append("\n")
+                if element.text:
+                    parts.append(element.text)
+            else:
+                if element.tag in BLOCK_TAGS:
+                    parts.append("\n")
+                if element.tail:
+                    parts.append(element.tail)
+        return _clean_lines(''.join(parts))
+
+    EXTRACTORS["lxml"] = lxml_html_to_text
+except ImportError:
+    pass
+
+# Fastest available extractor unless HTML_EXTRACTOR picks one
+DEFAULT_EXTRACTOR = os.getenv("HTML_EXTRACTOR") or next(
+    name for name in ("selectolax", "lxml", "stream") if name in EXTRACTORS)
+if DEFAULT_EXTRACTOR not in EXTRACTORS:
+    # Fail at startup rather than on every page of every crawl
+    raise ValueError(f"HTML_EXTRACTOR '{DEFAULT_EXTRACTOR}' is not available (available: {', '.join(EXTRACTORS)})")
+
+def html_to_text(html, extractor=None):
+    """Extracts readable text from an HTML page, one phrase per line."""
+    name = extractor or DEFAULT_EXTRACTOR
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown HTML extractor '{name}' (available: {', '.join(EXTRACTORS)})")
+    return EXTRACTORS[name](html)
@@ -1,16 +1,21 @@
 
 import time
 import os
+import asyncio
 from datetime import datetime
 from dotenv import load_dotenv
 import json
+from collections import namedtuple
 
 from database import init_db, Source, GeneratedPost
-from crawler import fetch_content
-from change_detector import detect_change, calculate_sha256
+from async_crawler import AsyncCrawler, CrawlSource, CRAWL_DEADLINE_SECONDS
+from extractor import DEFAULT_EXTRACTOR
+from change_detector import calculate_fingerprint, changed_sections, detect_change, detect_meaningful_change
+from content_store import ContentStore
 from summarizer_generator import SummarizerGenerator
 from publisher import save_post_locally
 from scheduler import NewsBotScheduler
+from integrations.record_ids import new_ulid  # Shared with the backend; needs apps/ on PYTHONPATH
 
 # Load environment variables from .env file
 load_dotenv()
@@ -20,54 +25,118 @@ load_dotenv()
 DB_PATH = os.getenv("DB_PATH", "aladdin-sandbox/apps/ai_newsbot/data/newsbot.db")
 MONITORING_INTERVAL_SECONDS = int(os.getenv("MONITORING_INTERVAL_SECONDS", 3600)) # Default to 1 hour
 USE_MOCK_AI = os.getenv("USE_MOCK_AI", "True").lower() == "true"
+# Compressed text of each source as of its last posts, for diff-only summarization
+CONTENT_STORE_DIR = os.getenv("CONTENT_STORE_DIR", os.path.join(os.path.dirname(DB_PATH), "content"))
 
 # Initialize DB Session
 Session = init_db(DB_PATH)
+content_store = ContentStore(CONTENT_STORE_DIR)
+
+# What a source's new content is compared with: exact hash, its extractor and similarity fingerprint
+Baseline = namedtuple("Baseline", ["hash", "extractor", "fingerprint"])
+
+def update_source(session, source_id, result, new_hash=None, fingerprint=None):
+    """
+    Records a fetch on the source. Once its content is handled (new_hash given), also stores
+    the hash, the validators for the next conditional request and the check time. A fingerprint
+    is only stored when it becomes the new baseline for change detection.
+    """
+    source = session.query(Source).filter_by(id=source_id).first()
+    if source is None:
+        return
+    if result.source.source_type == 'website':
+        source.record_fetch(result.not_modified, result.body_bytes)
+    if new_hash is not None:
+        source.last_hash = new_hash
+        source.extractor = result.extractor
+        source.etag, source.last_modified = result.etag, result.last_modified
+        source.last_checked = datetime.now()
+    if fingerprint is not None:
+        source.fingerprint = fingerprint
+
+def record_fetch(source_id, result, new_hash=None, fingerprint=None):
+    """Saves a fetch that generated no posts (see update_source)."""
+    session = Session()
+    try:
+        update_source(session, source_id, result, new_hash, fingerprint)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"Error updating source {source_id}: {e}")
+    finally:
+        session.close()
 
-def process_source(source_id, source_url, source_type, last_hash):
-    """Fetches content, detects changes, generates posts, and saves them locally."""
-    print(f"🔍 Checking {source_url} ...")
-    current_content = fetch_content(source_url, source_type)
-
-    if current_content:
-        changed, new_hash = detect_change(current_content, last_hash)
-
-        if changed:
+def process_content(source_id, source_url, baseline, current_content, result):
+    """Detects changes in fetched content, generates posts, and saves them locally."""
+    if result.not_modified:
+        # 304: nothing was downloaded, so there is nothing to parse, hash or generate
+        record_fetch(source_id, result, baseline.hash)
+        print(f"⏭️  Not modified: {source_url}")
+    elif current_content:
+        changed, new_hash = detect_change(current_content, baseline.hash)
+        report = None
+        if changed and baseline.hash is not None and result.extractor != baseline.extractor:
+            # Another extractor formats the same page differently; that is not news
+            record_fetch(source_id, result, new_hash, calculate_fingerprint(current_content))
+            content_store.save(source_id, current_content)
+            print(f"🔁 Extractor changed to {result.extractor} for {source_url}; new baseline stored.")
+            return
+        if changed and baseline.hash is not None:
+            # Not byte-identical; only pay for generation if the change is meaningful
+            report = detect_meaningful_change(current_content, baseline.fingerprint)
+            changed = report.changed
+            print(f"📝 {source_url}: similarity {report.similarity:.2f}, "
+                  f"{len(report.added_paragraphs)} new/edited and {report.removed_paragraphs} removed paragraph(s)")
+            for paragraph in report.added_paragraphs[:5]:
+                print(f"    + {paragraph[:100]}")
+
+        # Only the new or edited sections go to the model when the last posted text is known
+        previous_content = content_store.load(source_id) if changed and baseline.hash is not None else None
+        sections = changed_sections(previous_content, current_content) if previous_content is not None else None
+
+        if changed and sections == []:
+            # Content was only removed: nothing to post about, but the shorter page is the new baseline
+            record_fetch(source_id, result, new_hash, report.fingerprint if report else calculate_fingerprint(current_content))
+            content_store.save(source_id, current_content)
+            print(f"No new content for {source_url} (only removals); baseline updated.")
+        elif changed:
             print(f"🆕 Change detected for {source_url} → Generating posts...")
             generator = SummarizerGenerator(use_mock=USE_MOCK_AI)
-            generated_posts = generator.generate_posts(current_content, source_url)
+            generated_posts = generator.generate_posts(current_content, source_url, sections)
 
             if generated_posts:
                 session = Session()
                 try:
                     for platform, post_content in generated_posts.items():
                         generated_at = datetime.now()
+                        # ULID suffix: unique even for posts generated in the same second
+                        post_id = f"{source_id}_{platform}_{new_ulid()}"
                         metadata = {"source_id": source_id, "source_url": source_url, "ai_model": generator.model}
                         file_path = save_post_locally(
                             platform=platform,
                             post_content=post_content,
                             source_id=source_id,
                             generated_at=generated_at,
-                            metadata_json=json.dumps(metadata)
+                            metadata_json=json.dumps(metadata),
+                            post_id=post_id
                         )
                         if file_path:
                             new_post = GeneratedPost(
-                                id=f"{source_id}_{platform}_{generated_at.strftime("%Y%m%d%H%M%S")}",
+                                id=post_id,
                                 source_id=source_id,
                                 platform=platform,
                                 content=post_content,
                                 metadata_json=json.dumps(metadata),
                                 generated_at=generated_at,
-                                status=\'pending_review\'
+                                status='pending_review'
                             )
                             session.add(new_post)
                     
-                    # Update source with new hash and last checked time
-                    source = session.query(Source).filter_by(id=source_id).first()
-                    if source:
-                        source.last_hash = new_hash
-                        source.last_checked = datetime.now()
+                    # Update source with new hash, validators, fingerprint and last checked time
+                    fingerprint = report.fingerprint if report else calculate_fingerprint(current_content)
+                    update_source(session, source_id, result, new_hash, fingerprint)
                     session.commit()
+                    content_store.save(source_id, current_content)
                     print(f"✅ Posts saved and source updated for {source_url}")
                 except Exception as e:
                     session.rollback()
@@ -75,12 +144,35 @@ def process_source(source_id, source_url, source_type, last_hash):
                 finally:
                     session.close()
             else:
+                # Keep the old hash and validators so the change is picked up again next run
+                record_fetch(source_id, result)
                 print(f"❌ No posts generated for {source_url}")
         else:
+            # Keep the fingerprint: small edits add up until they are worth a post
+            record_fetch(source_id, result, new_hash)
             print(f"No significant change detected for {source_url}.")
     else:
         print(f"Skipping {source_url} due to content fetching error.")
 
+async def crawl_and_process(due_sources, baselines):
+    """Crawls due sources concurrently and processes each one as soon as its content arrives."""
+    print(f"🔍 Checking {len(due_sources)} source(s) ...")
+    started = time.perf_counter()
+    failed = not_modified = 0
+    async with AsyncCrawler() as crawler:
+        async for result in crawler.crawl(due_sources, CRAWL_DEADLINE_SECONDS):
+            source = result.source
+            if result.error:
+                failed += 1
+                print(f"Skipping {source.url} due to content fetching error: {result.error}")
+                continue
+            not_modified += result.not_modified
+            # Post generation and DB writes block; run them in a thread so downloads keep going
+            await asyncio.to_thread(process_content, source.id, source.url, baselines[source.id],
+                                    result.content, result)
+    print(f"🏁 Checked {len(due_sources)} source(s) in {time.perf_counter() - started:.1f}s "
+          f"({failed} failed, {not_modified} not modified)")
+
 def main_job():
     """The main job executed by the scheduler."""
     print(f"\n--- Running AI_NewsBot_Aladdin job at {datetime.now()} ---")
@@ -105,17 +197,28 @@ def main_job():
             else:
                 print("Default sample source already exists.")
 
+        due_sources, baselines = [], {}
         for source in sources:
-            # Check if enough time has passed since last check
-            if (datetime.now() - source.last_checked).total_seconds() >= source.monitoring_frequency_seconds:
-                process_source(source.id, source.url, source.source_type, source.last_hash)
+            # Check if enough time has passed since last check (the column is stored as text)
+            frequency_seconds = float(source.monitoring_frequency_seconds)
+            elapsed_seconds = (datetime.now() - source.last_checked).total_seconds()
+            if elapsed_seconds >= frequency_seconds:
+                # Validators only hold while the stored hash comes from the current extractor
+                validators = (source.etag, source.last_modified) if source.extractor == DEFAULT_EXTRACTOR else ()
+                due_sources.append(CrawlSource(source.id, source.url, source.source_type, *validators))
+                baselines[source.id] = Baseline(source.last_hash, source.extractor, source.fingerprint)
             else:
-                print(f"Skipping {source.url}. Next check in {int(source.monitoring_frequency_seconds - (datetime.now() - source.last_checked).total_seconds())} seconds.")
+                print(f"Skipping {source.url}. Next check in {int(frequency_seconds - elapsed_seconds)} seconds.")
     except Exception as e:
         print(f"Error in main_job: {e}")
+        return
     finally:
         session.close()
 
+    if due_sources:
+        # Fan out across all due sources at once
+        asyncio.run(crawl_and_process(due_sources, baselines))
+
 if __name__ == '__main__':
     print("Starting AI_NewsBot_Aladdin MVP...")
     
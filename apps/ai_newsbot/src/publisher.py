@@ -3,13 +3,14 @@ import os
 from datetime import datetime
 import json
 
-def save_post_locally(platform, post_content, source_id, generated_at, metadata_json=None):
-    """Saves a generated social media post to a local file."""
+def save_post_locally(platform, post_content, source_id, generated_at, metadata_json=None, post_id=None):
+    """Saves a generated social media post to a local file (named after post_id when given)."""
     output_dir = f"aladdin-sandbox/apps/ai_newsbot/output/{platform}"
     os.makedirs(output_dir, exist_ok=True)
 
     timestamp_str = generated_at.strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp_str}.md" # Using .md for markdown content
+    # Using .md for markdown content; the post ID keeps same-second posts from overwriting each other
+    filename = f"{timestamp_str}_{post_id}.md" if post_id else f"{timestamp_str}.md"
     file_path = os.path.join(output_dir, filename)
 
     try:
@@ -2,10 +2,13 @@
 import os
 from openai import OpenAI
 from dotenv import load_dotenv
+from token_budget import count_tokens, fit_to_budget
 import json
 
 load_dotenv()
 
+MAX_PROMPT_TOKENS = int(os.getenv("MAX_PROMPT_TOKENS", 3000))  # Whole user prompt, checked before each request
+
 class SummarizerGenerator:
     def __init__(self, use_mock=True):
         self.use_mock = use_mock
@@ -15,13 +18,26 @@ class SummarizerGenerator:
             )
         self.model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini") # Using gpt-4.1-mini as per environment variable hint
 
-    def generate_posts(self, content, source_url):
-        """Summarizes content and generates social media posts in Persian."""
+    def generate_posts(self, content, source_url, changed_sections=None):
+        """
+        Summarizes content and generates social media posts in Persian.
+
+        With changed_sections (the new or edited parts of a page seen before), only those are
+        sent to the model instead of the whole page. Either way the prompt is cut to
+        MAX_PROMPT_TOKENS before the request is made.
+        """
+        updates_only = changed_sections is not None
+        overhead = count_tokens(self._build_prompt("", source_url, updates_only), self.model)
+        prompt_content, truncated = fit_to_budget(changed_sections if updates_only else [content],
+                                                  MAX_PROMPT_TOKENS - overhead, self.model)
+        sending = f"{len(changed_sections)} changed section(s)" if updates_only else "full page"
+        print(f"✂️  Sending {sending}: ~{count_tokens(prompt_content, self.model) + overhead} of {MAX_PROMPT_TOKENS} prompt tokens "
+              f"(page ~{count_tokens(content, self.model)}){', truncated' if truncated else ''}")
         if self.use_mock:
             print("Using mock OpenAI API response.")
-            return self._mock_generate_posts(content, source_url)
+            return self._mock_generate_posts(prompt_content, source_url)
         else:
-            return self._real_generate_posts(content, source_url)
+            return self._real_generate_posts(prompt_content, source_url, updates_only)
 
     def _mock_generate_posts(self, content, source_url):
         """Generates mock social media posts for testing."""
@@ -33,11 +49,17 @@ class SummarizerGenerator:
         }
         return mock_posts
 
-    def _real_generate_posts(self, content, source_url):
-        """Generates social media posts using the OpenAI API."""
-        prompt = f"""You are an AI assistant for a news bot. Your task is to summarize the following content and generate three short, engaging social media posts in Persian. Each post should be tailored for a specific platform: LinkedIn, Instagram, and Twitter (X). The posts should highlight the key information from the content. The output should be a JSON object with keys 'linkedin', 'instagram', and 'twitter'.
+    def _build_prompt(self, content, source_url, updates_only=False):
+        """User prompt for the model; updates_only when content holds just the changed sections of the page."""
+        if updates_only:
+            task = "summarize what is new in the following content"
+            intro = f"New or changed sections of {source_url} since it was last checked (sections are separated by [...]; lines around each change are included for context):"
+        else:
+            task = "summarize the following content"
+            intro = f"Content from {source_url}:"
+        return f"""You are an AI assistant for a news bot. Your task is to {task} and generate three short, engaging social media posts in Persian. Each post should be tailored for a specific platform: LinkedIn, Instagram, and Twitter (X). The posts should highlight the key information from the content. The output should be a JSON object with keys 'linkedin', 'instagram', and 'twitter'.
 
-Content from {source_url}:
+{intro}
 {content}
 
 Example Output Format:
@@ -47,6 +69,10 @@ Example Output Format:
   "twitter": "[Twitter Post in Persian]"
 }}
 """
+
+    def _real_generate_posts(self, content, source_url, updates_only=False):
+        """Generates social media posts using the OpenAI API."""
+        prompt = self._build_prompt(content, source_url, updates_only)
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -0,0 +1,66 @@
+from functools import lru_cache
+
+try:
+    import tiktoken  # Optional: exact token counts
+except ImportError:
+    tiktoken = None
+
+SECTION_SEPARATOR = "\n[...]\n"  # Between changed sections sent to the model
+TRUNCATION_NOTE = "\n[... truncated]"
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+def count_tokens(text, model=None):
+    """Counts tokens exactly with tiktoken, or estimates them (about 4 bytes of UTF-8 per token)."""
+    if tiktoken is not None:
+        return len(_encoding(model or "gpt-4o").encode(text))
+    return (len(text.encode("utf-8")) + 3) // 4
+
+def _cut_to_tokens(text, max_tokens, model=None):
+    """Longest prefix of text within max_tokens (binary search on characters)."""
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+def fit_to_budget(sections, max_tokens, model=None):
+    """
+    Joins sections in order while they fit in max_tokens. The first section that does not fit
+    is cut at a paragraph boundary (or mid-paragraph if nothing else fits) and marked as truncated.
+    Returns the text and whether anything was left out.
+    """
+    parts, remaining = [], max_tokens
+    for section in sections:
+        separator = SECTION_SEPARATOR if parts else ""
+        cost = count_tokens(separator + section, model)
+        if cost <= remaining:
+            parts.append(section)
+            remaining -= cost
+            continue
+        remaining -= count_tokens(separator + TRUNCATION_NOTE, model)
+        kept = []
+        for line in section.splitlines():
+            line_cost = count_tokens(line + "\n", model)
+            if line_cost > remaining:
+                break
+            kept.append(line)
+            remaining -= line_cost
+        if not kept and not parts and remaining > 0:
+            kept = [_cut_to_tokens(section, remaining, model)]
+        if kept:
+            parts.append("\n".join(kept))
+        return _enforce(SECTION_SEPARATOR.join(parts) + TRUNCATION_NOTE, max_tokens, model), True
+    return _enforce(SECTION_SEPARATOR.join(parts), max_tokens, model), False
+
+def _enforce(text, max_tokens, model=None):
+    # Per-piece counts can be off by a token or two once joined; never exceed the budget
+    return text if count_tokens(text, model) <= max_tokens else _cut_to_tokens(text, max_tokens, model)
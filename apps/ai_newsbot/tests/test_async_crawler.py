@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import extractor
+from async_crawler import AsyncCrawler, CrawlSource, crawl_sources
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.starts.append(time.monotonic())
+        try:
+            if self.path.startswith('/missing'):
+                self.send_response(404)
+                self.end_headers()
+                return
+            if self.path.startswith('/cached') and self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            time.sleep(2 if self.path.startswith('/slow') else 0.1)
+            body = f"<html><script>x()</script><body><h1>Page {self.path}</h1></body></html>".encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            if self.path.startswith('/cached'):
+                self.send_header('ETag', '"v1"')
+                self.send_header('Last-Modified', 'Mon, 05 Oct 2026 10:00:00 GMT')
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = 0
+    server.starts = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _sources(server, paths, host='127.0.0.1'):
+    port = server.server_port
+    return [CrawlSource(f'src{i}', f'http://{host}:{port}{path}', 'website') for i, path in enumerate(paths)]
+
+
+def test_crawls_concurrently_within_per_host_limit(server):
+    sources = _sources(server, [f'/page{i}' for i in range(8)])
+
+    started = time.perf_counter()
+    results = asyncio.run(crawl_sources(sources, concurrency=10, per_host_concurrency=4, host_delay=0))
+    elapsed = time.perf_counter() - started
+
+    assert sorted(r.source.id for r in results) == sorted(s.id for s in sources)
+    assert all(r.error is None and r.content.startswith('Page /page') for r in results)
+    assert server.max_in_flight == 4
+    assert elapsed < 0.8 * 0.1 * 8  # well under a sequential crawl
+
+
+def test_global_cap_and_host_delay(server):
+    results = asyncio.run(crawl_sources(_sources(server, ['/a', '/b', '/c']),
+                                        concurrency=1, per_host_concurrency=5, host_delay=0.25))
+
+    assert len(results) == 3 and server.max_in_flight == 1
+    gaps = [b - a for a, b in zip(server.starts, server.starts[1:])]
+    assert all(gap >= 0.24 for gap in gaps)
+
+
+def test_deadline_cancels_slow_sources_and_reports_errors(server, tmp_path):
+    document = tmp_path / 'notes.txt'
+    document.write_text('local notes')
+    sources = _sources(server, ['/fast', '/slow', '/missing'])
+    sources.append(CrawlSource('doc', str(document), 'document'))
+
+    async def crawl():
+        async with AsyncCrawler(host_delay=0) as crawler:
+            return [r async for r in crawler.crawl(sources, deadline=0.5)]
+
+    started = time.perf_counter()
+    results = {r.source.id: r for r in asyncio.run(crawl())}
+
+    assert time.perf_counter() - started < 1.5
+    assert results['src0'].content == 'Page /fast'
+    assert results['src1'].error == 'deadline exceeded'
+    assert 'HTTPStatusError' in results['src2'].error
+    assert results['doc'].content == 'local notes'
+
+
+def test_sources_finished_while_the_caller_was_busy_are_not_timed_out(server, tmp_path):
+    document = tmp_path / 'notes.txt'
+    document.write_text('local notes')
+    sources = [CrawlSource('doc', str(document), 'document')] + _sources(server, ['/fast', '/slow'])
+
+    async def crawl():
+        results = []
+        async with AsyncCrawler(host_delay=0) as crawler:
+            async for result in crawler.crawl(sources, deadline=0.5):
+                results.append(result)
+                await asyncio.sleep(0.7)  # /fast completes meanwhile, then the deadline passes
+        return {r.source.id: r for r in results}
+
+    results = asyncio.run(crawl())
+
+    assert results['src0'].error is None and results['src0'].content == 'Page /fast'
+    assert results['src1'].error == 'deadline exceeded'
+
+
+def test_extractor_failure_is_reported_per_source(server, tmp_path, monkeypatch):
+    def broken(html):
+        raise AttributeError("'NoneType' object has no attribute 'text'")
+    monkeypatch.setitem(extractor.EXTRACTORS, 'broken', broken)
+    document = tmp_path / 'notes.txt'
+    document.write_text('local notes')
+    sources = _sources(server, ['/a']) + [CrawlSource('doc', str(document), 'document')]
+
+    results = {r.source.id: r for r in asyncio.run(crawl_sources(sources, host_delay=0, extractor='broken'))}
+
+    assert 'ExtractionError' in results['src0'].error and results['src0'].content is None
+    assert results['doc'].content == 'local notes'
+    with pytest.raises(ValueError):
+        AsyncCrawler(extractor='missing')
+
+
+def test_conditional_fetch_skips_unchanged_pages(server):
+    url = f'http://127.0.0.1:{server.server_port}/cached'
+
+    [first] = asyncio.run(crawl_sources([CrawlSource('src', url, 'website')], host_delay=0))
+    assert first.content == 'Page /cached' and not first.not_modified
+    assert (first.etag, first.last_modified) == ('"v1"', 'Mon, 05 Oct 2026 10:00:00 GMT')
+    assert first.body_bytes > 0
+
+    source = CrawlSource('src', url, 'website', first.etag, first.last_modified)
+    [second] = asyncio.run(crawl_sources([source], host_delay=0))
+    assert second.error is None and second.not_modified and second.content is None
+    assert (second.etag, second.last_modified, second.body_bytes) == (first.etag, first.last_modified, 0)
+
+
+def test_extracts_in_process_pool(server):
+    results = asyncio.run(crawl_sources(_sources(server, ['/a', '/b']), host_delay=0,
+                                        extractor='stream', extract_processes=1))
+
+    assert sorted(r.content for r in results) == ['Page /a', 'Page /b']
+    assert all(r.extractor == 'stream' for r in results)
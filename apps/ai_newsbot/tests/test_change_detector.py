@@ -0,0 +1,71 @@
+import json
+
+from change_detector import (MINHASH_SIZE, calculate_fingerprint, changed_sections, detect_change,
+                             detect_meaningful_change, minhash, minhash_similarity)
+
+WORDS = ("renovation permit kitchen vancouver bylaw contractor heat pump rebate basement suite laneway "
+         "zoning inspection budget lumber prices interest rates homeowners strata energy retrofit").split()
+
+
+def _article(paragraphs=12):
+    lines = ["Renovation news", "Updated October 1, 2026 10:02"]
+    for i in range(paragraphs):
+        lines.append(' '.join(WORDS[(i * 7 + j * 3) % len(WORDS)] + str(j % 5) for j in range(40)))
+    return '\n'.join(lines)
+
+
+def test_small_edits_are_not_meaningful():
+    page = _article()
+    report = detect_meaningful_change(page.replace('10:02', '10:31'), calculate_fingerprint(page))
+
+    assert not report.changed
+    assert report.similarity > 0.9
+    assert report.added_paragraphs == ['Updated October 1, 2026 10:31'] and report.removed_paragraphs == 1
+
+
+def test_new_paragraph_is_meaningful_and_reported():
+    page = _article()
+    news = "The province will fund heat pump rebates for homeowners who add a legal basement suite, " \
+           "starting in January with a new online application that should cut permit wait times."
+    report = detect_meaningful_change(page + '\n' + news, calculate_fingerprint(page))
+
+    assert report.changed
+    assert report.added_paragraphs == [news] and report.removed_paragraphs == 0
+
+
+def test_rewritten_page_is_meaningful_by_similarity():
+    report = detect_meaningful_change(_article(12), calculate_fingerprint(_article(4)), min_new_words=10 ** 6)
+
+    assert report.changed and report.similarity < 0.9
+
+
+def test_missing_or_corrupt_baseline_counts_as_changed():
+    page = _article(2)
+    for baseline in (None, '', 'not json', json.dumps({'minhash': 'AAAA'})):
+        report = detect_meaningful_change(page, baseline)
+        assert report.changed and len(report.added_paragraphs) == 4
+
+
+def test_fingerprint_is_compact_and_stable():
+    page = _article(200)
+    fingerprint = calculate_fingerprint(page)
+
+    assert fingerprint == calculate_fingerprint(page)
+    assert len(minhash(page.lower().split())) == MINHASH_SIZE
+    assert len(fingerprint) < 2 * 8 * MINHASH_SIZE + 4 * 202 * 2
+    assert minhash_similarity(minhash(['a', 'b', 'c', 'd', 'e']), minhash(['a', 'b', 'c', 'd', 'e'])) == 1.0
+
+
+def test_exact_detection_still_available():
+    changed, digest = detect_change('same', None)
+    assert changed and detect_change('same', digest) == (False, digest)
+
+
+def test_changed_sections_keep_context_and_skip_removals():
+    previous = "Title\nIntro\nFirst story\nSecond story\nThird story\nFooter note"
+    current = "Title\nIntro!\nFirst story\nBreaking: new rebate\nSecond story\nThird story\nFooter note\nLate update"
+
+    assert changed_sections(previous, current) == ['First story\nBreaking: new rebate\nSecond story',
+                                                   'Footer note\nLate update']
+    assert changed_sections(previous, current, context=0) == ['Breaking: new rebate', 'Late update']
+    assert changed_sections(previous, "Title\nThird story") == []
@@ -0,0 +1,25 @@
+import os
+
+from content_store import ContentStore
+
+
+def test_round_trip_is_compressed_and_replaces_previous(tmp_path):
+    store = ContentStore(str(tmp_path / 'content'))
+    text = 'Renovation news\n' + 'City council approves faster permits for basement suites.\n' * 200
+
+    assert store.load('https://example.com/news') is None
+    store.save('https://example.com/news', 'old text')
+    store.save('https://example.com/news', text)
+
+    assert store.load('https://example.com/news') == text
+    [name] = os.listdir(tmp_path / 'content')
+    assert name.endswith('.txt.gz') and os.path.getsize(tmp_path / 'content' / name) < len(text) / 10
+
+
+def test_unreadable_file_counts_as_missing(tmp_path):
+    store = ContentStore(str(tmp_path))
+    store.save('src', 'text')
+    [name] = os.listdir(tmp_path)
+    (tmp_path / name).write_bytes(b'not gzip')
+
+    assert store.load('src') is None
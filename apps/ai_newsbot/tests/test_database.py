@@ -0,0 +1,32 @@
+import sqlite3
+
+from database import Source, init_db
+
+
+def test_init_db_adds_new_columns_to_existing_tables(tmp_path):
+    db_path = tmp_path / 'newsbot.db'
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("CREATE TABLE sources (id VARCHAR PRIMARY KEY, url VARCHAR NOT NULL, "
+                           "source_type VARCHAR NOT NULL, monitoring_frequency_seconds VARCHAR, "
+                           "last_checked DATETIME, last_hash VARCHAR, is_active BOOLEAN)")
+        connection.execute("INSERT INTO sources VALUES ('s1', 'https://example.com', 'website', '3600', "
+                           "'2026-01-01 00:00:00', 'abc', 1)")
+    connection.close()
+
+    session = init_db(str(db_path))()
+    source = session.query(Source).one()
+    assert (source.etag, source.fetch_count, source.bytes_saved) == (None, 0, 0)
+    session.close()
+
+
+def test_record_fetch_counts_bytes_saved_by_304s():
+    source = Source(id='s1', url='https://example.com', source_type='website')
+
+    source.record_fetch(False, 5000)
+    source.record_fetch(True)
+    source.record_fetch(True)
+    source.record_fetch(False, 4000)
+
+    assert (source.fetch_count, source.not_modified_count) == (4, 2)
+    assert (source.bytes_downloaded, source.bytes_saved, source.content_bytes) == (9000, 10000, 4000)
+    assert source.not_modified_rate == 0.5
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from extractor import EXTRACTORS, html_to_text
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'corpus')
+FAST_EXTRACTORS = [name for name in EXTRACTORS if name != 'soup']
+
+PAGE = """<html><head><title>Permits</title><style>p { color: red }</style></head><body>
+<nav><a href="/">Home</a><a href="/news">News</a></nav>
+<main><h1>Faster permits &amp; rebates</h1><p>Hello <b>world</b>,   again</p><p>Second</p>x<br/>y<!-- hidden --></main>
+<aside>Related links</aside><footer>Copyright</footer><script>var a = '<p>not text</p>';</script>
+</body></html>"""
+
+
+@pytest.mark.parametrize('name', FAST_EXTRACTORS)
+def test_fast_extractors_drop_boilerplate_and_split_blocks(name):
+    assert html_to_text(PAGE, name) == 'Permits\nFaster permits & rebates\nHello world, again\nSecond\nx\ny'
+    assert html_to_text('', name) == ''
+
+
+@pytest.mark.parametrize('name', FAST_EXTRACTORS)
+def test_fast_extractors_agree_on_corpus(name):
+    for page in sorted(os.listdir(CORPUS_DIR)):
+        with open(os.path.join(CORPUS_DIR, page), encoding='utf-8') as f:
+            html = f.read()
+        assert html_to_text(html, name) == html_to_text(html, 'stream'), page
+
+
+def test_soup_extractor_keeps_original_output():
+    assert html_to_text('<p>One  Two</p>\n<script>x</script><p> Three </p>', 'soup') == 'One\nTwo\nThree'
+
+
+def test_unknown_extractor():
+    with pytest.raises(ValueError, match='Unknown HTML extractor'):
+        html_to_text(PAGE, 'regex')
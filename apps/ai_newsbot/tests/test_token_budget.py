@@ -0,0 +1,31 @@
+from token_budget import SECTION_SEPARATOR, TRUNCATION_NOTE, count_tokens, fit_to_budget
+
+
+def test_sections_that_fit_are_joined():
+    sections = ['First change', 'Second change']
+
+    text, truncated = fit_to_budget(sections, 100)
+
+    assert text == SECTION_SEPARATOR.join(sections) and not truncated
+
+
+def test_overflowing_section_is_cut_at_a_paragraph():
+    sections = ['short', '\n'.join(f'paragraph {i} ' + 'word ' * 20 for i in range(10)), 'never sent']
+
+    text, truncated = fit_to_budget(sections, 80)
+
+    assert truncated and text.endswith(TRUNCATION_NOTE)
+    assert count_tokens(text) <= 80
+    assert text.startswith('short' + SECTION_SEPARATOR + 'paragraph 0') and 'never sent' not in text
+
+
+def test_single_huge_paragraph_is_cut_mid_paragraph():
+    text, truncated = fit_to_budget(['سلام ' * 1000], 50)
+
+    assert truncated and 0 < count_tokens(text) <= 50 and text.startswith('سلام')
+
+
+def test_no_budget_sends_nothing():
+    text, truncated = fit_to_budget(['anything'], 0)
+
+    assert truncated and count_tokens(text) == 0
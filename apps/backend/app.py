@@ -4,19 +4,64 @@ Copyright (c) 2025 Saeed Alaediny. All rights reserved.
 
 This is the main application file for the RenovAI Canada backend API.
 It provides endpoints for renovation cost estimation and lead collection.
+
+Run it from the apps/backend directory with apps/ on PYTHONPATH, for the
+shared integrations package:
+    PYTHONPATH=.. python app.py
 """
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import os
-import sys
 from datetime import datetime
 
-# Add routes to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from routes.estimate import router as estimate_router
-from routes.collect_lead import router as lead_router
+from routes.collect_lead import router as lead_router, airtable_client_for
+from integrations.airtable_client import airtable_configured
+from data.db_helper import get_pricing_snapshot_async
+from routes.response_cache import build_cached_json, cached_json_response
+
+# Static API description, serialized once for /api/info
+API_INFO_RESPONSE = build_cached_json({
+    "api_name": "RenovAI Canada",
+    "purpose": "Renovation cost and timeline estimation",
+    "supported_project_types": [
+        "kitchen",
+        "bathroom",
+        "basement",
+        "full_home",
+        "addition"
+    ],
+    "supported_finish_levels": [
+        "basic",
+        "standard",
+        "premium"
+    ],
+    "features": [
+        "Cost estimation based on project type, size, and finish level",
+        "Timeline estimation in weeks",
+        "Material and finish recommendations",
+        "Lead collection and storage",
+        "Consultation booking integration"
+    ],
+    "location": "Greater Vancouver Area, BC, Canada"
+})
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up before serving and shut integrations down cleanly afterwards."""
+    # Load the pricing table into memory before serving the first request
+    await get_pricing_snapshot_async()
+    if airtable_configured():
+        # Leads queued by a previous run are forwarded without waiting for a new one
+        airtable_client_for(app).sync_worker.start()
+    yield
+    # Only clean up the lead client if this process created one
+    airtable_client = getattr(app.state, 'airtable_client', None)
+    if airtable_client is not None:
+        await airtable_client.shutdown()
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -24,7 +69,8 @@ app = FastAPI(
     description="Smart Renovation Cost & Timeline Estimator for Greater Vancouver Area",
     version="1.0.0 (MVP)",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS for Custom GPT integration
@@ -51,6 +97,7 @@ async def root():
         "status": "operational",
         "endpoints": {
             "estimation": "/api/estimate",
+            "batch_estimation": "/api/estimate/batch",
             "lead_collection": "/api/collect-lead",
             "health_check": "/health",
             "documentation": "/docs"
@@ -68,38 +115,15 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "database": "connected",
         "integrations": {
-            "airtable": "mock mode (MVP)",
+            "airtable": "connected (background sync)" if airtable_configured() else "mock mode (MVP)",
             "calendly": "configured"
         }
     }
 
 @app.get("/api/info")
-async def api_info():
+async def api_info(request: Request):
     """Detailed API information for Custom GPT integration."""
-    return {
-        "api_name": "RenovAI Canada",
-        "purpose": "Renovation cost and timeline estimation",
-        "supported_project_types": [
-            "kitchen",
-            "bathroom",
-            "basement",
-            "full_home",
-            "addition"
-        ],
-        "supported_finish_levels": [
-            "basic",
-            "standard",
-            "premium"
-        ],
-        "features": [
-            "Cost estimation based on project type, size, and finish level",
-            "Timeline estimation in weeks",
-            "Material and finish recommendations",
-            "Lead collection and storage",
-            "Consultation booking integration"
-        ],
-        "location": "Greater Vancouver Area, BC, Canada"
-    }
+    return cached_json_response(request, API_INFO_RESPONSE)
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
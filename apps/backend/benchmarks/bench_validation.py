@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - Validation & Serialization Microbenchmark
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+Compares the per-request CPU cost of the previous request validation and
+response serialization code paths against the current ones.
+
+Usage (from the apps/backend directory):
+    python -m benchmarks.bench_validation [--number 20000]
+"""
+
+import argparse
+import json
+import re
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field, validator
+from typing import Optional
+
+from data.db_helper import calculate_estimate
+from routes.estimate import EstimateRequest, EstimateResponse, _finalize_estimate
+from routes.response_cache import json_bytes
+
+ESTIMATE_PAYLOAD = {'project_type': 'Kitchen', 'size_sqft': 150, 'finish_level': 'Standard', 'postal_code': 'V6A 1B1'}
+PHONE = '+1 (604) 555-0123'
+
+class LegacyEstimateRequest(BaseModel):
+    """EstimateRequest as it was before the fast validation path."""
+    project_type: str = Field(...)
+    size_sqft: float = Field(..., gt=0)
+    finish_level: str = Field(...)
+    postal_code: Optional[str] = Field(None)
+
+    @validator('project_type')
+    def validate_project_type(cls, v):
+        valid_types = ['kitchen', 'bathroom', 'basement', 'full_home', 'addition']
+        if v.lower() not in valid_types:
+            raise ValueError(f"Project type must be one of: {', '.join(valid_types)}")
+        return v.lower()
+
+    @validator('finish_level')
+    def validate_finish_level(cls, v):
+        valid_levels = ['basic', 'standard', 'premium']
+        if v.lower() not in valid_levels:
+            raise ValueError(f"Finish level must be one of: {', '.join(valid_levels)}")
+        return v.lower()
+
+    @validator('size_sqft')
+    def validate_size(cls, v):
+        if v > 10000:
+            raise ValueError("Size exceeds maximum allowed (10,000 sq ft)")
+        return v
+
+_PHONE_SEPARATORS = re.compile(r'[-() +]')
+
+def _phone_replace():
+    cleaned = PHONE.replace('-', '').replace(' ', '').replace('(', '').replace(')', '').replace('+', '')
+    return cleaned.isdigit() and len(cleaned) >= 10
+
+def _phone_regex():
+    cleaned = _PHONE_SEPARATORS.sub('', PHONE)
+    return cleaned.isdigit() and len(cleaned) >= 10
+
+def _estimate_dict():
+    request = EstimateRequest(**ESTIMATE_PAYLOAD)
+    estimate = calculate_estimate(request.project_type, request.finish_level, request.size_sqft)
+    return _finalize_estimate(estimate, request)
+
+def _serialize_revalidated(estimate):
+    # What FastAPI does for a dict returned with response_model=EstimateResponse
+    return json.dumps(jsonable_encoder(EstimateResponse(**estimate))).encode('utf-8')
+
+def _measure(func, number: int) -> float:
+    """Return the best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Validation and serialization microbenchmark")
+    parser.add_argument('--number', type=int, default=20000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    estimate = _estimate_dict()
+    cases = [
+        ('request validation', lambda: LegacyEstimateRequest(**ESTIMATE_PAYLOAD), lambda: EstimateRequest(**ESTIMATE_PAYLOAD)),
+        ('response serialization', lambda: _serialize_revalidated(estimate), lambda: json_bytes(estimate)),
+        ('phone cleaning (regex vs replace)', _phone_regex, _phone_replace),
+    ]
+
+    print(f"{'case':36} {'before (us)':>12} {'after (us)':>12} {'saved (us)':>12}")
+    total_saved = 0.0
+    for name, before, after in cases:
+        before_us = _measure(before, args.number)
+        after_us = _measure(after, args.number)
+        total_saved += before_us - after_us
+        print(f"{name:36} {before_us:12.2f} {after_us:12.2f} {before_us - after_us:12.2f}")
+    print(f"\nTotal CPU saved across these paths: {total_saved:.2f} us per request")
+
+if __name__ == '__main__':
+    main()
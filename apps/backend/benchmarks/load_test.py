@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - API Load Test & Benchmark
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+Drives the backend API at a configurable concurrency and reports p50/p95/p99
+latency and requests per second for each endpoint. Results are saved as JSON
+so runs can be compared, and --baseline fails the run (exit code 1) when a
+scenario regresses, so it can gate a deploy before mamos_runner.py.
+
+Modes:
+    asgi   Call app.app in-process through httpx's ASGI transport (no network)
+    http   Call a running server (--url) or start uvicorn for the run (--spawn)
+
+Usage (from the apps/backend directory, with apps/ on PYTHONPATH like the API):
+    PYTHONPATH=.. python -m benchmarks.load_test --mode asgi --requests 2000 --concurrency 32
+    PYTHONPATH=.. python -m benchmarks.load_test --mode http --spawn --workers 2
+    PYTHONPATH=.. python -m benchmarks.load_test --mode asgi --baseline benchmarks/results/baseline.json
+
+Requires httpx (and uvicorn for --spawn).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS_DIR = os.path.dirname(BACKEND_DIR)
+RESULTS_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'results')
+
+PROJECT_TYPES = ['kitchen', 'bathroom', 'basement', 'full_home', 'addition']
+FINISH_LEVELS = ['basic', 'standard', 'premium']
+POSTAL_CODES = ['V6B 1A1', 'V5K 0A1', 'V3N 4K1', 'V7S 2B2', None]
+# Sizes the GPT agent typically rounds to
+SIZES = [50, 80, 100, 150, 200, 250, 300, 500, 800, 1000, 1500, 2000]
+
+def _estimate_payload(rng: random.Random) -> dict:
+    return {
+        'project_type': rng.choice(PROJECT_TYPES),
+        'size_sqft': rng.choice(SIZES),
+        'finish_level': rng.choice(FINISH_LEVELS),
+        'postal_code': rng.choice(POSTAL_CODES),
+    }
+
+def _batch_payload(rng: random.Random) -> dict:
+    # The common agent pattern: one project at all three finish levels
+    base = _estimate_payload(rng)
+    return {'estimates': [dict(base, finish_level=level) for level in FINISH_LEVELS]}
+
+def _lead_payload(rng: random.Random) -> dict:
+    n = rng.randrange(10 ** 7)
+    return {
+        'name': f'Load Test {n}',
+        'email': f'loadtest{n}@example.com',
+        'phone': f'604-555-{n % 10000:04d}',
+        'project_type': rng.choice(PROJECT_TYPES),
+        'size_sqft': rng.choice(SIZES),
+        'finish_level': rng.choice(FINISH_LEVELS),
+        'postal_code': rng.choice(POSTAL_CODES),
+    }
+
+# name -> (method, path, payload factory or None)
+SCENARIOS: Dict[str, Tuple[str, str, Optional[Callable[[random.Random], dict]]]] = {
+    'estimate': ('POST', '/api/estimate', _estimate_payload),
+    'estimate_batch': ('POST', '/api/estimate/batch', _batch_payload),
+    'collect_lead': ('POST', '/api/collect-lead', _lead_payload),
+    'project_types': ('GET', '/api/project-types', None),
+    'finish_levels': ('GET', '/api/finish-levels', None),
+    'info': ('GET', '/api/info', None),
+}
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+async def run_scenario(client: httpx.AsyncClient, name: str, requests: int,
+                       concurrency: int, seed: int) -> dict:
+    """
+    Send `requests` requests for one scenario using `concurrency` workers.
+
+    Returns:
+        Dictionary with request/error counts, throughput and latency percentiles (ms)
+    """
+    method, path, make_payload = SCENARIOS[name]
+    rng = random.Random(seed)
+    payloads = [make_payload(rng) if make_payload else None for _ in range(requests)]
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < requests:
+            payload = payloads[next_index]
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=payload)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'duration_s': round(elapsed, 4),
+        'rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        'p50_ms': round(_percentile(latencies, 50), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'p99_ms': round(_percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+async def run_all(client: httpx.AsyncClient, scenarios: List[str], requests: int,
+                  concurrency: int, warmup: int, seed: int) -> Dict[str, dict]:
+    results = {}
+    for name in scenarios:
+        if warmup:
+            await run_scenario(client, name, warmup, min(concurrency, warmup), seed + 1)
+        results[name] = await run_scenario(client, name, requests, concurrency, seed)
+        r = results[name]
+        print(f"  {name:15} {r['rps']:10.1f} req/s  p50 {r['p50_ms']:8.2f}  p95 {r['p95_ms']:8.2f}  "
+              f"p99 {r['p99_ms']:8.2f} ms  errors {r['errors']}")
+    return results
+
+async def _run_asgi(args, scenarios: List[str]) -> Dict[str, dict]:
+    # Keep benchmark leads out of the real mock store
+    os.environ['MOCK_LEADS_FILE'] = args.leads_file
+    from app import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+            return await run_all(client, scenarios, args.requests, args.concurrency, args.warmup, args.seed)
+
+async def _run_http(args, scenarios: List[str], url: str) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        return await run_all(client, scenarios, args.requests, args.concurrency, args.warmup, args.seed)
+
+def _spawn_uvicorn(args) -> subprocess.Popen:
+    """Start uvicorn on args.port and wait until /health answers."""
+    # apps/ for the integrations package, whatever directory the benchmark was started from
+    env = dict(os.environ, MOCK_LEADS_FILE=args.leads_file,
+               PYTHONPATH=os.pathsep.join(filter(None, [APPS_DIR, os.environ.get('PYTHONPATH')])))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--host', '127.0.0.1', '--port', str(args.port),
+         '--workers', str(args.workers), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'http://127.0.0.1:{args.port}/health', timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30 seconds")
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline run.
+
+    Returns:
+        List of regression messages (empty if none)
+    """
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if before['p95_ms'] and current['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if before['rps'] and current['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {before['rps']:.1f} -> {current['rps']:.1f} req/s")
+        if current['errors'] > before['errors']:
+            regressions.append(f"{name}: errors {before['errors']} -> {current['errors']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the RenovAI backend API")
+    parser.add_argument('--mode', choices=['asgi', 'http'], default='asgi')
+    parser.add_argument('--url', default=None, help="Base URL of a running server (http mode)")
+    parser.add_argument('--spawn', action='store_true', help="Start uvicorn for the run (http mode)")
+    parser.add_argument('--port', type=int, default=8765, help="Port for --spawn")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn workers for --spawn")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument('--requests', type=int, default=1000, help="Requests per scenario")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--warmup', type=int, default=50, help="Unmeasured requests per scenario")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for request payloads")
+    parser.add_argument('--output', default=None, help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--baseline', default=None, help="Earlier result file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    if args.mode == 'http' and not (args.url or args.spawn):
+        parser.error("http mode needs --url or --spawn")
+
+    leads_dir = tempfile.TemporaryDirectory()
+    args.leads_file = os.path.join(leads_dir.name, 'benchmark_leads.jsonl')
+    if args.mode == 'http' and args.url and 'collect_lead' in scenarios:
+        print("⚠️  collect_lead writes real leads to the target server's store")
+
+    print(f"Running {len(scenarios)} scenario(s): {args.requests} requests each, concurrency {args.concurrency}, mode {args.mode}")
+    process = None
+    try:
+        if args.mode == 'asgi':
+            results = asyncio.run(_run_asgi(args, scenarios))
+        else:
+            url = args.url
+            if args.spawn:
+                process = _spawn_uvicorn(args)
+                url = f'http://127.0.0.1:{args.port}'
+            results = asyncio.run(_run_http(args, scenarios, url))
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        leads_dir.cleanup()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'mode': args.mode,
+            'workers': args.workers if args.spawn else None,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'scenarios': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{args.mode}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['scenarios']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Performance regressions detected:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print("\n✅ No regressions compared to baseline")
+
+if __name__ == '__main__':
+    main()
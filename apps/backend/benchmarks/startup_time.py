@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - Startup Time Benchmark
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+Measures the cold start of the backend in fresh interpreter processes, the
+way every uvicorn worker starts: importing app.py, running the lifespan
+startup and serving the first lead. It also checks that importing the app
+has no side effects (no output, no files created). Results are saved as
+JSON, and --baseline fails the run (exit code 1) when a phase got slower
+or import side effects came back.
+
+Phases (milliseconds, median and p95 over --runs processes):
+    process        Interpreter start to exit, measured by the parent
+    import         import app
+    startup        Lifespan startup (pricing snapshot, lead sync in real mode)
+    first_lead     First POST /api/collect-lead (creates the lead client)
+
+Usage (from the apps/backend directory):
+    python -m benchmarks.startup_time --runs 10
+    python -m benchmarks.startup_time --baseline benchmarks/results/baseline_startup.json
+
+Requires httpx.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS_DIR = os.path.dirname(BACKEND_DIR)
+RESULTS_DIR = os.path.join(BACKEND_DIR, 'benchmarks', 'results')
+
+PHASES = ['process', 'import', 'startup', 'first_lead']
+
+# Runs in the child process; prints one JSON line with its timings
+CHILD_SCRIPT = r'''
+import asyncio, contextlib, io, json, os, sys, time
+leads_dir = os.path.dirname(os.environ['MOCK_LEADS_FILE'])
+
+output = io.StringIO()
+start = time.perf_counter()
+with contextlib.redirect_stdout(output):
+    from app import app
+import_ms = (time.perf_counter() - start) * 1000
+import_files = sorted(os.listdir(leads_dir))
+
+async def serve():
+    import httpx
+    timings = {}
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        timings['startup'] = (time.perf_counter() - start) * 1000
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            start = time.perf_counter()
+            response = await client.post('/api/collect-lead', json={
+                'name': 'Startup Bench', 'email': 'startup@example.com',
+                'phone': '604-555-0100', 'project_type': 'kitchen'})
+            timings['first_lead'] = (time.perf_counter() - start) * 1000
+            response.raise_for_status()
+    return timings
+
+with contextlib.redirect_stdout(io.StringIO()):
+    timings = asyncio.run(serve())
+print(json.dumps({'import': import_ms, **timings,
+                  'import_output': output.getvalue(), 'import_files': import_files}))
+'''
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+def python_path() -> str:
+    """PYTHONPATH for a child process running the app: apps/ for the integrations package first."""
+    return os.pathsep.join(filter(None, [APPS_DIR, os.environ.get('PYTHONPATH')]))
+
+def run_once() -> Dict:
+    """
+    Start the app in a fresh process with a scratch lead store.
+
+    Returns:
+        Timings of one run (plus import_output and import_files)
+    """
+    with tempfile.TemporaryDirectory() as leads_dir:
+        env = dict(os.environ, MOCK_LEADS_FILE=os.path.join(leads_dir, 'leads.jsonl'), PYTHONWARNINGS='ignore',
+                   PYTHONPATH=python_path())
+        # Mock mode: the benchmark must never reach the real Airtable
+        env.pop('AIRTABLE_API_KEY', None)
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', CHILD_SCRIPT], cwd=BACKEND_DIR, env=env,
+                                   capture_output=True, text=True)
+        process_ms = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{completed.stderr}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['process'] = process_ms
+    return result
+
+def summarize(runs: List[Dict]) -> Dict[str, dict]:
+    """Median and p95 per phase, plus import side effects seen in any run."""
+    results = {}
+    for phase in PHASES:
+        values = sorted(run[phase] for run in runs)
+        results[phase] = {
+            'median_ms': round(statistics.median(values), 2),
+            'p95_ms': round(_percentile(values, 95), 2),
+        }
+    results['import_side_effects'] = {
+        'output': any(run['import_output'] for run in runs),
+        'files': sorted({name for run in runs for name in run['import_files']}),
+    }
+    return results
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline run.
+
+    Returns:
+        List of regression messages (empty if none)
+    """
+    regressions = []
+    for phase in PHASES:
+        before, current = baseline.get(phase), results[phase]
+        if before and before['median_ms'] and current['median_ms'] > before['median_ms'] * (1 + tolerance):
+            regressions.append(f"{phase}: median {before['median_ms']:.1f} -> {current['median_ms']:.1f} ms")
+    effects = results['import_side_effects']
+    if effects['output'] or effects['files']:
+        regressions.append(f"importing app has side effects (output: {effects['output']}, files: {effects['files']})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend cold start time")
+    parser.add_argument('--runs', type=int, default=10, help="Fresh processes to start")
+    parser.add_argument('--output', default=None, help="Result file (default: benchmarks/results/<timestamp>_startup.json)")
+    parser.add_argument('--baseline', default=None, help="Earlier result file to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    print(f"Starting the app in {args.runs} fresh process(es)")
+    runs = [run_once() for _ in range(args.runs)]
+    results = summarize(runs)
+
+    for phase in PHASES:
+        print(f"  {phase:<12} median {results[phase]['median_ms']:8.1f}  p95 {results[phase]['p95_ms']:8.1f} ms")
+    effects = results['import_side_effects']
+    print(f"  import side effects: output={effects['output']} files={effects['files'] or 'none'}")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'runs': args.runs,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'phases': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_startup.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['phases']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ Startup regressions detected:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print("\n✅ No regressions compared to baseline")
+
+if __name__ == '__main__':
+    main()
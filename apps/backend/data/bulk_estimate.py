@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - Bulk Estimate Script
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This script re-prices many projects at once against the current pricing table.
+It reads a CSV, JSON-Lines or Parquet file of projects (or the mock_leads.jsonl
+lead log) and writes the estimates to a CSV or Parquet file.
+
+Usage (from the apps/backend directory):
+    python -m data.bulk_estimate leads.csv estimates.csv
+    python -m data.bulk_estimate ../integrations/mock_leads.jsonl estimates.parquet
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from typing import Dict, List
+
+from data.db_helper import calculate_estimates_bulk
+
+# Column names accepted for each input field (plain rows and Airtable lead fields)
+INPUT_COLUMNS = {
+    'project_type': ('project_type', 'Project Type'),
+    'finish_level': ('finish_level', 'Finish Level'),
+    'size_sqft': ('size_sqft', 'Size (sq ft)'),
+    'postal_code': ('postal_code', 'Postal Code'),
+}
+
+OUTPUT_COLUMNS = [
+    'found', 'cost_per_sqft', 'regional_multiplier', 'estimated_cost', 'estimated_cost_min',
+    'estimated_cost_max', 'estimated_timeline_weeks'
+]
+
+def _read_records(path: str) -> List[Dict]:
+    """Read input rows from a CSV, JSON, JSON-Lines or Parquet file."""
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.parquet':
+        import pandas as pd
+        return pd.read_parquet(path).to_dict('records')
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if ext == '.csv':
+            return list(csv.DictReader(f))
+        if ext == '.jsonl':
+            records = [json.loads(line) for line in f if line.strip()]
+        elif ext == '.json':
+            records = json.load(f)
+        else:
+            raise ValueError(f"Unsupported input format: {ext}")
+        # Lead records wrap the values in an Airtable-style 'fields' object
+        return [r.get('fields', r) for r in records]
+
+def _column(record: Dict, field: str, default=''):
+    """Get an input field from a record, accepting any of its known column names."""
+    for name in INPUT_COLUMNS[field]:
+        value = record.get(name)
+        if value is not None and value != '':
+            return value
+    return default
+
+def _normalize_code(value) -> str:
+    """Normalize display names like 'Full Home' to codes like 'full_home'."""
+    return str(value).strip().lower().replace(' ', '_')
+
+def _write_records(path: str, records: List[Dict], columns: List[str]) -> None:
+    """Write output rows to a CSV or Parquet file."""
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.parquet':
+        import pandas as pd
+        pd.DataFrame(records, columns=columns).to_parquet(path, index=False)
+        return
+
+    if ext != '.csv':
+        raise ValueError(f"Unsupported output format: {ext}")
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+
+def run_bulk_estimate(input_path: str, output_path: str) -> int:
+    """
+    Estimate every project in input_path and write the results to output_path.
+
+    Args:
+        input_path: CSV, JSON, JSON-Lines or Parquet file of projects
+        output_path: CSV or Parquet file to write
+
+    Returns:
+        Number of rows written
+    """
+    records = _read_records(input_path)
+
+    project_types = [_normalize_code(_column(r, 'project_type')) for r in records]
+    finish_levels = [_normalize_code(_column(r, 'finish_level')) for r in records]
+    sizes = []
+    for r in records:
+        try:
+            sizes.append(float(_column(r, 'size_sqft', 'nan')))
+        except (TypeError, ValueError):
+            sizes.append(float('nan'))
+
+    postal_codes = [str(_column(r, 'postal_code')) for r in records]
+
+    results = calculate_estimates_bulk(project_types, finish_levels, sizes, postal_codes)
+
+    rows = []
+    for i in range(len(records)):
+        row = {
+            'project_type': project_types[i],
+            'finish_level': finish_levels[i],
+            'size_sqft': sizes[i],
+            'postal_code': postal_codes[i],
+        }
+        for column in OUTPUT_COLUMNS:
+            row[column] = results[column][i].item()
+        rows.append(row)
+
+    _write_records(output_path, rows, ['project_type', 'finish_level', 'size_sqft', 'postal_code'] + OUTPUT_COLUMNS)
+    return len(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk re-price projects against the current pricing table")
+    parser.add_argument('input', help="Input file (.csv, .json, .jsonl or .parquet)")
+    parser.add_argument('output', help="Output file (.csv or .parquet)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = run_bulk_estimate(args.input, args.output)
+    elapsed = time.perf_counter() - start
+    print(f"Estimated {count} projects in {elapsed:.2f}s -> {args.output}")
+
+if __name__ == '__main__':
+    main()
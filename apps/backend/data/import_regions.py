@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - Regional Multiplier Import Script
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This script bulk-loads postal code prefix cost multipliers (typically one row
+per Forward Sortation Area, e.g. V6B) into the pricing database in a single
+transaction. The API picks up the new multipliers without a restart.
+
+Usage (from the apps/backend directory):
+    python -m data.import_regions regions.csv             # upsert rows
+    python -m data.import_regions regions.csv --replace   # replace all rows
+
+The CSV needs postal_prefix and multiplier columns; region_name is optional.
+"""
+
+import argparse
+import csv
+import sqlite3
+from typing import Iterable, Tuple
+
+from data.migrate_db import DB_PATH, migrate
+
+def import_regions(conn: sqlite3.Connection, regions: Iterable[Tuple[str, float, str]],
+                   replace: bool = False) -> int:
+    """
+    Insert or update regional multipliers in one transaction.
+
+    Args:
+        conn: Open database connection (schema must be migrated)
+        regions: Iterable of (postal_prefix, multiplier, region_name) tuples
+        replace: Delete all existing multipliers first
+
+    Returns:
+        Number of rows written
+    """
+    rows = [(''.join(prefix.split()).upper(), float(multiplier), name or None)
+            for prefix, multiplier, name in regions]
+    with conn:
+        if replace:
+            conn.execute('DELETE FROM regional_multipliers')
+        conn.executemany('''
+            INSERT INTO regional_multipliers (postal_prefix, multiplier, region_name)
+            VALUES (?, ?, ?)
+            ON CONFLICT(postal_prefix) DO UPDATE SET
+                multiplier = excluded.multiplier,
+                region_name = excluded.region_name
+        ''', rows)
+    return len(rows)
+
+def _read_csv(path: str):
+    """Yield (postal_prefix, multiplier, region_name) tuples from a CSV file."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            yield row['postal_prefix'], row['multiplier'], row.get('region_name')
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load regional cost multipliers")
+    parser.add_argument('csv', help="CSV file with postal_prefix, multiplier[, region_name]")
+    parser.add_argument('--db', default=DB_PATH, help="Path to the SQLite database")
+    parser.add_argument('--replace', action='store_true', help="Replace all existing multipliers")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        migrate(conn)
+        count = import_regions(conn, _read_csv(args.csv), replace=args.replace)
+    finally:
+        conn.close()
+    print(f"Imported {count} regional multipliers into {args.db}")
+
+if __name__ == '__main__':
+    main()
@@ -4,41 +4,30 @@ RenovAI Canada - Database Initialization Script
 Copyright (c) 2025 Saeed Alaediny. All rights reserved.
 
 This script initializes the SQLite database with sample renovation pricing data
-for the Greater Vancouver Area.
+for the Greater Vancouver Area. The database is upgraded and updated in place
+(see migrate_db.py), so a running API picks up the changes without downtime.
+
+Usage (from the apps/backend directory):
+    python -m data.init_db
 """
 
 import sqlite3
 import os
 
+from data.migrate_db import migrate, set_materials
+from data.import_regions import import_regions
+
 # Database file path
 DB_PATH = os.path.join(os.path.dirname(__file__), 'pricing_timeline.db')
 
 def init_database():
     """Initialize the database with sample renovation data."""
     
-    # Remove existing database if it exists
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
-        print(f"Removed existing database: {DB_PATH}")
-    
-    # Create new database connection
+    # Open (or create) the database and bring the schema up to date
     conn = sqlite3.connect(DB_PATH)
+    migrate(conn, verbose=True)
     cursor = conn.cursor()
     
-    # Create pricing_timeline table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS pricing_timeline (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            project_type TEXT NOT NULL,
-            finish_level TEXT NOT NULL,
-            cost_per_sqft REAL NOT NULL,
-            avg_duration_weeks INTEGER NOT NULL,
-            suggested_materials TEXT,
-            description TEXT,
-            UNIQUE(project_type, finish_level)
-        )
-    ''')
-    
     # Sample renovation data for Greater Vancouver Area
     renovation_data = [
         # Kitchen Renovations
@@ -82,15 +71,46 @@ def init_database():
          'Premium home addition with architectural features'),
     ]
     
-    # Insert sample data
-    cursor.executemany('''
-        INSERT INTO pricing_timeline 
-        (project_type, finish_level, cost_per_sqft, avg_duration_weeks, suggested_materials, description)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', renovation_data)
+    # Insert or update sample data in a single transaction
+    for row in renovation_data:
+        cursor.execute('''
+            INSERT INTO pricing_timeline 
+            (project_type, finish_level, cost_per_sqft, avg_duration_weeks, suggested_materials, description)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(project_type, finish_level) DO UPDATE SET
+                cost_per_sqft = excluded.cost_per_sqft,
+                avg_duration_weeks = excluded.avg_duration_weeks,
+                suggested_materials = excluded.suggested_materials,
+                description = excluded.description
+        ''', row)
+        cursor.execute(
+            'SELECT id FROM pricing_timeline WHERE project_type = ? AND finish_level = ?',
+            (row[0], row[1])
+        )
+        set_materials(conn, cursor.fetchone()[0], row[4].split(', ') if row[4] else [])
     
     conn.commit()
     
+    # Sample regional cost multipliers by Forward Sortation Area (first 3 postal code characters)
+    regional_data = [
+        ('V6B', 1.15, 'Vancouver - Downtown'),
+        ('V6E', 1.15, 'Vancouver - West End'),
+        ('V6Z', 1.15, 'Vancouver - Downtown South'),
+        ('V6K', 1.12, 'Vancouver - Kitsilano'),
+        ('V5K', 1.05, 'Vancouver - Hastings-Sunrise'),
+        ('V7S', 1.20, 'West Vancouver'),
+        ('V7L', 1.10, 'North Vancouver'),
+        ('V6X', 1.05, 'Richmond'),
+        ('V5H', 1.02, 'Burnaby - Metrotown'),
+        ('V3N', 1.00, 'Burnaby - East'),
+        ('V3L', 0.98, 'New Westminster'),
+        ('V3T', 0.95, 'Surrey - Whalley'),
+        ('V3S', 0.95, 'Surrey - Cloverdale'),
+        ('V3B', 0.97, 'Coquitlam'),
+        ('V2Y', 0.93, 'Langley'),
+    ]
+    import_regions(conn, regional_data)
+    
     # Verify data insertion
     cursor.execute('SELECT COUNT(*) FROM pricing_timeline')
     count = cursor.fetchone()[0]
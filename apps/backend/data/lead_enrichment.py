@@ -0,0 +1,97 @@
+"""
+RenovAI Canada - Lead Estimate Enrichment
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module fills in the 'Estimated Cost' of leads that describe a priceable
+project (project type, size and finish level) but arrived without a cost,
+using the same pricing snapshot and rules as /api/estimate. Single leads are
+priced with calculate_estimate; batches (bulk imports) go through the
+vectorized calculate_estimates_bulk. A cost sent by the client is never
+overwritten.
+
+Like the rest of the backend it is imported from the apps/backend root (as
+data.lead_enrichment), also by the integrations command-line tools, so
+there is a single db_helper module and pricing snapshot per process.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from data.db_helper import calculate_estimate, calculate_estimates, calculate_estimates_bulk
+
+def _estimate_inputs(fields: Dict) -> Optional[Tuple[str, str, float, Optional[str]]]:
+    """
+    Pricing inputs of a lead that still needs an estimate.
+
+    Args:
+        fields: Lead fields (Airtable field names)
+
+    Returns:
+        (project_type, finish_level, size_sqft, postal_code) codes, or None if
+        the lead already has a cost or lacks something needed to price it
+    """
+    if fields.get('Estimated Cost') is not None:
+        return None
+    project_type, finish_level = fields.get('Project Type'), fields.get('Finish Level')
+    try:
+        size_sqft = float(fields.get('Size (sq ft)') or 0)
+    except (TypeError, ValueError):
+        return None
+    if not (project_type and finish_level and size_sqft > 0):
+        return None
+    # Leads store display names ('Full Home', 'Premium'); pricing is keyed by codes
+    return (str(project_type).lower().replace(' ', '_'), str(finish_level).lower(),
+            size_sqft, fields.get('Postal Code'))
+
+def enrich_lead(fields: Dict) -> bool:
+    """
+    Fill in a missing 'Estimated Cost' for one lead, in place.
+
+    Args:
+        fields: Lead fields (Airtable field names)
+
+    Returns:
+        True if an estimate was added
+    """
+    inputs = _estimate_inputs(fields)
+    if inputs is None:
+        return False
+    estimate = calculate_estimate(*inputs)
+    if not estimate:
+        return False
+    fields['Estimated Cost'] = estimate['estimated_cost']
+    return True
+
+def enrich_leads(leads: List[Dict]) -> int:
+    """
+    Fill in missing 'Estimated Cost' values for a batch of leads, in place.
+
+    Pricing is applied to all priceable leads at once with NumPy (one
+    lookup per distinct project/finish pair and postal code); without NumPy
+    it falls back to calculate_estimates.
+
+    Args:
+        leads: Lead field dictionaries (Airtable field names)
+
+    Returns:
+        Number of leads that received an estimate
+    """
+    pending = [(fields, inputs) for fields in leads
+               for inputs in (_estimate_inputs(fields),) if inputs is not None]
+    if not pending:
+        return 0
+    project_types, finish_levels, sizes, postal_codes = zip(*(inputs for _, inputs in pending))
+
+    try:
+        result = calculate_estimates_bulk(project_types, finish_levels, sizes, postal_codes)
+        costs = [float(cost) if found else None
+                 for found, cost in zip(result['found'].tolist(), result['estimated_cost'].tolist())]
+    except ImportError:
+        estimates = calculate_estimates(list(zip(project_types, finish_levels, sizes, postal_codes)))
+        costs = [estimate['estimated_cost'] if estimate else None for estimate in estimates]
+
+    enriched = 0
+    for (fields, _), cost in zip(pending, costs):
+        if cost is not None:
+            fields['Estimated Cost'] = cost
+            enriched += 1
+    return enriched
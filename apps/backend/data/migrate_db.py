@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - Database Migration Script
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This script upgrades the pricing database schema in place. Applied
+migrations are tracked with PRAGMA user_version, so running it again is a
+no-op and the database file is never dropped.
+
+Usage (from the apps/backend directory):
+    python -m data.migrate_db            # upgrade to the latest schema
+    python -m data.migrate_db --status   # show current and latest version
+"""
+
+import argparse
+import os
+import sqlite3
+from typing import Callable, List, Tuple
+
+# Database file path
+DB_PATH = os.path.join(os.path.dirname(__file__), 'pricing_timeline.db')
+
+def _create_pricing_table(conn: sqlite3.Connection) -> None:
+    """Create the original pricing_timeline table if it does not exist yet."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS pricing_timeline (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_type TEXT NOT NULL,
+            finish_level TEXT NOT NULL,
+            cost_per_sqft REAL NOT NULL,
+            avg_duration_weeks INTEGER NOT NULL,
+            suggested_materials TEXT,
+            description TEXT,
+            UNIQUE(project_type, finish_level)
+        )
+    ''')
+
+def _add_nocase_lookup_index(conn: sqlite3.Connection) -> None:
+    """Add a case-insensitive index so lookups no longer need LOWER()."""
+    conn.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_pricing_lookup_nocase
+        ON pricing_timeline (project_type COLLATE NOCASE, finish_level COLLATE NOCASE)
+    ''')
+
+def _create_materials_table(conn: sqlite3.Connection) -> None:
+    """Move suggested materials into their own table, one row per material."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS pricing_materials (
+            pricing_id INTEGER NOT NULL REFERENCES pricing_timeline(id) ON DELETE CASCADE,
+            position INTEGER NOT NULL,
+            material TEXT NOT NULL,
+            PRIMARY KEY (pricing_id, position)
+        )
+    ''')
+    rows = conn.execute('SELECT id, suggested_materials FROM pricing_timeline').fetchall()
+    for pricing_id, materials in rows:
+        set_materials(conn, pricing_id, materials.split(', ') if materials else [])
+
+def _create_data_version(conn: sqlite3.Connection) -> None:
+    """Add a data_version counter that every pricing change bumps automatically."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS pricing_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO pricing_meta (key, value) VALUES ('data_version', 1)")
+    for table in ('pricing_timeline', 'pricing_materials'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE pricing_meta SET value = value + 1 WHERE key = 'data_version';
+                END
+            ''')
+
+def _create_regional_multipliers(conn: sqlite3.Connection) -> None:
+    """Add postal-prefix cost multipliers (e.g. FSA 'V6B' -> 1.15)."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS regional_multipliers (
+            postal_prefix TEXT PRIMARY KEY COLLATE NOCASE,
+            multiplier REAL NOT NULL CHECK (multiplier > 0),
+            region_name TEXT
+        )
+    ''')
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_regional_multipliers_{event.lower()}_version
+            AFTER {event} ON regional_multipliers
+            BEGIN
+                UPDATE pricing_meta SET value = value + 1 WHERE key = 'data_version';
+            END
+        ''')
+
+# Ordered schema migrations; a migration's version is its position in this list (1-based)
+MIGRATIONS: List[Tuple[str, Callable[[sqlite3.Connection], None]]] = [
+    ('Create pricing_timeline table', _create_pricing_table),
+    ('Add COLLATE NOCASE lookup index', _add_nocase_lookup_index),
+    ('Add pricing_materials table', _create_materials_table),
+    ('Add data_version counter', _create_data_version),
+    ('Add regional_multipliers table', _create_regional_multipliers),
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+def set_materials(conn: sqlite3.Connection, pricing_id: int, materials: List[str]) -> None:
+    """
+    Replace the suggested materials of one pricing row.
+
+    Args:
+        conn: Open database connection
+        pricing_id: id of the pricing_timeline row
+        materials: Materials in display order
+    """
+    conn.execute('DELETE FROM pricing_materials WHERE pricing_id = ?', (pricing_id,))
+    conn.executemany(
+        'INSERT INTO pricing_materials (pricing_id, position, material) VALUES (?, ?, ?)',
+        [(pricing_id, position, material) for position, material in enumerate(materials)]
+    )
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in the database."""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn: sqlite3.Connection, verbose: bool = False) -> int:
+    """
+    Apply all pending migrations, each in its own transaction.
+
+    Args:
+        conn: Open database connection
+        verbose: Print each applied migration
+
+    Returns:
+        Number of migrations applied
+    """
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # manage transactions explicitly so DDL is transactional
+    applied = 0
+    try:
+        for version, (description, apply) in enumerate(MIGRATIONS, start=1):
+            if version <= get_schema_version(conn):
+                continue
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                apply(conn)
+                conn.execute(f'PRAGMA user_version = {version}')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            applied += 1
+            if verbose:
+                print(f"  Applied migration {version}: {description}")
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
+
+def migrate_database(db_path: str = DB_PATH) -> int:
+    """
+    Upgrade the database file at db_path to the latest schema.
+
+    Args:
+        db_path: Path to the SQLite database
+
+    Returns:
+        Number of migrations applied
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        return migrate(conn, verbose=True)
+    finally:
+        conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Upgrade the pricing database schema in place")
+    parser.add_argument('--db', default=DB_PATH, help="Path to the SQLite database")
+    parser.add_argument('--status', action='store_true', help="Only show the schema version")
+    args = parser.parse_args()
+
+    if args.status:
+        conn = sqlite3.connect(args.db)
+        print(f"Schema version: {get_schema_version(conn)} (latest: {LATEST_VERSION})")
+        conn.close()
+        return
+
+    applied = migrate_database(args.db)
+    print(f"Database at version {LATEST_VERSION} ({applied} migration(s) applied): {args.db}")
+
+if __name__ == '__main__':
+    main()
@@ -5,50 +5,117 @@ Copyright (c) 2025 Saeed Alaediny. All rights reserved.
 This module handles lead collection and storage in Airtable.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, EmailStr, validator
-from typing import Optional
-import sys
-import os
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Query, Request
 from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+import os
+import secrets
+import threading
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from integrations.airtable_client import AirtableClient
+from integrations.lead_schema import LEAD_PROJECT_TYPES, LeadRequest, lead_fields
+from data.db_helper import get_pricing_snapshot_async
+from data.lead_enrichment import enrich_lead
+from routes.response_cache import FastJSONResponse
 
 router = APIRouter()
 
-# Initialize Airtable client
-airtable_client = AirtableClient()
+# Guards creation of the per-process AirtableClient
+_airtable_client_lock = threading.Lock()
 
-class LeadRequest(BaseModel):
-    """Request model for lead collection."""
-    name: str = Field(..., min_length=2, max_length=100, description="Customer's full name")
-    email: EmailStr = Field(..., description="Customer's email address")
-    phone: str = Field(..., min_length=10, max_length=20, description="Customer's phone number")
-    project_type: str = Field(..., description="Type of renovation project")
-    size_sqft: Optional[float] = Field(None, gt=0, description="Project size in square feet")
-    finish_level: Optional[str] = Field(None, description="Desired finish level")
-    postal_code: Optional[str] = Field(None, description="Project location postal code")
-    estimated_cost: Optional[float] = Field(None, description="Estimated cost from previous calculation")
-    project_notes: Optional[str] = Field(None, max_length=1000, description="Additional notes or requirements")
-    
-    @validator('phone')
-    def validate_phone(cls, v):
-        """Basic phone number validation."""
-        # Remove common separators
-        cleaned = v.replace('-', '').replace(' ', '').replace('(', '').replace(')', '').replace('+', '')
-        if not cleaned.isdigit() or len(cleaned) < 10:
-            raise ValueError("Phone number must contain at least 10 digits")
-        return v
-    
-    @validator('project_type')
-    def validate_project_type(cls, v):
-        """Validate project type."""
-        valid_types = ['kitchen', 'bathroom', 'basement', 'full_home', 'addition', 'other']
-        if v.lower() not in valid_types:
-            raise ValueError(f"Project type must be one of: {', '.join(valid_types)}")
-        return v.lower()
+def airtable_client_for(app: FastAPI) -> AirtableClient:
+    """
+    Get the app's shared AirtableClient, creating it on first use.
+    
+    The client opens the lead log and its indexes, so it is created when
+    first needed (or by the lifespan in real mode) instead of at import.
+    
+    Args:
+        app: FastAPI application holding the client in app.state
+    
+    Returns:
+        The process-wide AirtableClient
+    """
+    client = getattr(app.state, 'airtable_client', None)
+    if client is None:
+        with _airtable_client_lock:
+            client = getattr(app.state, 'airtable_client', None)
+            if client is None:
+                client = app.state.airtable_client = AirtableClient()
+    return client
+
+async def get_airtable_client(request: Request) -> AirtableClient:
+    """Dependency providing the shared AirtableClient."""
+    client = getattr(request.app.state, 'airtable_client', None)
+    if client is None:
+        # Creation reads the lead log, so keep it off the event loop
+        client = await run_in_threadpool(airtable_client_for, request.app)
+    return client
+
+def require_admin_key(
+    authorization: Optional[str] = Header(None),
+    x_api_key: Optional[str] = Header(None, alias="X-API-Key")
+) -> None:
+    """
+    Dependency admitting only requests that carry the admin API key.
+    
+    The key (LEADS_ADMIN_API_KEY) is accepted as a bearer token or in the
+    X-API-Key header. Without a configured key every request is refused.
+    
+    Raises:
+        HTTPException: 401 if no key is sent, 403 if it is wrong or none is configured
+    """
+    expected = os.getenv('LEADS_ADMIN_API_KEY')
+    if not expected:
+        raise HTTPException(status_code=403, detail="Lead listing is disabled (LEADS_ADMIN_API_KEY is not set)")
+    
+    token = x_api_key
+    if authorization:
+        scheme, _, credentials = authorization.partition(' ')
+        if scheme.lower() == 'bearer':
+            token = credentials.strip()
+    if not token:
+        raise HTTPException(
+            status_code=401,
+            detail="Admin API key required",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    if not secrets.compare_digest(token.encode('utf-8'), expected.encode('utf-8')):
+        raise HTTPException(status_code=403, detail="Invalid admin API key")
+
+def _store_lead(airtable_client: AirtableClient, lead_data: Dict, idempotency_key: Optional[str],
+                price: bool) -> Dict:
+    """
+    Store a lead, pricing it first if it is new (runs in the threadpool).
+    
+    A repeat submission is not stored, so it is not priced either; its
+    estimate is the one stored with the existing lead.
+    
+    Args:
+        airtable_client: Client storing the lead
+        lead_data: Lead fields; 'Estimated Cost' is added when priced
+        idempotency_key: Idempotency key of the request, if any
+        price: Whether to calculate the estimate for a new lead
+    
+    Returns:
+        Result of AirtableClient.create_lead, with the lead's estimated_cost
+    """
+    if price and airtable_client.find_lead(lead_data.get('Email'), lead_data.get('Phone'), idempotency_key) is None:
+        try:
+            enrich_lead(lead_data)
+        except Exception as e:
+            # Never lose a lead because pricing is unavailable
+            print(f"⚠️  Could not estimate lead cost: {e}")
+    result = airtable_client.create_lead(lead_data, idempotency_key=idempotency_key)
+    if result['duplicate']:
+        # Report the estimate stored with the existing lead, not this submission's
+        stored = airtable_client.get_lead(result['record_id'])
+        result['estimated_cost'] = stored['fields'].get('Estimated Cost') if stored else None
+    else:
+        result['estimated_cost'] = lead_data.get('Estimated Cost')
+    return result
 
 class LeadResponse(BaseModel):
     """Response model for lead collection."""
@@ -56,14 +123,36 @@ class LeadResponse(BaseModel):
     message: str
     record_id: str
     created_at: str
+    duplicate: bool = False
+    estimated_cost: Optional[float] = None
+
+class LeadListResponse(BaseModel):
+    """Response model for lead listing."""
+    leads: List[Dict]
+    count: int
+    next_cursor: Optional[str] = None
 
 @router.post("/collect-lead", response_model=LeadResponse)
-async def collect_lead(request: LeadRequest):
+async def collect_lead(
+    request: LeadRequest,
+    airtable_client: AirtableClient = Depends(get_airtable_client),
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", max_length=255,
+        description="Unique key per submission; retries with the same key return the original record"
+    )
+):
     """
     Collect and store lead information.
     
+    A lead with the same email and phone number as an existing lead is not
+    stored twice: the existing record_id is returned with duplicate=true.
+    When estimated_cost is omitted but project type, size and finish level
+    are given, the cost is calculated like /api/estimate and stored with the lead.
+    For a duplicate, the estimate stored with the existing lead is returned.
+    
     Args:
         request: LeadRequest containing customer information
+        idempotency_key: Optional Idempotency-Key header for safe retries
     
     Returns:
         LeadResponse with storage confirmation
@@ -72,35 +161,32 @@ async def collect_lead(request: LeadRequest):
         HTTPException: If lead storage fails
     """
     try:
-        # Prepare lead data for Airtable
-        lead_data = {
-            'Name': request.name,
-            'Email': request.email,
-            'Phone': request.phone,
-            'Project Type': request.project_type.replace('_', ' ').title(),
-            'Size (sq ft)': request.size_sqft,
-            'Finish Level': request.finish_level.capitalize() if request.finish_level else None,
-            'Postal Code': request.postal_code,
-            'Estimated Cost': request.estimated_cost,
-            'Project Notes': request.project_notes,
-            'Lead Source': 'RenovAI ChatGPT Agent',
-            'Status': 'New',
-            'Submitted At': datetime.now().isoformat()
-        }
+        # Prepare lead data for Airtable (None values are left out)
+        lead_data = lead_fields(request)
         
-        # Remove None values
-        lead_data = {k: v for k, v in lead_data.items() if v is not None}
+        # Price the project if the client did not send an estimate
+        price = bool(request.estimated_cost is None and request.size_sqft and request.finish_level)
+        if price:
+            try:
+                await get_pricing_snapshot_async()  # (re)load pricing off the event loop if needed
+            except Exception as e:
+                # Never lose a lead because pricing is unavailable
+                print(f"⚠️  Could not estimate lead cost: {e}")
+                price = False
         
-        # Store lead in Airtable
-        result = airtable_client.create_lead(lead_data)
+        # Dedup lookup, pricing and storage all touch the lead log: keep them off the event loop
+        result = await run_in_threadpool(_store_lead, airtable_client, lead_data, idempotency_key, price)
         
         if result['success']:
-            return LeadResponse(
-                success=True,
-                message="Thank you! Your information has been received. Our team will contact you shortly.",
-                record_id=result['record_id'],
-                created_at=result['created_at']
-            )
+            # Built in LeadResponse shape, so skip response_model re-validation
+            return FastJSONResponse({
+                'success': True,
+                'message': "Thank you! Your information has been received. Our team will contact you shortly.",
+                'record_id': result['record_id'],
+                'created_at': result['created_at'],
+                'duplicate': result['duplicate'],
+                'estimated_cost': result['estimated_cost']
+            })
         else:
             raise HTTPException(
                 status_code=500,
@@ -114,22 +200,86 @@ async def collect_lead(request: LeadRequest):
         )
 
 @router.get("/leads/count")
-async def get_leads_count():
+async def get_leads_count(airtable_client: AirtableClient = Depends(get_airtable_client)):
     """
-    Get the total number of leads stored (for testing/monitoring).
+    Get the number of leads stored, overall and per status and project type (for testing/monitoring).
     
     Returns:
-        Dictionary with lead count
+        Dictionary with lead counts
     """
     try:
-        all_leads = airtable_client.get_all_leads()
-        return {
-            "total_leads": len(all_leads),
+        counts = airtable_client.get_lead_counts()
+        response = {
+            "total_leads": counts['total_leads'],
+            "by_status": counts['by_status'],
+            "by_project_type": counts['by_project_type'],
             "storage_mode": "mock" if airtable_client.use_mock else "airtable"
         }
+        if airtable_client.sync_worker is not None:
+            response["sync"] = airtable_client.sync_worker.stats()
+        return response
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error retrieving lead count: {str(e)}"
         )
 
+
+# Internal sales dashboard endpoint: lists contact details, so it requires the
+# admin API key and is kept out of the OpenAPI schema published to the Custom GPT
+@router.get("/leads", response_model=LeadListResponse, include_in_schema=False,
+            dependencies=[Depends(require_admin_key)])
+def list_leads(
+    status: Optional[str] = Query(None, description="Lead status, e.g. New"),
+    project_type: Optional[str] = Query(None, description="Project type code, e.g. full_home"),
+    postal_prefix: Optional[str] = Query(None, max_length=6, description="Postal code prefix, e.g. V6B"),
+    created_from: Optional[datetime] = Query(None, description="Created at or after (ISO date or timestamp)"),
+    created_to: Optional[datetime] = Query(None, description="Created before (ISO date or timestamp)"),
+    limit: int = Query(50, ge=1, le=200, description="Leads per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort by creation time"),
+    airtable_client: AirtableClient = Depends(get_airtable_client)
+):
+    """
+    List stored leads with filters and keyset pagination (for the sales dashboard).
+    
+    Filters are combined with AND. Each page costs the same regardless of
+    how many leads are stored or how far into the results it is.
+    
+    Returns:
+        LeadListResponse with one page of leads and the cursor for the next page
+    
+    Raises:
+        HTTPException: 400 for an unknown project type or invalid cursor,
+            401/403 without the admin API key
+    """
+    if project_type and project_type.lower().replace(' ', '_') not in LEAD_PROJECT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Project type must be one of: {', '.join(LEAD_PROJECT_TYPES)}"
+        )
+    
+    try:
+        page = airtable_client.query_leads(
+            status=status,
+            project_type=project_type,
+            postal_prefix=postal_prefix,
+            created_from=created_from.isoformat() if created_from else None,
+            created_to=created_to.isoformat() if created_to else None,
+            limit=limit,
+            cursor=cursor,
+            descending=order == "desc"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error listing leads: {str(e)}"
+        )
+    
+    return FastJSONResponse({
+        'leads': page['leads'],
+        'count': len(page['leads']),
+        'next_cursor': page['next_cursor']
+    })
@@ -5,18 +5,35 @@ Copyright (c) 2025 Saeed Alaediny. All rights reserved.
 This module handles renovation cost and timeline estimation requests.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
-import sys
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field, ValidationError, validator
+from typing import Optional, List, Dict, Any
 import os
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from data.db_helper import calculate_estimate, get_all_project_types, get_all_finish_levels
+from data.db_helper import calculate_estimate, calculate_estimates, get_pricing_snapshot_async
+from routes.response_cache import (
+    FastJSONResponse, VersionedLRUCache, cached_json_response, get_versioned, json_bytes
+)
 
 router = APIRouter()
 
+# Accepted values, in the order they are listed in error messages
+PROJECT_TYPES = ('kitchen', 'bathroom', 'basement', 'full_home', 'addition')
+FINISH_LEVELS = ('basic', 'standard', 'premium')
+_PROJECT_TYPE_SET = frozenset(PROJECT_TYPES)
+_FINISH_LEVEL_SET = frozenset(FINISH_LEVELS)
+_PROJECT_TYPE_ERROR = f"Project type must be one of: {', '.join(PROJECT_TYPES)}"
+_FINISH_LEVEL_ERROR = f"Finish level must be one of: {', '.join(FINISH_LEVELS)}"
+
+# Maximum number of projects accepted by /estimate/batch
+MAX_BATCH_SIZE = 50
+
+# Memoized /estimate response bodies, invalidated whenever the pricing data changes
+estimate_cache = VersionedLRUCache(
+    max_size=int(os.getenv('ESTIMATE_CACHE_SIZE', 1024)),
+    ttl_seconds=float(os.getenv('ESTIMATE_CACHE_TTL', 0))
+)
+
 class EstimateRequest(BaseModel):
     """Request model for renovation estimation."""
     project_type: str = Field(..., description="Type of renovation project")
@@ -27,18 +44,18 @@ class EstimateRequest(BaseModel):
     @validator('project_type')
     def validate_project_type(cls, v):
         """Validate project type."""
-        valid_types = ['kitchen', 'bathroom', 'basement', 'full_home', 'addition']
-        if v.lower() not in valid_types:
-            raise ValueError(f"Project type must be one of: {', '.join(valid_types)}")
-        return v.lower()
+        v = v.lower()
+        if v not in _PROJECT_TYPE_SET:
+            raise ValueError(_PROJECT_TYPE_ERROR)
+        return v
     
     @validator('finish_level')
     def validate_finish_level(cls, v):
         """Validate finish level."""
-        valid_levels = ['basic', 'standard', 'premium']
-        if v.lower() not in valid_levels:
-            raise ValueError(f"Finish level must be one of: {', '.join(valid_levels)}")
-        return v.lower()
+        v = v.lower()
+        if v not in _FINISH_LEVEL_SET:
+            raise ValueError(_FINISH_LEVEL_ERROR)
+        return v
     
     @validator('size_sqft')
     def validate_size(cls, v):
@@ -56,11 +73,62 @@ class EstimateResponse(BaseModel):
     estimated_cost_range: dict
     estimated_timeline_weeks: int
     cost_per_sqft: float
+    regional_multiplier: float = 1.0
     suggested_materials: List[str]
     description: str
     location: Optional[str] = None
     disclaimer: str = "This is an approximate estimate. Final costs may vary based on specific requirements, site conditions, and material selections. A detailed consultation is recommended for accurate pricing."
 
+class BatchEstimateRequest(BaseModel):
+    """Request model for estimating several projects at once."""
+    estimates: List[Dict[str, Any]] = Field(..., description="List of EstimateRequest objects")
+    
+    @validator('estimates')
+    def validate_batch_size(cls, v):
+        """Validate the number of projects in the batch."""
+        if not v:
+            raise ValueError("At least one estimate is required")
+        if len(v) > MAX_BATCH_SIZE:
+            raise ValueError(f"Batch exceeds maximum allowed ({MAX_BATCH_SIZE} estimates)")
+        return v
+
+class BatchEstimateResult(BaseModel):
+    """Result for a single project in a batch estimate."""
+    index: int
+    success: bool
+    estimate: Optional[EstimateResponse] = None
+    error: Optional[str] = None
+
+class BatchEstimateResponse(BaseModel):
+    """Response model for batch estimation."""
+    results: List[BatchEstimateResult]
+    count: int
+    succeeded: int
+    failed: int
+
+def _finalize_estimate(estimate: dict, request: EstimateRequest) -> dict:
+    """Add request-specific location and disclaimer fields to an estimate."""
+    # Add location information if provided (always set so the dict matches EstimateResponse)
+    estimate['location'] = f"Greater Vancouver Area ({request.postal_code})" if request.postal_code else None
+    
+    # Add disclaimer
+    estimate['disclaimer'] = EstimateResponse.__fields__['disclaimer'].default
+    
+    return estimate
+
+def _catalog_content(snapshot, field: str, key: str) -> dict:
+    """Build a catalog body listing the distinct values of a pricing field."""
+    values = sorted({getattr(row, field) for row in snapshot.rows.values()})
+    return {key: values, "count": len(values)}
+
+def _format_validation_error(exc: ValidationError) -> str:
+    """Flatten a pydantic ValidationError into a single readable message."""
+    messages = []
+    for error in exc.errors():
+        field = '.'.join(str(loc) for loc in error['loc'])
+        messages.append(f"{field}: {error['msg']}" if field else error['msg'])
+    return '; '.join(messages)
+
 @router.post("/estimate", response_model=EstimateResponse)
 async def get_estimate(request: EstimateRequest):
     """
@@ -75,11 +143,22 @@ async def get_estimate(request: EstimateRequest):
     Raises:
         HTTPException: If estimation data is not available
     """
+    # Make sure pricing is loaded without blocking the event loop
+    snapshot = await get_pricing_snapshot_async()
+    
+    # Serve repeated inputs from the response cache
+    cache_key = (request.project_type, request.finish_level, float(request.size_sqft), request.postal_code)
+    body = estimate_cache.get(cache_key, snapshot.version)
+    if body is not None:
+        return Response(content=body, media_type='application/json')
+    
     # Calculate estimate using database helper
     estimate = calculate_estimate(
         project_type=request.project_type,
         finish_level=request.finish_level,
-        size_sqft=request.size_sqft
+        size_sqft=request.size_sqft,
+        postal_code=request.postal_code,
+        snapshot=snapshot  # the version the cache key was taken from
     )
     
     if not estimate:
@@ -88,40 +167,97 @@ async def get_estimate(request: EstimateRequest):
             detail=f"No estimation data found for {request.project_type} with {request.finish_level} finish level"
         )
     
-    # Add location information if provided
-    if request.postal_code:
-        estimate['location'] = f"Greater Vancouver Area ({request.postal_code})"
+    # The dict is built by us in EstimateResponse shape, so serialize it without re-validation
+    body = json_bytes(_finalize_estimate(estimate, request))
+    estimate_cache.put(cache_key, snapshot.version, body)
+    return Response(content=body, media_type='application/json')
+
+@router.get("/estimate/cache-stats")
+async def get_estimate_cache_stats():
+    """
+    Get hit/miss/eviction counters for the /estimate response cache (for monitoring).
     
-    # Add disclaimer
-    estimate['disclaimer'] = EstimateResponse.__fields__['disclaimer'].default
+    Returns:
+        Dictionary with cache statistics
+    """
+    return estimate_cache.stats()
+
+@router.post("/estimate/batch", response_model=BatchEstimateResponse)
+async def get_batch_estimate(request: BatchEstimateRequest):
+    """
+    Calculate estimates for several projects in a single request.
     
-    return estimate
+    Each item is validated on its own, so one invalid project does not fail
+    the whole batch. Pricing data is fetched once per distinct
+    (project_type, finish_level) pair.
+    
+    Args:
+        request: BatchEstimateRequest containing a list of project details
+    
+    Returns:
+        BatchEstimateResponse with one result per project, in request order
+    """
+    results: List[Optional[dict]] = [None] * len(request.estimates)
+    valid = []
+    
+    for index, item in enumerate(request.estimates):
+        try:
+            valid.append((index, EstimateRequest(**item)))
+        except ValidationError as e:
+            results[index] = {'index': index, 'success': False, 'estimate': None, 'error': _format_validation_error(e)}
+    
+    snapshot = await get_pricing_snapshot_async()
+    estimates = calculate_estimates([
+        (item.project_type, item.finish_level, item.size_sqft, item.postal_code) for _, item in valid
+    ], snapshot)
+    
+    for (index, item), estimate in zip(valid, estimates):
+        if estimate:
+            results[index] = {'index': index, 'success': True, 'estimate': _finalize_estimate(estimate, item), 'error': None}
+        else:
+            results[index] = {
+                'index': index,
+                'success': False,
+                'estimate': None,
+                'error': f"No estimation data found for {item.project_type} with {item.finish_level} finish level"
+            }
+    
+    succeeded = sum(1 for result in results if result['success'])
+    return FastJSONResponse({
+        'results': results,
+        'count': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded
+    })
 
 @router.get("/project-types")
-async def get_project_types():
+async def get_project_types(request: Request):
     """
     Get list of available project types.
     
+    The response is serialized once per pricing data version and supports
+    conditional requests via ETag / If-None-Match.
+    
     Returns:
         Dictionary containing list of project types
     """
-    project_types = get_all_project_types()
-    return {
-        "project_types": project_types,
-        "count": len(project_types)
-    }
+    snapshot = await get_pricing_snapshot_async()
+    cached = get_versioned('project_types', snapshot.version,
+                           lambda: _catalog_content(snapshot, 'project_type', 'project_types'))
+    return cached_json_response(request, cached)
 
 @router.get("/finish-levels")
-async def get_finish_levels():
+async def get_finish_levels(request: Request):
     """
     Get list of available finish levels.
     
+    The response is serialized once per pricing data version and supports
+    conditional requests via ETag / If-None-Match.
+    
     Returns:
         Dictionary containing list of finish levels
     """
-    finish_levels = get_all_finish_levels()
-    return {
-        "finish_levels": finish_levels,
-        "count": len(finish_levels)
-    }
-
+    snapshot = await get_pricing_snapshot_async()
+    cached = get_versioned('finish_levels', snapshot.version,
+                           lambda: _catalog_content(snapshot, 'finish_level', 'finish_levels'))
+    return cached_json_response(request, cached)
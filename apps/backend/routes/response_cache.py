@@ -0,0 +1,243 @@
+"""
+RenovAI Canada - Response Cache Helpers
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module provides pre-serialized JSON responses with strong ETags, so
+read-mostly endpoints can skip serialization and answer conditional
+requests with 304 Not Modified, a versioned LRU cache for memoizing
+computed response bodies, and a fast JSON response class for trusted
+internal dicts.
+"""
+
+from collections import OrderedDict
+from fastapi import Request, Response
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the standard library
+    orjson = None
+
+# Seconds clients may reuse catalog responses before revalidating
+CATALOG_MAX_AGE = int(os.getenv('CATALOG_MAX_AGE', 60))
+CATALOG_CACHE_CONTROL = f"public, max-age={CATALOG_MAX_AGE}, must-revalidate"
+
+def json_bytes(content: Any) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON, using orjson when it is installed.
+
+    Args:
+        content: JSON-serializable content (plain dicts, lists, str, numbers)
+
+    Returns:
+        Encoded JSON body
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+class FastJSONResponse(Response):
+    """
+    JSON response for dicts built by our own code.
+
+    Returning a Response instance bypasses FastAPI's response_model
+    re-validation, so only use it for content already in the documented shape.
+    """
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        return json_bytes(content)
+
+class CachedJSON(NamedTuple):
+    """A JSON body serialized once, together with its strong ETag."""
+    body: bytes
+    etag: str
+
+# Cached bodies keyed by name, each tagged with the data version it was built from
+_versioned: Dict[str, Tuple[Any, CachedJSON]] = {}
+_versioned_lock = threading.Lock()
+
+def build_cached_json(content: Any) -> CachedJSON:
+    """
+    Serialize content to compact JSON bytes and compute its strong ETag.
+
+    Args:
+        content: JSON-serializable content
+
+    Returns:
+        CachedJSON with body and quoted ETag
+    """
+    body = json_bytes(content)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return CachedJSON(body=body, etag=etag)
+
+def get_versioned(name: str, version: Any, builder: Callable[[], Any]) -> CachedJSON:
+    """
+    Return the cached body for name, rebuilding it when the data version changes.
+
+    Args:
+        name: Cache entry name
+        version: Version of the data the content is derived from
+        builder: Function returning the content to serialize
+
+    Returns:
+        CachedJSON for the current version
+    """
+    entry = _versioned.get(name)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    cached = build_cached_json(builder())
+    with _versioned_lock:
+        _versioned[name] = (version, cached)
+    return cached
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)."""
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def cached_json_response(request: Request, cached: CachedJSON,
+                         cache_control: str = CATALOG_CACHE_CONTROL) -> Response:
+    """
+    Build a response for a pre-serialized body, honouring If-None-Match.
+
+    Args:
+        request: Incoming request (for conditional headers)
+        cached: Pre-serialized body and ETag
+        cache_control: Cache-Control header value
+
+    Returns:
+        200 response with the body, or 304 if the client's copy is current
+    """
+    headers = {'ETag': cached.etag, 'Cache-Control': cache_control}
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and _etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=cached.body, media_type='application/json', headers=headers)
+
+class VersionedLRUCache:
+    """
+    Thread-safe LRU cache with optional TTL, tied to a data version.
+
+    All entries are dropped as soon as a lookup or store is made with a
+    different data version, so cached values never outlive the data they
+    were computed from.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept (0 disables caching)
+            ttl_seconds: Entry lifetime in seconds (0 means no expiry)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()
+        self._version: Any = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version: Any) -> None:
+        """Drop every entry if the data version changed (caller holds the lock)."""
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: Any) -> Optional[Any]:
+        """
+        Look up a value, marking it as most recently used.
+
+        Args:
+            key: Cache key
+            version: Current data version
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, version: Any, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            version: Data version the value was computed from
+            value: Value to cache
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        with self._lock:
+            # Only lookups advance the version; a late store computed from older data is dropped
+            if version != self._version:
+                return
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with size, limits, hit/miss/eviction counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'data_version': self._version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,15 @@
+import shutil
+
+import pytest
+
+from data import db_helper
+
+
+@pytest.fixture
+def pricing_db(tmp_path, monkeypatch):
+    """Point db_helper at a scratch copy of the pricing database."""
+    db_path = tmp_path / 'pricing_timeline.db'
+    shutil.copy(db_helper.DB_PATH, db_path)
+    monkeypatch.setattr(db_helper, 'DB_PATH', str(db_path))
+    monkeypatch.setattr(db_helper, '_snapshot', None)
+    return db_path
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from integrations.airtable_api import AirtableAPI, AirtableError, TokenBucket, parse_retry_after
+from integrations.fake_airtable import start_fake_airtable
+
+
+@pytest.fixture
+def fake_airtable():
+    server = start_fake_airtable(rate_limit=50)
+    yield server
+    server.shutdown()
+
+
+def test_create_in_batches_and_stream_pages(fake_airtable):
+    api = AirtableAPI('key', 'appTest', 'Leads', api_url=fake_airtable.url, rate_limit=50)
+
+    async def scenario():
+        try:
+            ids = await api.create_records([{'Name': f'lead{i}'} for i in range(25)])
+            names = [r['fields']['Name'] async for r in api.iter_records(page_size=10)]
+            return ids, names
+        finally:
+            await api.aclose()
+
+    ids, names = asyncio.run(scenario())
+
+    assert len(set(ids)) == 25
+    assert names == [f'lead{i}' for i in range(25)]
+    assert [method for method, _ in fake_airtable.requests] == ['POST'] * 3 + ['GET'] * 3
+
+
+def test_rate_limited_response_carries_airtable_penalty(fake_airtable):
+    fake_airtable.rate_limit = 1
+    api = AirtableAPI('key', 'appTest', 'Leads', api_url=fake_airtable.url, rate_limit=100)
+
+    async def scenario():
+        try:
+            await api.create_records([{'Name': 'a'}])
+            await api.create_records([{'Name': 'b'}])
+        finally:
+            await api.aclose()
+
+    with pytest.raises(AirtableError) as error:
+        asyncio.run(scenario())
+    assert error.value.status_code == 429 and error.value.retryable
+    assert error.value.retry_after == 30.0
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    in_a_minute = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+
+    assert parse_retry_after('2.5') == 2.5
+    assert 55 <= parse_retry_after(in_a_minute) <= 60
+    assert parse_retry_after('Mon, 05 Oct 2020 10:00:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None and parse_retry_after(None) is None
+
+
+def _api_answering(status, text, headers=None):
+    api = AirtableAPI('key', 'appTest', 'Leads', rate_limit=100)
+    transport = httpx.MockTransport(lambda request: httpx.Response(status, text=text, headers=headers))
+    api._client = httpx.AsyncClient(transport=transport, base_url='https://airtable.test/v0/appTest/')
+    return api
+
+
+@pytest.mark.parametrize('status, headers', [(503, {'Retry-After': 'not a date'}), (200, None)])
+def test_unexpected_responses_raise_retryable_airtable_errors(status, headers):
+    api = _api_answering(status, '<html>Bad gateway</html>', headers)
+
+    async def scenario():
+        try:
+            await api.create_records([{'Name': 'a'}])
+        finally:
+            await api.aclose()
+
+    with pytest.raises(AirtableError) as error:
+        asyncio.run(scenario())
+    assert error.value.retryable and error.value.retry_after is None
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    async def take(n):
+        for _ in range(n):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(take(6))
+    # Two tokens are available immediately, the other four arrive at 20/s
+    assert time.monotonic() - start >= 0.19
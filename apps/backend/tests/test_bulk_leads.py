@@ -0,0 +1,72 @@
+import asyncio
+import csv
+import json
+
+import pytest
+
+from integrations import airtable_client
+from integrations.airtable_client import AirtableClient
+from integrations.bulk_leads import export_leads, import_leads
+
+ROWS = [
+    {'Name': 'Jane Smith', 'Email': 'jane@example.com', 'Phone': '604-555-0101', 'Project Type': 'Full Home', 'Finish Level': 'Premium'},
+    {'Name': 'Jane S.', 'Email': 'JANE@example.com', 'Phone': '(604) 555 0101', 'Project Type': 'Kitchen', 'Finish Level': ''},
+    {'Name': 'Bob Lee', 'Email': 'bob@example.com', 'Phone': '123', 'Project Type': 'Kitchen', 'Finish Level': ''},
+    {'Name': 'Ann Chu', 'Email': 'ann@example.com', 'Phone': '778-555-0199', 'Project Type': 'pool', 'Finish Level': ''},
+    {'Name': 'Raj Patel', 'Email': 'raj@example.com', 'Phone': '+1 778 555 0142', 'Project Type': 'bathroom', 'Finish Level': 'basic'},
+]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    return AirtableClient()
+
+
+@pytest.fixture
+def partner_csv(tmp_path):
+    path = tmp_path / 'partner.csv'
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(ROWS)
+    return str(path)
+
+
+def test_import_validates_dedupes_and_is_idempotent(client, partner_csv, tmp_path):
+    errors_path = tmp_path / 'errors.jsonl'
+    stats = import_leads(partner_csv, client=client, workers=2, chunk_size=2,
+                         errors_path=str(errors_path), progress=False)
+
+    assert (stats['rows'], stats['imported'], stats['duplicates'], stats['invalid']) == (5, 2, 1, 2)
+    fields = [r['fields'] for r in client.iter_leads()]
+    assert [f['Name'] for f in fields] == ['Jane Smith', 'Raj Patel']
+    assert fields[0]['Project Type'] == 'Full Home' and fields[0]['Lead Source'] == 'Bulk Import'
+    assert [json.loads(line)['row'] for line in open(errors_path)] == [3, 4]
+    assert client.count_leads() == 2
+
+    again = import_leads(partner_csv, client=client, workers=1, progress=False)
+    assert (again['imported'], again['duplicates']) == (0, 3)
+
+
+def test_export_streams_all_leads(client, partner_csv, tmp_path):
+    import_leads(partner_csv, client=client, workers=1, progress=False)
+    output = tmp_path / 'export.csv'
+
+    stats = export_leads(str(output), client=client, progress=False)
+
+    with open(output, newline='') as f:
+        exported = list(csv.DictReader(f))
+    assert stats['rows'] == len(exported) == 2
+    assert exported[1]['Email'] == 'raj@example.com' and exported[1]['id'].startswith('rec')
+
+
+def test_get_all_leads_streams_the_log_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(airtable_client, 'LEAD_STREAM_CHUNK', 3)
+    for i in range(7):
+        client.lead_log.append({'id': f'rec{i}', 'fields': {'Name': f'lead{i}'}})
+
+    async def collect():
+        return [lead['id'] async for lead in client.get_all_leads()]
+
+    assert asyncio.run(collect()) == [f'rec{i}' for i in range(7)]
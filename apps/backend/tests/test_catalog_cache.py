@@ -0,0 +1,43 @@
+import os
+import sqlite3
+
+from fastapi.testclient import TestClient
+
+from app import app
+
+client = TestClient(app)
+
+
+def test_catalog_returns_etag_and_304_on_match(pricing_db):
+    response = client.get('/api/finish-levels')
+    assert response.status_code == 200
+    assert response.json() == {'finish_levels': ['basic', 'premium', 'standard'], 'count': 3}
+    assert 'max-age' in response.headers['cache-control']
+    etag = response.headers['etag']
+
+    cached = client.get('/api/finish-levels', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.content == b''
+    assert cached.headers['etag'] == etag
+
+
+def test_catalog_changes_with_pricing_data(pricing_db):
+    etag = client.get('/api/project-types').headers['etag']
+
+    conn = sqlite3.connect(pricing_db)
+    conn.execute("INSERT INTO pricing_timeline (project_type, finish_level, cost_per_sqft, avg_duration_weeks) VALUES ('deck', 'basic', 50, 2)")
+    conn.commit()
+    conn.close()
+    st = os.stat(pricing_db)
+    os.utime(pricing_db, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    response = client.get('/api/project-types', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert 'deck' in response.json()['project_types']
+    assert response.headers['etag'] != etag
+
+
+def test_api_info_supports_conditional_requests():
+    response = client.get('/api/info')
+    assert response.json()['api_name'] == 'RenovAI Canada'
+    assert client.get('/api/info', headers={'If-None-Match': response.headers['etag']}).status_code == 304
@@ -0,0 +1,129 @@
+import os
+import sqlite3
+
+import pytest
+
+from data import db_helper
+
+
+def test_calculate_estimate_uses_snapshot(pricing_db):
+    estimate = db_helper.calculate_estimate('Kitchen', 'PREMIUM', 1200)
+    assert estimate['estimated_cost'] == 480000.0
+    assert estimate['estimated_cost_range'] == {'min': 432000.0, 'max': 552000.0}
+    assert estimate['estimated_timeline_weeks'] == 8
+    assert estimate['suggested_materials'][0] == 'Quartz countertops'
+    assert db_helper.calculate_estimate('garage', 'basic', 100) is None
+
+
+def test_snapshot_reloads_when_database_changes(pricing_db):
+    first = db_helper.get_pricing_snapshot()
+    assert db_helper.get_pricing_snapshot() is first
+
+    conn = sqlite3.connect(pricing_db)
+    conn.execute("UPDATE pricing_timeline SET cost_per_sqft = 999 WHERE project_type = 'kitchen' AND finish_level = 'basic'")
+    conn.commit()
+    conn.close()
+    st = os.stat(pricing_db)
+    os.utime(pricing_db, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    second = db_helper.get_pricing_snapshot()
+    assert second.version == first.version + 1
+    assert second.rows[('kitchen', 'basic')].cost_per_sqft == 999
+    assert first.rows[('kitchen', 'basic')].cost_per_sqft == 150.0
+
+
+def test_invalidate_pricing_cache_forces_reload(pricing_db):
+    first = db_helper.get_pricing_snapshot()
+    db_helper.invalidate_pricing_cache()
+    assert db_helper.get_pricing_snapshot().version == first.version + 1
+
+
+def test_calculate_estimates_bulk_matches_scalar_path(pricing_db):
+    np = pytest.importorskip('numpy')
+    projects = [
+        ('kitchen', 'premium', 1200, None),
+        ('Bathroom', 'basic', 80.5, 'V3N 4K1'),
+        ('full_home', 'standard', 3500, 'V7S 1A1'),
+        ('kitchen', 'basic', 0.06, 'V6B 1A1'),  # 9.315 min: np.round gives 9.32, round() 9.31
+        ('kitchen', 'basic', 0.1, 'V6B 1A1'),  # 15.525 min: np.round gives 15.52, round() 15.53
+        ('basement', 'premium', 0, None),
+        ('addition', 'basic', -25, 'V2Y 1A1'),
+        ('basement', 'premium', float('nan'), None),
+        ('garage', 'basic', 100, None),
+    ]
+    types, levels, sizes, postal_codes = zip(*projects)
+
+    results = db_helper.calculate_estimates_bulk(types, levels, sizes, postal_codes)
+
+    assert results['found'].tolist() == [True] * 8 + [False]
+    assert results['estimated_timeline_weeks'][8] == -1
+    for i, project in enumerate(projects[:8]):
+        expected = db_helper.calculate_estimate(*project)
+        actual = {
+            'estimated_cost': results['estimated_cost'][i].item(),
+            'min': results['estimated_cost_min'][i].item(),
+            'max': results['estimated_cost_max'][i].item(),
+            'estimated_timeline_weeks': results['estimated_timeline_weeks'][i].item(),
+            'regional_multiplier': results['regional_multiplier'][i].item(),
+        }
+        wanted = {
+            'estimated_cost': expected['estimated_cost'],
+            'min': expected['estimated_cost_range']['min'],
+            'max': expected['estimated_cost_range']['max'],
+            'estimated_timeline_weeks': expected['estimated_timeline_weeks'],
+            'regional_multiplier': expected['regional_multiplier'],
+        }
+        assert np.isnan(actual['estimated_cost']) == np.isnan(wanted['estimated_cost'])
+        if not np.isnan(wanted['estimated_cost']):
+            assert actual == wanted, project
+
+    with pytest.raises(OverflowError):
+        db_helper.calculate_estimate('kitchen', 'basic', float('inf'))
+    with pytest.raises(OverflowError):
+        db_helper.calculate_estimates_bulk(['kitchen'], ['basic'], [float('inf')])
+
+
+def test_reload_reads_through_a_read_only_connection(pricing_db):
+    conn = db_helper._open_read_connection()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM pricing_timeline")
+    finally:
+        conn.close()
+
+
+def test_async_reload_runs_off_the_event_loop(pricing_db, monkeypatch):
+    import asyncio
+    import threading
+    load_snapshot = db_helper._load_snapshot
+    threads = []
+
+    def recording_load(*args):
+        threads.append(threading.current_thread().name)
+        return load_snapshot(*args)
+
+    monkeypatch.setattr(db_helper, '_load_snapshot', recording_load)
+    snapshot = asyncio.run(db_helper.get_pricing_snapshot_async())
+
+    assert snapshot.rows[('kitchen', 'basic')].cost_per_sqft == 150.0
+    assert len(threads) == 1 and threads[0].startswith('pricing-db')
+
+
+def test_snapshot_reloads_when_data_version_changes_under_same_file_signature(pricing_db, monkeypatch):
+    monkeypatch.setattr(db_helper, 'DB_VERSION_CHECK_INTERVAL', 0)
+    first = db_helper.get_pricing_snapshot()
+    st = os.stat(pricing_db)
+
+    conn = sqlite3.connect(pricing_db)
+    conn.execute("UPDATE pricing_timeline SET cost_per_sqft = 175 WHERE project_type = 'kitchen' AND finish_level = 'basic'")
+    conn.commit()
+    conn.close()
+    # Same size and (coarse) mtime as before the edit
+    os.utime(pricing_db, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert db_helper._file_state() == first.signature[0]
+
+    second = db_helper.get_pricing_snapshot()
+    assert second.version == first.version + 1
+    assert second.data_version == first.data_version + 1
+    assert second.rows[('kitchen', 'basic')].cost_per_sqft == 175
+    assert db_helper.get_pricing_snapshot() is second
@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from app import app
+
+client = TestClient(app)
+
+
+def test_batch_estimate_preserves_order_and_reports_item_errors(pricing_db):
+    response = client.post('/api/estimate/batch', json={'estimates': [
+        {'project_type': 'kitchen', 'size_sqft': 150, 'finish_level': 'basic'},
+        {'project_type': 'kitchen', 'size_sqft': 150, 'finish_level': 'gold'},
+        {'project_type': 'Kitchen', 'size_sqft': 150, 'finish_level': 'Premium', 'postal_code': 'V6B 1A1'},
+    ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body['count'], body['succeeded'], body['failed']) == (3, 2, 1)
+    assert [r['index'] for r in body['results']] == [0, 1, 2]
+    assert body['results'][0]['estimate']['estimated_cost'] == 22500.0
+    assert 'finish_level' in body['results'][1]['error']
+    assert body['results'][2]['estimate']['location'] == 'Greater Vancouver Area (V6B 1A1)'
+
+
+def test_batch_estimate_rejects_empty_batch():
+    assert client.post('/api/estimate/batch', json={'estimates': []}).status_code == 422
+
+
+def test_fast_serialized_estimate_matches_response_model(pricing_db):
+    from routes.estimate import EstimateResponse
+
+    body = client.post('/api/estimate', json={'project_type': 'bathroom', 'size_sqft': 60, 'finish_level': 'basic'}).json()
+    assert list(body) == list(EstimateResponse.__fields__)
+    assert body['location'] is None
+    assert EstimateResponse(**body).estimated_cost == 12000.0
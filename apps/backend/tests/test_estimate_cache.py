@@ -0,0 +1,73 @@
+from fastapi.testclient import TestClient
+
+from app import app
+from data import db_helper
+from routes import estimate
+from routes.response_cache import VersionedLRUCache
+
+client = TestClient(app)
+
+KITCHEN = {'project_type': 'Kitchen', 'size_sqft': 200, 'finish_level': 'standard', 'postal_code': 'V5K 0A1'}
+
+
+def test_repeated_estimate_is_served_from_cache(pricing_db, monkeypatch):
+    monkeypatch.setattr(estimate, 'estimate_cache', VersionedLRUCache(max_size=8))
+
+    first = client.post('/api/estimate', json=KITCHEN)
+    second = client.post('/api/estimate', json=dict(KITCHEN, project_type='kitchen', size_sqft=200.0))
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert first.json()['estimated_cost'] == 52500.0  # 200 sqft x $250 x V5K multiplier 1.05
+    assert first.json()['location'] == 'Greater Vancouver Area (V5K 0A1)'
+    stats = client.get('/api/estimate/cache-stats').json()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+
+def test_cache_is_invalidated_when_pricing_changes(pricing_db, monkeypatch):
+    monkeypatch.setattr(estimate, 'estimate_cache', VersionedLRUCache(max_size=8))
+    client.post('/api/estimate', json=KITCHEN)
+
+    db_helper.invalidate_pricing_cache()
+    client.post('/api/estimate', json=KITCHEN)
+
+    stats = estimate.estimate_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (0, 2, 1)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = VersionedLRUCache(max_size=2)
+    for key in ('a', 'b'):
+        cache.get(key, 1)
+        cache.put(key, 1, key.upper())
+    cache.get('a', 1)
+    cache.put('c', 1, 'C')
+
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) == 'A'
+    assert cache.stats()['evictions'] == 1
+    cache.put('d', 0, 'stale')
+    assert cache.get('d', 1) is None
+
+
+def test_estimate_is_priced_from_the_snapshot_it_is_cached_under(pricing_db, monkeypatch):
+    monkeypatch.setattr(estimate, 'estimate_cache', VersionedLRUCache(max_size=8))
+    snapshot = db_helper.get_pricing_snapshot()
+
+    async def fetched_snapshot():
+        return snapshot
+
+    def no_reload(*args):
+        raise AssertionError("pricing reloaded inside the handler")
+
+    monkeypatch.setattr(estimate, 'get_pricing_snapshot_async', fetched_snapshot)
+    db_helper.invalidate_pricing_cache()  # the data changes after the handler fetched its snapshot
+    monkeypatch.setattr(db_helper, '_load_snapshot', no_reload)
+
+    single = client.post('/api/estimate', json=KITCHEN)
+    batch = client.post('/api/estimate/batch', json={'estimates': [KITCHEN]})
+
+    assert single.status_code == batch.status_code == 200
+    assert single.json()['estimated_cost'] == 52500.0
+    assert batch.json()['results'][0]['estimate']['estimated_cost'] == 52500.0
+    assert estimate.estimate_cache.get(('kitchen', 'standard', 200.0, 'V5K 0A1'), snapshot.version) == single.content
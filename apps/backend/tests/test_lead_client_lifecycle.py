@@ -0,0 +1,53 @@
+import asyncio
+
+from fastapi import FastAPI
+
+from integrations.airtable_client import AirtableClient
+from routes import collect_lead
+from routes.collect_lead import airtable_client_for
+
+
+def test_import_creates_no_client():
+    assert not hasattr(collect_lead, 'airtable_client')
+
+
+def test_client_is_created_once_per_app_and_shut_down(tmp_path, monkeypatch):
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    app = FastAPI()
+    assert getattr(app.state, 'airtable_client', None) is None
+
+    client = airtable_client_for(app)
+    assert airtable_client_for(app) is client
+    client.create_lead({'Name': 'Jane', 'Email': 'jane@example.com', 'Phone': '6045550101', 'Status': 'New'})
+
+    asyncio.run(client.shutdown())
+    assert (tmp_path / 'leads.counts.json').exists() and (tmp_path / 'leads.index.json').exists()
+
+
+def _off_event_loop(method):
+    def wrapper(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return method(*args, **kwargs)
+        raise AssertionError(f"{method.__name__} ran on the event loop")
+    return wrapper
+
+
+def test_collect_lead_stores_off_the_event_loop(pricing_db, tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app import app
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    client = AirtableClient()
+    monkeypatch.setattr(app.state, 'airtable_client', client, raising=False)
+    for name in ('find_lead', 'create_lead', 'get_lead'):
+        monkeypatch.setattr(client, name, _off_event_loop(getattr(client, name)))
+    monkeypatch.setattr(collect_lead, 'enrich_lead', _off_event_loop(collect_lead.enrich_lead))
+    lead = {'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '604-555-0101',
+            'project_type': 'kitchen', 'size_sqft': 200, 'finish_level': 'basic'}
+
+    responses = [TestClient(app).post('/api/collect-lead', json=lead) for _ in range(2)]
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert [r.json()['duplicate'] for r in responses] == [False, True]
+    assert responses[0].json()['estimated_cost'] is not None
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from integrations.airtable_client import AirtableClient
+from integrations.lead_store import LeadIndex, LeadLog, _LogFollower
+
+LEAD = {'Name': 'Jane Smith', 'Email': 'jane@example.com', 'Phone': '604-555-0101', 'Status': 'New'}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    return AirtableClient()
+
+
+def test_duplicate_lead_returns_existing_record(client, tmp_path):
+    first = client.create_lead(LEAD)
+    again = client.create_lead({**LEAD, 'Email': ' JANE@Example.com', 'Phone': '(604) 555 0101', 'Project Notes': 'Call after 5'})
+
+    assert not first['duplicate'] and again['duplicate']
+    assert again['record_id'] == first['record_id']
+    assert client.count_leads() == 1
+    merged = list(LeadLog(str(tmp_path / 'leads.duplicates.jsonl')))
+    assert merged[0]['record_id'] == first['record_id'] and merged[0]['fields']['Project Notes'] == 'Call after 5'
+
+    other = client.create_lead({**LEAD, 'Phone': '604-555-0199'})
+    assert not other['duplicate'] and client.count_leads() == 2
+
+
+def test_idempotency_key_replays_original_record(client, tmp_path):
+    first = client.create_lead(LEAD, idempotency_key='submit-1')
+    retry = client.create_lead({**LEAD, 'Email': 'typo@example.com'}, idempotency_key='submit-1')
+
+    assert retry['duplicate'] and retry['record_id'] == first['record_id']
+    assert retry['message'] == 'Lead already received'
+    assert not (tmp_path / 'leads.duplicates.jsonl').exists()
+
+
+def test_concurrent_submissions_store_one_lead(tmp_path, monkeypatch):
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    # Separate clients stand in for separate workers sharing the lead log
+    clients = [AirtableClient(), AirtableClient()]
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(clients[i % 2].create_lead(LEAD)))
+               for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({r['record_id'] for r in results}) == 1
+    assert sum(not r['duplicate'] for r in results) == 1
+
+
+def test_batch_import_skips_leads_stored_by_other_writers(tmp_path, monkeypatch):
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    importer, form = AirtableClient(), AirtableClient()
+    form.create_lead(LEAD)  # arrives after the importer last refreshed its index
+    ann = {**LEAD, 'Email': 'ann@example.com'}
+
+    stored = importer.create_leads([{**LEAD, 'Name': 'Jane S.'}, ann, {**ann, 'Name': 'Ann again'}])
+
+    assert [record['fields'] for record in stored] == [ann]
+    assert importer.count_leads() == 2
+
+
+def test_log_followers_must_implement_their_hooks(tmp_path):
+    class Partial(_LogFollower):
+        def _clear(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial(LeadLog(str(tmp_path / 'leads.jsonl')))
+
+
+def test_index_is_persisted_and_resumed(tmp_path):
+    log = LeadLog(str(tmp_path / 'leads.jsonl'))
+    log.append({'id': 'rec1', 'created_at': 't1', 'fields': LEAD})
+    index = LeadIndex(log)
+    index.refresh()
+    index.save()
+
+    log.append({'id': 'rec2', 'created_at': 't2', 'fields': {**LEAD, 'Email': 'ann@example.com'},
+                'idempotency_key': 'k2'})
+    resumed = LeadIndex(log)
+    assert resumed.offset == index.offset
+    resumed.refresh()
+
+    assert resumed.find(('jane@example.com', '6045550101')) == ('rec1', 't1')
+    assert resumed.find(idempotency_key='k2') == ('rec2', 't2')
+    assert 'jane@example.com' not in (tmp_path / 'leads.index.json').read_text()
@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from data import lead_enrichment
+from data.db_helper import calculate_estimate
+from data.lead_enrichment import enrich_lead, enrich_leads
+from integrations.airtable_client import AirtableClient
+
+
+def _leads():
+    return [
+        {'Project Type': 'Full Home', 'Finish Level': 'Premium', 'Size (sq ft)': 1500, 'Postal Code': 'V6B 1A1'},
+        {'Project Type': 'Kitchen', 'Finish Level': 'Basic', 'Size (sq ft)': '200'},
+        {'Project Type': 'Bathroom', 'Finish Level': 'Standard', 'Size (sq ft)': 80, 'Estimated Cost': 12345.0},
+        {'Project Type': 'Kitchen', 'Size (sq ft)': 200},
+        {'Project Type': 'Other', 'Finish Level': 'Basic', 'Size (sq ft)': 100},
+    ]
+
+
+def _expected():
+    return [
+        calculate_estimate('full_home', 'premium', 1500, 'V6B 1A1')['estimated_cost'],
+        calculate_estimate('kitchen', 'basic', 200)['estimated_cost'],
+        12345.0,
+        None,
+        None,
+    ]
+
+
+def test_batch_matches_single_estimates(pricing_db):
+    leads = _leads()
+
+    assert enrich_leads(leads) == 2
+    assert [lead.get('Estimated Cost') for lead in leads] == _expected()
+
+
+def test_batch_falls_back_without_numpy(pricing_db, monkeypatch):
+    def no_numpy(*args):
+        raise ImportError("No module named 'numpy'")
+    monkeypatch.setattr(lead_enrichment, 'calculate_estimates_bulk', no_numpy)
+    leads = _leads()
+
+    assert enrich_leads(leads) == 2
+    assert [lead.get('Estimated Cost') for lead in leads] == _expected()
+
+
+def test_single_lead_keeps_client_estimate(pricing_db):
+    leads = _leads()
+
+    assert [enrich_lead(lead) for lead in leads] == [True, True, False, False, False]
+    assert [lead.get('Estimated Cost') for lead in leads] == _expected()
+
+
+def test_collect_lead_fills_in_estimate(pricing_db, tmp_path, monkeypatch):
+    from app import app
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    monkeypatch.setattr(app.state, 'airtable_client', AirtableClient(), raising=False)
+    lead = {'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '604-555-0101',
+            'project_type': 'kitchen', 'size_sqft': 200, 'finish_level': 'basic'}
+
+    response = TestClient(app).post('/api/collect-lead', json=lead)
+
+    assert response.status_code == 200
+    expected = calculate_estimate('kitchen', 'basic', 200)['estimated_cost']
+    assert response.json()['estimated_cost'] == expected
+    stored = next(iter(app.state.airtable_client.iter_leads()))
+    assert stored['fields']['Estimated Cost'] == expected
+
+
+def test_duplicate_reports_the_stored_estimate(pricing_db, tmp_path, monkeypatch):
+    from app import app
+    monkeypatch.setenv('MOCK_LEADS_FILE', str(tmp_path / 'leads.jsonl'))
+    monkeypatch.setattr(app.state, 'airtable_client', AirtableClient(), raising=False)
+    client = TestClient(app)
+    lead = {'name': 'Jane Smith', 'email': 'jane@example.com', 'phone': '604-555-0101', 'project_type': 'kitchen'}
+
+    first = client.post('/api/collect-lead', json=lead)
+    again = client.post('/api/collect-lead', json={**lead, 'size_sqft': 200, 'finish_level': 'basic'})
+
+    assert first.json()['estimated_cost'] is None
+    assert again.json()['duplicate'] and again.json()['estimated_cost'] is None
+
+    other = {**lead, 'email': 'ann@example.com', 'size_sqft': 200, 'finish_level': 'basic'}
+    stored_cost = client.post('/api/collect-lead', json=other).json()['estimated_cost']
+    repeat = client.post('/api/collect-lead', json={**other, 'size_sqft': 900})
+    assert stored_cost is not None and repeat.json()['estimated_cost'] == stored_cost
@@ -0,0 +1,99 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from integrations.airtable_client import AirtableClient
+from integrations.lead_query import LeadDatabase
+from integrations.lead_store import LeadLog
+
+
+def _lead(i, status='New', project_type='Kitchen', postal='V6B 1A1', day=1):
+    return {
+        'id': f'rec{i:04d}',
+        'created_at': f'2025-03-{day:02d}T10:00:00',
+        'fields': {'Name': f'Lead {i}', 'Status': status, 'Project Type': project_type, 'Postal Code': postal}
+    }
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = LeadLog(str(tmp_path / 'leads.jsonl'))
+    log.extend([
+        _lead(0),
+        _lead(1, project_type='Full Home', postal='v5k0a1', day=2),
+        _lead(2, status='Contacted', day=3),
+        _lead(3, postal='V6C 2B2', day=3),
+        _lead(4, day=5),
+    ])
+    return log
+
+
+def _ids(page):
+    return [lead['id'] for lead in page['leads']]
+
+
+def test_filters_combine(log):
+    db = LeadDatabase(log)
+
+    assert _ids(db.query(status='New', project_type='kitchen')) == ['rec0004', 'rec0003', 'rec0000']
+    assert _ids(db.query(project_type='full_home')) == ['rec0001']
+    assert _ids(db.query(postal_prefix='v6b')) == ['rec0004', 'rec0002', 'rec0000']
+    assert _ids(db.query(created_from='2025-03-02', created_to='2025-03-04', descending=False)) == \
+        ['rec0001', 'rec0002', 'rec0003']
+
+
+def test_keyset_pagination_walks_every_lead_once(log):
+    db = LeadDatabase(log)
+    seen, cursor = [], None
+    while True:
+        page = db.query(limit=2, cursor=cursor)
+        seen.extend(_ids(page))
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == ['rec0004', 'rec0003', 'rec0002', 'rec0001', 'rec0000']
+    with pytest.raises(ValueError):
+        db.query(cursor='not-a-cursor')
+
+
+def test_follows_appends_and_rebuilds_after_replacement(log, tmp_path):
+    db = LeadDatabase(log)
+    assert len(db.query()['leads']) == 5
+
+    log.append(_lead(5, day=6))
+    assert _ids(db.query(limit=1)) == ['rec0005']
+    # A second store sharing the database resumes from the saved log position
+    assert LeadDatabase(log).refresh() == 0
+
+    log.close()
+    (tmp_path / 'leads.jsonl').unlink()
+    fresh = LeadLog(str(tmp_path / 'leads.jsonl'))
+    fresh.append(_lead(9))
+    assert _ids(db.query()) == ['rec0009']
+
+
+def test_refresh_without_new_leads_writes_nothing(log):
+    db = LeadDatabase(log)
+    assert db.refresh() == 5
+    conn = db._connection()
+    changes = conn.total_changes
+
+    assert db.refresh() == 0 and db.query()['leads']
+    assert conn.total_changes == changes and not conn.in_transaction
+
+
+def test_listing_requires_the_admin_key(log, monkeypatch):
+    from app import app
+    monkeypatch.setenv('MOCK_LEADS_FILE', log.path)
+    monkeypatch.setattr(app.state, 'airtable_client', AirtableClient(), raising=False)
+    client = TestClient(app)
+
+    monkeypatch.delenv('LEADS_ADMIN_API_KEY', raising=False)
+    assert client.get('/api/leads', headers={'X-API-Key': 'secret'}).status_code == 403
+
+    monkeypatch.setenv('LEADS_ADMIN_API_KEY', 'secret')
+    assert client.get('/api/leads').status_code == 401
+    assert client.get('/api/leads', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    response = client.get('/api/leads', params={'status': 'Contacted'}, headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200 and _ids(response.json()) == ['rec0002']
+    assert client.get('/api/leads', headers={'X-API-Key': 'secret'}).json()['count'] == 5
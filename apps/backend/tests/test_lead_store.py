@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+
+from integrations.lead_store import LeadCounts, LeadLog, import_json_array
+
+
+def test_appends_are_streamed_back_in_order(tmp_path):
+    log = LeadLog(str(tmp_path / 'leads.jsonl'), fsync_every=4)
+    for i in range(10):
+        log.append({'id': f'rec{i}', 'fields': {'Name': f'Lead {i}'}})
+
+    assert [r['id'] for r in log] == [f'rec{i}' for i in range(10)]
+    assert log.count() == 10
+
+
+def test_concurrent_appends_are_not_lost(tmp_path):
+    path = str(tmp_path / 'leads.jsonl')
+    # Separate LeadLog instances stand in for separate workers sharing the file
+    logs = [LeadLog(path), LeadLog(path)]
+
+    def write(worker):
+        for i in range(100):
+            logs[worker % 2].append({'id': f'rec{worker}-{i}'})
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({r['id'] for r in LeadLog(path)}) == 800
+
+
+def test_torn_last_line_is_skipped_and_terminated(tmp_path):
+    path = tmp_path / 'leads.jsonl'
+    path.write_bytes(b'{"id":"rec1"}\n{"id":"rec2","fie')
+    log = LeadLog(str(path))
+
+    assert [r['id'] for r in log] == ['rec1']
+    log.append({'id': 'rec3'})
+    assert [r['id'] for r in log] == ['rec1', 'rec3']
+
+
+def test_import_json_array(tmp_path):
+    legacy = tmp_path / 'mock_leads.json'
+    legacy.write_text(json.dumps([{'id': 'rec1'}, {'id': 'rec2'}], indent=2))
+    target = str(tmp_path / 'mock_leads.jsonl')
+
+    assert import_json_array(str(legacy), target) == 2
+    assert import_json_array(str(legacy), target) is None
+    assert [r['id'] for r in LeadLog(target)] == ['rec1', 'rec2']
+
+
+def test_import_json_array_keeps_file_permissions(tmp_path):
+    legacy = tmp_path / 'mock_leads.json'
+    legacy.write_text(json.dumps([{'id': 'rec1'}]))
+    target = tmp_path / 'mock_leads.jsonl'
+
+    umask = os.umask(0o022)
+    try:
+        import_json_array(str(legacy), str(target))
+        assert target.stat().st_mode & 0o777 == 0o644
+        target.chmod(0o640)
+        import_json_array(str(legacy), str(target), overwrite=True)
+        assert target.stat().st_mode & 0o777 == 0o640
+    finally:
+        os.umask(umask)
+
+
+def _lead(i, status='New', project_type='Kitchen'):
+    return {'id': f'rec{i}', 'fields': {'Status': status, 'Project Type': project_type}}
+
+
+def test_counts_follow_appends_from_other_writers(tmp_path):
+    path = str(tmp_path / 'leads.jsonl')
+    log = LeadLog(path)
+    counts = LeadCounts(log, persist_every=1)
+    log.append(_lead(1))
+    LeadLog(path).append(_lead(2, status='Contacted', project_type='Bathroom'))
+    counts.refresh()
+
+    assert counts.snapshot() == {
+        'total_leads': 2,
+        'by_status': {'New': 1, 'Contacted': 1},
+        'by_project_type': {'Kitchen': 1, 'Bathroom': 1},
+    }
+
+
+def test_persisted_counts_are_reused_unless_stale(tmp_path):
+    path = tmp_path / 'leads.jsonl'
+    log = LeadLog(str(path))
+    for i in range(3):
+        log.append(_lead(i))
+    counts = LeadCounts(log, persist_every=1)
+    counts.refresh()
+
+    # A fresh instance resumes from the saved offset instead of rescanning
+    log.append(_lead(3))
+    resumed = LeadCounts(log)
+    assert resumed.total == 3
+    resumed.refresh()
+    assert resumed.total == 4
+
+    # A replaced log (new inode) triggers a rebuild
+    replacement = tmp_path / 'replacement.jsonl'
+    replacement.write_text('{"id":"rec9","fields":{"Status":"Won"}}\n')
+    replacement.replace(path)
+    resumed.refresh()
+    assert resumed.snapshot()['by_status'] == {'Won': 1}
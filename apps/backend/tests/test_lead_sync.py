@@ -0,0 +1,169 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from integrations import airtable_api
+from integrations.airtable_client import AirtableClient
+from integrations.fake_airtable import start_fake_airtable
+from integrations.lead_store import LeadLog
+from integrations.lead_sync import LeadSyncError, LeadSyncWorker
+
+
+class StubAirtable(BaseHTTPRequestHandler):
+    """Minimal Airtable create-records endpoint: rate-limits the first request, rejects Name='bad'."""
+    batches = []
+    rate_limited = False
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        names = [r['fields']['Name'] for r in body['records']]
+        if not StubAirtable.rate_limited:
+            StubAirtable.rate_limited = True
+            return self._reply(429, {'errors': [{'error': 'RATE_LIMIT_REACHED'}]}, {'Retry-After': '0'})
+        if 'bad' in names:
+            return self._reply(422, {'error': {'type': 'INVALID_VALUE_FOR_COLUMN'}})
+        StubAirtable.batches.append(names)
+        return self._reply(200, {'records': [{'id': f'recAT{n}', 'fields': {}} for n in names]})
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+async def _flush(client):
+    try:
+        return await client.sync_worker.flush()
+    finally:
+        await client.aclose()
+
+
+@pytest.fixture
+def airtable(tmp_path, monkeypatch):
+    """AirtableClient in real mode, pointed at a stub server and a scratch queue."""
+    StubAirtable.batches = []
+    StubAirtable.rate_limited = False
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubAirtable)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(airtable_api, 'AIRTABLE_API_URL', f'http://127.0.0.1:{server.server_port}/v0')
+    monkeypatch.setenv('LEADS_QUEUE_FILE', str(tmp_path / 'leads_queue.jsonl'))
+    client = AirtableClient(api_key='key', base_id='appTest')
+    client.sync_worker.backoff_base = 0.01
+    yield client
+    server.shutdown()
+
+
+def test_queued_leads_are_sent_in_batches_of_ten(airtable):
+    for i in range(23):
+        result = airtable.create_lead({'Name': f'lead{i}', 'Status': 'New'})
+        assert result['success'] and result['record_id']
+
+    sent = asyncio.run(_flush(airtable))
+
+    assert sent == 23
+    assert [len(batch) for batch in StubAirtable.batches] == [10, 10, 3]  # first attempt was a 429
+    assert [name for batch in StubAirtable.batches for name in batch] == [f'lead{i}' for i in range(23)]
+
+    # The cursor is persisted, so a restarted worker has nothing left to send
+    resumed = LeadSyncWorker(airtable.lead_log, airtable.create_records)
+    assert resumed.pending() == 0 and resumed.sent == 23
+
+
+def test_rejected_records_are_dead_lettered(airtable):
+    StubAirtable.rate_limited = True
+    for name in ('ok1', 'bad', 'ok2'):
+        airtable.create_lead({'Name': name})
+
+    asyncio.run(_flush(airtable))
+
+    assert StubAirtable.batches == [['ok1'], ['ok2']]
+    stats = airtable.sync_worker.stats()
+    assert (stats['sent'], stats['failed'], stats['pending']) == (2, 1, 0)
+    with open(airtable.sync_worker.failed_path) as f:
+        failed = [json.loads(line) for line in f]
+    assert failed[0]['record']['fields']['Name'] == 'bad' and failed[0]['status_code'] == 422
+
+
+def test_two_workers_send_each_lead_once(tmp_path, monkeypatch):
+    server = start_fake_airtable(rate_limit=1000)
+    monkeypatch.setattr(airtable_api, 'AIRTABLE_API_URL', server.url)
+    monkeypatch.setenv('LEADS_QUEUE_FILE', str(tmp_path / 'leads_queue.jsonl'))
+    # Two uvicorn workers: separate clients, each with its own cursor in memory, sharing one queue
+    workers = [AirtableClient(api_key='key', base_id='appTest') for _ in range(2)]
+    for i in range(45):
+        workers[i % 2].create_lead({'Name': f'lead{i}', 'Status': 'New'})
+
+    threads = [threading.Thread(target=asyncio.run, args=(_flush(client),)) for client in workers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for client in workers:  # whatever a skipped worker left behind
+        asyncio.run(_flush(client))
+    server.shutdown()
+
+    names = [record['fields']['Name'] for record in server.tables[('appTest', 'Leads')]]
+    assert sorted(names) == sorted(f'lead{i}' for i in range(45))
+    assert workers[0].sync_worker.stats()['sent'] == 45 and workers[1].sync_worker.pending() == 0
+
+
+def test_records_delivered_before_a_retryable_error_are_not_resent(tmp_path):
+    log = LeadLog(str(tmp_path / 'leads_queue.jsonl'))
+    for name in ('ok1', 'bad', 'ok2', 'ok3'):
+        log.append({'id': name, 'fields': {'Name': name}})
+    delivered, outage = [], [True]
+
+    async def send_batch(fields):
+        names = [f['Name'] for f in fields]
+        if 'bad' in names:
+            raise LeadSyncError('invalid', status_code=422)
+        if names == ['ok2'] and outage[0]:
+            raise LeadSyncError('unavailable', status_code=503)
+        delivered.extend(names)
+        return names
+
+    worker = LeadSyncWorker(log, send_batch, max_retries=0)
+    with pytest.raises(LeadSyncError):
+        asyncio.run(worker.flush())
+    assert delivered == ['ok1'] and worker.pending() == 2
+
+    outage[0] = False
+    asyncio.run(worker.flush())
+    assert delivered == ['ok1', 'ok2', 'ok3'] and worker.stats()['failed'] == 1
+
+
+def test_worker_keeps_running_after_an_unexpected_error(tmp_path):
+    log = LeadLog(str(tmp_path / 'leads_queue.jsonl'))
+    log.append({'id': 'rec1', 'fields': {'Name': 'ok1'}})
+    delivered, calls = [], []
+
+    async def send_batch(fields):
+        calls.append(fields)
+        if len(calls) == 1:
+            raise RuntimeError('unexpected')
+        delivered.extend(f['Name'] for f in fields)
+        return ['recAT1']
+
+    async def scenario():
+        worker = LeadSyncWorker(log, send_batch, interval=0.01)
+        task = worker.start()
+        for _ in range(200):
+            if delivered:
+                break
+            await asyncio.sleep(0.01)
+        assert not task.done()
+        await worker.stop()
+        return worker
+
+    worker = asyncio.run(scenario())
+    assert delivered == ['ok1'] and worker.last_error is None
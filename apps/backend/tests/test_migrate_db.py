@@ -0,0 +1,70 @@
+import sqlite3
+
+from data import db_helper, init_db, migrate_db
+
+
+def _create_legacy_db(path):
+    """Create a database with the original, pre-migration schema."""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE pricing_timeline (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_type TEXT NOT NULL,
+            finish_level TEXT NOT NULL,
+            cost_per_sqft REAL NOT NULL,
+            avg_duration_weeks INTEGER NOT NULL,
+            suggested_materials TEXT,
+            description TEXT,
+            UNIQUE(project_type, finish_level)
+        )
+    ''')
+    conn.execute("INSERT INTO pricing_timeline VALUES (1, 'kitchen', 'basic', 150.0, 4, 'Laminate countertops, Stock cabinets', 'Basic kitchen')")
+    conn.commit()
+    return conn
+
+
+def test_migrate_upgrades_legacy_database_in_place(tmp_path, monkeypatch):
+    db_path = tmp_path / 'legacy.db'
+    conn = _create_legacy_db(db_path)
+
+    assert migrate_db.migrate(conn) == migrate_db.LATEST_VERSION
+    assert migrate_db.migrate(conn) == 0
+    assert migrate_db.get_schema_version(conn) == migrate_db.LATEST_VERSION
+
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM pricing_timeline "
+        "WHERE project_type = 'KITCHEN' COLLATE NOCASE AND finish_level = 'Basic' COLLATE NOCASE"
+    ).fetchall()
+    assert 'idx_pricing_lookup_nocase' in plan[0][3]
+    assert conn.execute('SELECT material FROM pricing_materials ORDER BY position').fetchall() == [
+        ('Laminate countertops',), ('Stock cabinets',)
+    ]
+
+    version = conn.execute("SELECT value FROM pricing_meta WHERE key = 'data_version'").fetchone()[0]
+    conn.execute("UPDATE pricing_timeline SET cost_per_sqft = 160 WHERE id = 1")
+    conn.commit()
+    assert conn.execute("SELECT value FROM pricing_meta WHERE key = 'data_version'").fetchone()[0] == version + 1
+
+    # The snapshot reads materials from the new table
+    migrate_db.set_materials(conn, 1, ['Butcher block'])
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(db_helper, 'DB_PATH', str(db_path))
+    snapshot = db_helper.get_pricing_snapshot()
+    assert snapshot.rows[('kitchen', 'basic')].suggested_materials == ('Butcher block',)
+    assert snapshot.data_version > version + 1
+
+
+def test_init_db_updates_in_place(tmp_path, monkeypatch):
+    db_path = tmp_path / 'pricing.db'
+    _create_legacy_db(db_path).close()
+    monkeypatch.setattr(init_db, 'DB_PATH', str(db_path))
+
+    init_db.init_database()
+    init_db.init_database()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('SELECT COUNT(*) FROM pricing_timeline').fetchone()[0] == 15
+    assert conn.execute("SELECT id, cost_per_sqft FROM pricing_timeline WHERE project_type = 'kitchen' AND finish_level = 'basic'").fetchone() == (1, 150.0)
+    assert conn.execute('SELECT COUNT(*) FROM pricing_materials WHERE pricing_id = 1').fetchone()[0] == 4
+    conn.close()
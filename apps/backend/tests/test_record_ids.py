@@ -0,0 +1,37 @@
+import multiprocessing
+import threading
+from datetime import datetime, timedelta, timezone
+
+from integrations.record_ids import new_record_id, new_ulid, ulid_timestamp
+
+
+def _generate(n):
+    return [new_ulid() for _ in range(n)]
+
+
+def test_ids_are_monotonic_within_a_process():
+    ids = _generate(10000)  # many share a millisecond
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(len(i) == 26 for i in ids)
+
+
+def test_ids_are_unique_across_threads_and_processes():
+    results = []
+    threads = [threading.Thread(target=lambda: results.extend(_generate(2000))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with multiprocessing.get_context('fork').Pool(4) as pool:
+        for chunk in pool.map(_generate, [2000] * 4):
+            results.extend(chunk)
+
+    assert len(set(results)) == len(results) == 24000
+
+
+def test_record_id_encodes_creation_time():
+    record_id = new_record_id()
+    assert record_id.startswith('rec')
+    assert abs(ulid_timestamp(record_id) - datetime.now(timezone.utc)) < timedelta(seconds=1)
@@ -0,0 +1,41 @@
+import sqlite3
+
+from data import db_helper
+from data.import_regions import import_regions
+
+
+def _load_regions(db_path, regions):
+    conn = sqlite3.connect(db_path)
+    import_regions(conn, regions, replace=True)
+    conn.close()
+    db_helper.invalidate_pricing_cache()
+
+
+def test_longest_postal_prefix_wins(pricing_db):
+    _load_regions(pricing_db, [('V6B', 1.15, 'Downtown'), ('v6b 1a', 1.3, None), ('V', 1.01, 'BC Lower Mainland')])
+
+    assert db_helper.resolve_region('v6b 1a1').multiplier == 1.3
+    assert db_helper.resolve_region('V6B 2Z9').region_name == 'Downtown'
+    assert db_helper.resolve_region('V3N 4K1').multiplier == 1.01
+    assert db_helper.resolve_region('T2P 1J9') is None
+    assert db_helper.resolve_region(None) is None
+
+
+def test_calculate_estimate_applies_regional_multiplier(pricing_db):
+    _load_regions(pricing_db, [('V6B', 1.15, 'Downtown'), ('V3N', 1.0, 'Burnaby')])
+
+    downtown = db_helper.calculate_estimate('kitchen', 'standard', 100, postal_code='V6B 1A1')
+    burnaby = db_helper.calculate_estimate('kitchen', 'standard', 100, postal_code='V3N 4K1')
+    unknown = db_helper.calculate_estimate('kitchen', 'standard', 100)
+
+    assert downtown['estimated_cost'] == 28750.0
+    assert downtown['regional_multiplier'] == 1.15
+    assert downtown['cost_per_sqft'] == 250.0
+    assert burnaby['estimated_cost'] == unknown['estimated_cost'] == 25000.0
+
+
+def test_bulk_import_replaces_rows_in_one_transaction(pricing_db):
+    _load_regions(pricing_db, [(f'V{i:02d}', 1.0 + i / 1000, None) for i in range(100)])
+    _load_regions(pricing_db, [('V6B', 1.15, 'Downtown')])
+
+    assert list(db_helper.get_pricing_snapshot().regions) == ['V6B']
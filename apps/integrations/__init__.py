@@ -0,0 +1,8 @@
+"""
+RenovAI Canada - Integrations Package
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+Shared integrations (Airtable lead storage and sync, Calendly, record IDs)
+used by the backend API, the newsbot and the command-line tools. Import
+the submodules directly; nothing is imported or initialized here.
+"""
@@ -0,0 +1,227 @@
+"""
+RenovAI Canada - Async Airtable API Client
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module talks to the Airtable REST API over one shared, keep-alive
+connection pool. Record creation is batched (10 records per request, the
+API maximum), listing follows Airtable's offset pagination as an async
+generator, and every request waits on a client-side token bucket so we
+stay under Airtable's limit of 5 requests per second per base.
+
+Set AIRTABLE_API_URL to point the client at a local fake server
+(see fake_airtable.py).
+"""
+
+import asyncio
+import math
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+try:
+    import httpx
+except ImportError:  # only needed in real mode; mock mode works without it
+    httpx = None
+
+from integrations.lead_sync import AIRTABLE_MAX_BATCH, LeadSyncError
+
+# Airtable REST endpoint (override to point at a local fake server)
+AIRTABLE_API_URL = os.getenv('AIRTABLE_API_URL', 'https://api.airtable.com/v0')
+AIRTABLE_TIMEOUT = float(os.getenv('AIRTABLE_TIMEOUT', 10))
+
+# Airtable allows 5 requests per second per base
+AIRTABLE_RATE_LIMIT = float(os.getenv('AIRTABLE_RATE_LIMIT', 5))
+AIRTABLE_MAX_CONNECTIONS = int(os.getenv('AIRTABLE_MAX_CONNECTIONS', 10))
+
+# Airtable asks clients to wait 30 seconds after a 429 that carries no Retry-After
+AIRTABLE_RATE_LIMIT_PENALTY = 30.0
+
+# Largest page Airtable returns when listing records
+AIRTABLE_MAX_PAGE_SIZE = 100
+
+class AirtableError(LeadSyncError):
+    """An Airtable request failed (status_code is None for network errors)."""
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given as seconds or as an HTTP date.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds to wait (0 for a date in the past), or None if missing or malformed
+    """
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return max(0.0, seconds) if math.isfinite(seconds) else None
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (defaults to rate, i.e. one second of burst)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class AirtableAPI:
+    """Async client for one Airtable table."""
+
+    def __init__(self, api_key: str, base_id: str, table_name: str,
+                 api_url: Optional[str] = None, rate_limit: float = AIRTABLE_RATE_LIMIT):
+        """
+        Initialize the client (the connection pool is opened on first request).
+
+        Args:
+            api_key: Airtable personal access token
+            base_id: Airtable base ID
+            table_name: Table name or ID
+            api_url: REST endpoint (defaults to AIRTABLE_API_URL)
+            rate_limit: Requests per second allowed for this base
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for the Airtable API client (pip install httpx)")
+        self.api_key = api_key
+        self.base_id = base_id
+        self.table_name = table_name
+        self.api_url = (api_url or AIRTABLE_API_URL).rstrip('/')
+        self.bucket = TokenBucket(rate_limit)
+        self._client: Optional['httpx.AsyncClient'] = None
+
+    @property
+    def client(self) -> 'httpx.AsyncClient':
+        """Shared HTTP client with a keep-alive connection pool."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.api_url}/{self.base_id}/",
+                headers={'Authorization': f'Bearer {self.api_key}'},
+                timeout=AIRTABLE_TIMEOUT,
+                limits=httpx.Limits(max_connections=AIRTABLE_MAX_CONNECTIONS,
+                                    max_keepalive_connections=AIRTABLE_MAX_CONNECTIONS)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, **kwargs) -> Dict:
+        """
+        Send one rate-limited request to the table endpoint.
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            AirtableError: On network errors, non-2xx responses or a body that is not JSON
+        """
+        await self.bucket.acquire()
+        try:
+            response = await self.client.request(method, self.table_name, **kwargs)
+        except httpx.HTTPError as e:
+            raise AirtableError(f"Airtable request failed: {e}")
+
+        if response.status_code >= 400:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is None and response.status_code == 429:
+                retry_after = AIRTABLE_RATE_LIMIT_PENALTY
+            raise AirtableError(
+                f"Airtable returned HTTP {response.status_code}: {response.text[:200]}",
+                status_code=response.status_code,
+                retry_after=retry_after
+            )
+        try:
+            return response.json()
+        except ValueError:
+            # E.g. a proxy's HTML page: retried like a network error, since the
+            # request may or may not have reached Airtable
+            raise AirtableError(
+                f"Airtable returned a non-JSON body (HTTP {response.status_code}): {response.text[:200]}"
+            )
+
+    async def create_records(self, records: List[Dict], typecast: bool = True) -> List[str]:
+        """
+        Create records, 10 per request.
+
+        Args:
+            records: Field dictionaries, one per record
+            typecast: Let Airtable convert values (e.g. new select options)
+
+        Returns:
+            Airtable record IDs, in the same order
+
+        Raises:
+            AirtableError: If a request fails (earlier batches stay created)
+        """
+        record_ids = []
+        for start in range(0, len(records), AIRTABLE_MAX_BATCH):
+            batch = records[start:start + AIRTABLE_MAX_BATCH]
+            created = await self._request('POST', json={
+                'records': [{'fields': fields} for fields in batch],
+                'typecast': typecast
+            })
+            record_ids.extend(record['id'] for record in created.get('records', []))
+        return record_ids
+
+    async def iter_records(self, page_size: int = AIRTABLE_MAX_PAGE_SIZE, view: Optional[str] = None,
+                           filter_by_formula: Optional[str] = None) -> AsyncIterator[Dict]:
+        """
+        Stream every record of the table, one page request at a time.
+
+        Args:
+            page_size: Records per page (at most 100)
+            view: Optional view name or ID to list
+            filter_by_formula: Optional Airtable formula to filter records
+
+        Yields:
+            Records as returned by Airtable ({'id', 'createdTime', 'fields'})
+        """
+        params = {'pageSize': min(page_size, AIRTABLE_MAX_PAGE_SIZE)}
+        if view:
+            params['view'] = view
+        if filter_by_formula:
+            params['filterByFormula'] = filter_by_formula
+
+        while True:
+            page = await self._request('GET', params=params)
+            for record in page.get('records', []):
+                yield record
+            offset = page.get('offset')
+            if not offset:
+                return
+            params['offset'] = offset
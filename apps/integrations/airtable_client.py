@@ -3,13 +3,41 @@ RenovAI Canada - Airtable Integration Module
 Copyright (c) 2025 Saeed Alaediny. All rights reserved.
 
 This module provides integration with Airtable for lead storage.
-For MVP, this uses mock responses. Real API integration will be added in Beta.
+Leads are always appended to a local lead log first. Without credentials
+that log is the store (mock mode); with credentials it is the queue that
+LeadSyncWorker forwards to Airtable in the background through the async,
+connection-pooled AirtableAPI client.
 """
 
 import os
-from typing import Dict, Optional
+import asyncio
+import itertools
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 from datetime import datetime
-import json
+
+from integrations.lead_store import LeadCounts, LeadIndex, LeadLog, import_json_array
+from integrations.lead_query import LeadDatabase
+from integrations.record_ids import new_record_id
+from integrations.lead_schema import lead_key
+
+# Local lead log used in mock mode, and the JSON array file it replaced
+MOCK_LEADS_FILE = os.path.join(os.path.dirname(__file__), 'mock_leads.jsonl')
+LEGACY_MOCK_LEADS_FILE = os.path.join(os.path.dirname(__file__), 'mock_leads.json')
+
+# Local queue of leads waiting to be sent to Airtable (real mode)
+LEADS_QUEUE_FILE = os.path.join(os.path.dirname(__file__), 'leads_queue.jsonl')
+
+# Records read per thread hop when streaming the lead log from async code
+LEAD_STREAM_CHUNK = 500
+
+def airtable_configured() -> bool:
+    """
+    Check whether Airtable credentials are set in the environment.
+    
+    Returns:
+        True if AirtableClient() would run in real mode, False for mock mode
+    """
+    return bool(os.getenv('AIRTABLE_API_KEY') and os.getenv('AIRTABLE_BASE_ID'))
 
 class AirtableClient:
     """Client for interacting with Airtable API."""
@@ -30,85 +58,302 @@ class AirtableClient:
         
         if self.use_mock:
             print("⚠️  Using mock Airtable integration (no API key/base ID provided)")
-            # Create a local JSON file to simulate lead storage
-            self.mock_file = os.path.join(os.path.dirname(__file__), 'mock_leads.json')
-            if not os.path.exists(self.mock_file):
-                with open(self.mock_file, 'w') as f:
-                    json.dump([], f)
+            # Append-only local log simulates lead storage (MOCK_LEADS_FILE overrides the location)
+            self.mock_file = os.getenv('MOCK_LEADS_FILE') or MOCK_LEADS_FILE
+            if self.mock_file == MOCK_LEADS_FILE and os.path.exists(LEGACY_MOCK_LEADS_FILE):
+                # One-time conversion of the old JSON array store
+                imported = import_json_array(LEGACY_MOCK_LEADS_FILE, self.mock_file)
+                if imported is not None:
+                    print(f"📦 Imported {imported} leads from mock_leads.json into mock_leads.jsonl")
+            self.lead_log = LeadLog(self.mock_file)
+            self.api = None
+            self.sync_worker = None
+        else:
+            # Imported here so mock mode never loads the HTTP client stack
+            from integrations.airtable_api import AirtableAPI
+            from integrations.lead_sync import LeadSyncWorker
+            
+            # Durable local queue; the sync worker sends it to Airtable in batches
+            self.lead_log = LeadLog(os.getenv('LEADS_QUEUE_FILE') or LEADS_QUEUE_FILE)
+            self.api = AirtableAPI(self.api_key, self.base_id, self.table_name)
+            self.sync_worker = LeadSyncWorker(self.lead_log, self.create_records)
+        
+        # Running totals and the de-duplication index, rebuilt here only if
+        # their saved copies are missing or stale
+        self.lead_counts = LeadCounts(self.lead_log)
+        self.lead_counts.refresh()
+        self.lead_index = LeadIndex(self.lead_log)
+        self.lead_index.refresh()
+        # Repeat submissions of existing leads, kept for follow-up instead of becoming new leads
+        self.duplicates_log = LeadLog(os.path.splitext(self.lead_log.path)[0] + '.duplicates.jsonl')
+        # Indexed SQLite copy of the log for filtered listing (brought up to date on each query)
+        self.lead_db = LeadDatabase(self.lead_log)
     
-    def create_lead(self, lead_data: Dict) -> Dict:
+    def create_lead(self, lead_data: Dict, idempotency_key: Optional[str] = None) -> Dict:
         """
-        Create a new lead record in Airtable.
+        Create a new lead record, or return the existing one for a duplicate.
+        
+        The lead is appended to the local lead log and its record ID returned
+        immediately; in real mode the sync worker forwards it to Airtable.
+        A lead with the same email and phone as a stored lead, or a retry
+        with the same idempotency key, is not stored again: the existing
+        record ID is returned with duplicate=True.
         
         Args:
             lead_data: Dictionary containing lead information
+            idempotency_key: Optional client-supplied key identifying the request
         
         Returns:
-            Dictionary with creation status and record ID
+            Dictionary with creation status, record ID and duplicate flag
         """
+        # Lookup and append under the log lock, so concurrent workers cannot both store the lead
+        with self.lead_log.exclusive():
+            existing = self.find_lead(lead_data.get('Email'), lead_data.get('Phone'), idempotency_key)
+            if existing is None:
+                lead_record = self._append_lead(lead_data, idempotency_key)
+        
+        if existing is not None:
+            return self._merge_duplicate(existing, lead_data, idempotency_key)
+        
         if self.use_mock:
-            return self._mock_create_lead(lead_data)
+            print(f"✅ Mock lead created: {lead_record['id']}")
+            message = 'Lead stored successfully (mock mode)'
+        else:
+            self.sync_worker.notify()
+            message = 'Lead stored and queued for Airtable sync'
+        
+        return {
+            'success': True,
+            'record_id': lead_record['id'],
+            'message': message,
+            'created_at': lead_record['created_at'],
+            'duplicate': False
+        }
+    
+    def find_lead(self, email: Optional[str], phone: Optional[str],
+                  idempotency_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        Find a stored lead by idempotency key or by normalized email + phone.
+        
+        Args:
+            email: Email address (case and surrounding spaces are ignored)
+            phone: Phone number (separators are ignored)
+            idempotency_key: Optional idempotency key of the original request
+        
+        Returns:
+            Dictionary with record_id and created_at, or None if there is no match
+        """
+        identity = lead_key(email, phone)
+        self.lead_index.refresh()
+        match = self.lead_index.find(identity if all(identity) else None, idempotency_key)
+        if match is None:
+            return None
+        return {'record_id': match[0], 'created_at': match[1]}
+    
+    def _merge_duplicate(self, existing: Dict, lead_data: Dict, idempotency_key: Optional[str]) -> Dict:
+        """
+        Record a repeat submission against the existing lead.
+        
+        Args:
+            existing: The stored lead (from find_lead)
+            lead_data: Dictionary containing the submitted lead information
+            idempotency_key: Idempotency key of the request, if any
+        
+        Returns:
+            Dictionary with the existing record ID and duplicate=True
+        """
+        retry = bool(idempotency_key) and self.lead_index.find(idempotency_key=idempotency_key) is not None
+        if not retry:
+            # A new submission from a known customer: keep it so updated details are not lost
+            self.duplicates_log.append({
+                'record_id': existing['record_id'],
+                'received_at': datetime.now().isoformat(),
+                'fields': lead_data
+            })
+            print(f"♻️  Duplicate lead merged into {existing['record_id']}")
+        
+        return {
+            'success': True,
+            'record_id': existing['record_id'],
+            'message': 'Lead already received' if retry else 'Lead already exists; submission merged into existing lead',
+            'created_at': existing['created_at'],
+            'duplicate': True
+        }
+    
+    def create_leads(self, leads: List[Dict]) -> List[Dict]:
+        """
+        Store many leads with one batched write (for bulk imports).
         
-        # Real Airtable API integration would go here
-        # For MVP, we use mock implementation
-        return self._mock_create_lead(lead_data)
+        Leads whose email and phone match a stored lead, or an earlier lead
+        in the same list, are skipped.
+        
+        Args:
+            leads: Lead field dictionaries
+        
+        Returns:
+            The stored lead records, with their record IDs
+        """
+        created_at = datetime.now().isoformat()
+        # Check and append under the log lock, so a concurrent import or form
+        # submission cannot store the same lead in between
+        with self.lead_log.exclusive():
+            self.lead_index.refresh()
+            lead_records, seen = [], set()
+            for fields in leads:
+                identity = lead_key(fields.get('Email'), fields.get('Phone'))
+                if all(identity):
+                    if identity in seen or self.lead_index.find(identity) is not None:
+                        continue
+                    seen.add(identity)
+                lead_records.append({'id': new_record_id(), 'created_at': created_at, 'fields': fields})
+            self.lead_log.extend(lead_records)
+            self.lead_counts.refresh()
+            self.lead_index.refresh()
+        if self.sync_worker is not None:
+            self.sync_worker.notify()
+        return lead_records
     
-    def _mock_create_lead(self, lead_data: Dict) -> Dict:
+    def _append_lead(self, lead_data: Dict, idempotency_key: Optional[str] = None) -> Dict:
         """
-        Mock implementation of lead creation for MVP testing.
+        Append a lead to the local lead log.
         
         Args:
             lead_data: Dictionary containing lead information
+            idempotency_key: Idempotency key of the request, if any
         
         Returns:
-            Dictionary with creation status and mock record ID
+            The stored lead record
         """
-        # Add timestamp and generate mock ID
+        # Add timestamp and a unique, time-sortable local record ID
         lead_record = {
-            'id': f"rec{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            'id': new_record_id(),
             'created_at': datetime.now().isoformat(),
             'fields': lead_data
         }
+        if idempotency_key:
+            lead_record['idempotency_key'] = idempotency_key
         
-        # Store in local JSON file
-        try:
-            with open(self.mock_file, 'r') as f:
-                leads = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            leads = []
+        self.lead_log.append(lead_record)
+        self.lead_counts.refresh()
+        self.lead_index.refresh()
+        return lead_record
+    
+    async def create_records(self, records: List[Dict]) -> List[str]:
+        """
+        Create records in the Airtable table, 10 per API request.
         
-        leads.append(lead_record)
+        Args:
+            records: Field dictionaries, one per record
         
-        with open(self.mock_file, 'w') as f:
-            json.dump(leads, f, indent=2)
+        Returns:
+            Airtable record IDs, in the same order
         
-        print(f"✅ Mock lead created: {lead_record['id']}")
+        Raises:
+            AirtableError: On network errors or non-2xx responses (status_code
+                and Retry-After are attached so callers can back off)
+        """
+        return await self.api.create_records(records)
+    
+    def iter_leads(self) -> Iterator[Dict]:
+        """
+        Stream the local lead log in creation order (in real mode, every lead
+        queued by this deployment, whether or not it has been synced yet).
         
-        return {
-            'success': True,
-            'record_id': lead_record['id'],
-            'message': 'Lead stored successfully (mock mode)',
-            'created_at': lead_record['created_at']
-        }
+        Returns:
+            Iterator over lead records
+        """
+        return iter(self.lead_log)
+    
+    def query_leads(self, **filters) -> Dict:
+        """
+        List locally stored leads by status, project type, postal prefix and
+        creation date, newest first, with keyset pagination.
+        
+        Args:
+            **filters: Filters and paging options of LeadDatabase.query
+        
+        Returns:
+            Dictionary with leads and next_cursor
+        """
+        return self.lead_db.query(**filters)
     
-    def get_all_leads(self) -> list:
+    def get_lead(self, record_id: str) -> Optional[Dict]:
         """
-        Retrieve all leads (mock implementation for testing).
+        Get a locally stored lead by record ID.
+        
+        Args:
+            record_id: Local record ID (as returned by create_lead)
         
         Returns:
-            List of all lead records
+            The lead record, or None if it is not stored here
+        """
+        return self.lead_db.get(record_id)
+    
+    async def get_all_leads(self) -> AsyncIterator[Dict]:
+        """
+        Stream all leads: from Airtable in real mode (following its offset
+        pagination), from the local lead log in mock mode.
+        
+        Yields:
+            Lead records ({'id', 'fields', ...})
         """
         if self.use_mock:
+            # File reads block; read the log a chunk at a time in a worker thread
+            records = iter(self.lead_log)
             try:
-                with open(self.mock_file, 'r') as f:
-                    return json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                return []
+                while True:
+                    chunk = await asyncio.to_thread(list, itertools.islice(records, LEAD_STREAM_CHUNK))
+                    if not chunk:
+                        return
+                    for lead in chunk:
+                        yield lead
+            finally:
+                records.close()
+        
+        async for record in self.api.iter_records():
+            yield record
+    
+    async def aclose(self) -> None:
+        """Close the Airtable connection pool (real mode)."""
+        if self.api is not None:
+            await self.api.aclose()
+    
+    async def shutdown(self) -> None:
+        """
+        Give queued leads a last chance to reach Airtable, then close files
+        and connections and persist the lead counters and dedup index.
+        """
+        if self.sync_worker is not None:
+            await self.sync_worker.stop()
+        await self.aclose()
+        self.lead_log.close()
+        self.duplicates_log.close()
+        self.lead_counts.save()
+        self.lead_index.save()
+        self.lead_db.close()
+    
+    def count_leads(self) -> int:
+        """
+        Get the total number of stored leads in constant time.
+        
+        Returns:
+            Number of lead records
+        """
+        return self.get_lead_counts()['total_leads']
+    
+    def get_lead_counts(self) -> Dict:
+        """
+        Get lead totals overall, per status and per project type.
         
-        # Real Airtable API would be called here
-        return []
+        Returns:
+            Dictionary with total_leads, by_status and by_project_type
+        """
+        # Counts the local lead log (in real mode, every lead ever queued);
+        # refreshing picks up leads appended by other workers since the last call
+        self.lead_counts.refresh()
+        return self.lead_counts.snapshot()
 
-# Example usage and testing
+# Example usage and testing (from the apps/ directory: python -m integrations.airtable_client)
 if __name__ == '__main__':
     client = AirtableClient()
     
@@ -129,6 +374,7 @@ if __name__ == '__main__':
     print(f"\nTest Result: {result}")
     
     # Display all leads
-    all_leads = client.get_all_leads()
-    print(f"\nTotal leads stored: {len(all_leads)}")
+    async def _count_leads():
+        return len([lead async for lead in client.get_all_leads()])
+    print(f"\nTotal leads stored: {asyncio.run(_count_leads())}")
 
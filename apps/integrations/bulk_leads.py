@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - Bulk Lead Import & Export
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This script back-fills leads from partner CSV/JSON-Lines exports without
+going through /api/collect-lead one request at a time, and exports stored
+leads back out. Input is streamed. Rows are validated with the same
+LeadRequest rules as the API in a process pool, de-duplicated by email +
+phone (against the file and the store's dedup index), priced where no
+estimated cost was given, and written to the lead store in batches.
+Progress and throughput go to stderr.
+
+Usage (from the apps/backend directory, whose pricing database prices the
+leads, with apps/ on PYTHONPATH like the API):
+    PYTHONPATH=.. python -m integrations.bulk_leads import partner_leads.csv --errors rejected.jsonl
+    PYTHONPATH=.. python -m integrations.bulk_leads import leads.jsonl --workers 8 --source "Partner: HomeStars"
+    PYTHONPATH=.. python -m integrations.bulk_leads export leads_export.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from integrations.airtable_client import AirtableClient
+from integrations.lead_schema import LeadRequest, lead_fields, lead_key
+
+# Column names accepted for each LeadRequest field (API names and Airtable field names)
+INPUT_COLUMNS = {
+    'name': ('name', 'Name'),
+    'email': ('email', 'Email'),
+    'phone': ('phone', 'Phone'),
+    'project_type': ('project_type', 'Project Type'),
+    'size_sqft': ('size_sqft', 'Size (sq ft)'),
+    'finish_level': ('finish_level', 'Finish Level'),
+    'postal_code': ('postal_code', 'Postal Code'),
+    'estimated_cost': ('estimated_cost', 'Estimated Cost'),
+    'project_notes': ('project_notes', 'Project Notes'),
+}
+
+EXPORT_COLUMNS = [
+    'id', 'created_at', 'Name', 'Email', 'Phone', 'Project Type', 'Size (sq ft)', 'Finish Level',
+    'Postal Code', 'Estimated Cost', 'Project Notes', 'Lead Source', 'Status', 'Submitted At'
+]
+
+DEFAULT_IMPORT_SOURCE = 'Bulk Import'
+
+# (row number, lead fields or None, error message or None)
+ValidatedRow = Tuple[int, Optional[Dict], Optional[str]]
+
+class _Progress:
+    """Rate-limited progress line on stderr."""
+
+    def __init__(self, label: str, enabled: bool = True, interval: float = 1.0):
+        self.label = label
+        self.enabled = enabled
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._last = self.start
+
+    def update(self, count: int, detail: str = '', force: bool = False) -> None:
+        now = time.perf_counter()
+        if not self.enabled or (not force and now - self._last < self.interval):
+            return
+        self._last = now
+        rate = count / (now - self.start) if now > self.start else 0.0
+        print(f"\r{self.label}: {count:,} rows ({rate:,.0f} rows/s){detail}", end='', file=sys.stderr, flush=True)
+
+    def finish(self, count: int, detail: str = '') -> float:
+        self.update(count, detail, force=True)
+        if self.enabled:
+            print(file=sys.stderr)
+        return time.perf_counter() - self.start
+
+def _iter_rows(path: str) -> Iterator[Dict]:
+    """Stream rows from a CSV or JSON-Lines file (Airtable-style 'fields' wrappers are unwrapped)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in ('.csv', '.jsonl'):
+        raise ValueError(f"Unsupported input format: {ext} (use .csv or .jsonl)")
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if ext == '.csv':
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record.get('fields', record)
+
+def _request_data(row: Dict) -> Dict:
+    """Pick LeadRequest fields out of a row, accepting any of their known column names."""
+    data = {}
+    for field, names in INPUT_COLUMNS.items():
+        for name in names:
+            value = row.get(name)
+            if value is not None and value != '':
+                data[field] = value.strip() if isinstance(value, str) else value
+                break
+    # Display names like 'Full Home' / 'Premium' become codes
+    for field in ('project_type', 'finish_level'):
+        if isinstance(data.get(field), str):
+            data[field] = data[field].lower().replace(' ', '_')
+    return data
+
+def _format_errors(error: ValidationError) -> str:
+    return '; '.join(f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors())
+
+def _validate_chunk(chunk: List[Tuple[int, Dict]], lead_source: str) -> List[ValidatedRow]:
+    """
+    Validate rows with the LeadRequest rules (runs in a worker process).
+
+    Args:
+        chunk: (row number, raw row) pairs
+        lead_source: Default 'Lead Source' for rows without one
+
+    Returns:
+        (row number, lead fields, None) for valid rows, (row number, None, error) otherwise
+    """
+    results = []
+    for row_number, row in chunk:
+        try:
+            request = LeadRequest(**_request_data(row))
+        except ValidationError as e:
+            results.append((row_number, None, _format_errors(e)))
+            continue
+        fields = lead_fields(
+            request,
+            lead_source=row.get('Lead Source') or row.get('lead_source') or lead_source,
+            submitted_at=row.get('Submitted At') or row.get('submitted_at') or None
+        )
+        results.append((row_number, fields, None))
+    return results
+
+def _chunks(rows: Iterator[Dict], size: int) -> Iterator[List[Tuple[int, Dict]]]:
+    chunk = []
+    for row_number, row in enumerate(rows, start=1):
+        chunk.append((row_number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _validated(rows: Iterator[Dict], workers: int, chunk_size: int, lead_source: str) -> Iterator[ValidatedRow]:
+    """
+    Validate rows in input order, in a process pool when workers > 1.
+
+    At most 2 chunks per worker are in flight, so memory stays bounded
+    no matter how large the input is.
+    """
+    chunks = _chunks(rows, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _validate_chunk(chunk, lead_source)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(_validate_chunk, chunk, lead_source))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def import_leads(input_path: str, client: Optional[AirtableClient] = None, workers: Optional[int] = None,
+                 batch_size: int = 500, chunk_size: int = 1000, lead_source: str = DEFAULT_IMPORT_SOURCE,
+                 errors_path: Optional[str] = None, dry_run: bool = False, progress: bool = True,
+                 enrich: Optional[Callable[[List[Dict]], int]] = None) -> Dict:
+    """
+    Validate, de-duplicate and store the leads in a CSV or JSON-Lines file.
+
+    Args:
+        input_path: Input file (.csv or .jsonl)
+        client: AirtableClient whose lead store receives the leads
+        workers: Validation processes (default: CPU count, at most 8; 1 validates inline)
+        batch_size: Leads per batched write to the store
+        chunk_size: Rows per validation task
+        lead_source: 'Lead Source' for rows that do not carry one
+        errors_path: Optional .jsonl file receiving rejected rows and their errors
+        dry_run: Validate and de-duplicate without writing
+        progress: Report progress on stderr
+        enrich: Optional step run on each batch of new leads before it is stored
+            (e.g. the backend's data.lead_enrichment.enrich_leads), returning how many
+            leads it changed
+
+    Returns:
+        Dictionary with rows, imported, duplicates, invalid, enriched, seconds and rows_per_second
+    """
+    client = client or AirtableClient()
+    workers = workers if workers is not None else min(os.cpu_count() or 1, 8)
+
+    # Identities seen in this file; the store's dedup index covers leads stored
+    # before, so re-running an import adds nothing twice
+    seen = set()
+    client.lead_index.refresh()
+
+    stats = {'rows': 0, 'imported': 0, 'duplicates': 0, 'invalid': 0, 'enriched': 0}
+    batch: List[Dict] = []
+    errors = open(errors_path, 'w', encoding='utf-8') if errors_path else None
+    reporter = _Progress('Importing', enabled=progress)
+
+    def flush():
+        if batch and enrich is not None:
+            stats['enriched'] += enrich(batch)
+        stored = len(batch)
+        if batch and not dry_run:
+            # Leads stored by another writer since the check above are skipped here
+            stored = len(client.create_leads(batch))
+        stats['imported'] += stored
+        stats['duplicates'] += len(batch) - stored
+        batch.clear()
+
+    try:
+        for row_number, fields, error in _validated(_iter_rows(input_path), workers, chunk_size, lead_source):
+            stats['rows'] += 1
+            if error:
+                stats['invalid'] += 1
+                if errors:
+                    errors.write(json.dumps({'row': row_number, 'error': error}, ensure_ascii=False) + '\n')
+            else:
+                key = lead_key(fields['Email'], fields['Phone'])
+                if key in seen or client.lead_index.find(key) is not None:
+                    stats['duplicates'] += 1
+                else:
+                    seen.add(key)
+                    batch.append(fields)
+                    if len(batch) >= batch_size:
+                        flush()
+            reporter.update(stats['rows'], f", {stats['imported'] + len(batch):,} new")
+        flush()
+    finally:
+        if errors:
+            errors.close()
+
+    stats['seconds'] = round(reporter.finish(stats['rows'], f", {stats['imported']:,} new"), 3)
+    stats['rows_per_second'] = round(stats['rows'] / stats['seconds'], 1) if stats['seconds'] else 0.0
+    return stats
+
+def export_leads(output_path: str, client: Optional[AirtableClient] = None, progress: bool = True) -> Dict:
+    """
+    Stream every stored lead to a CSV or JSON-Lines file.
+
+    Args:
+        output_path: Output file (.csv or .jsonl)
+        client: AirtableClient whose lead store is exported
+        progress: Report progress on stderr
+
+    Returns:
+        Dictionary with rows, seconds and rows_per_second
+    """
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext not in ('.csv', '.jsonl'):
+        raise ValueError(f"Unsupported output format: {ext} (use .csv or .jsonl)")
+    client = client or AirtableClient()
+    reporter = _Progress('Exporting', enabled=progress)
+    count = 0
+
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        if ext == '.csv':
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+        for record in client.iter_leads():
+            if ext == '.csv':
+                writer.writerow({'id': record.get('id'), 'created_at': record.get('created_at'), **record.get('fields', {})})
+            else:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+            reporter.update(count)
+
+    seconds = reporter.finish(count)
+    return {'rows': count, 'seconds': round(seconds, 3), 'rows_per_second': round(count / seconds, 1) if seconds else 0.0}
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import and export of leads")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Import leads from a CSV or JSON-Lines file")
+    import_parser.add_argument('input', help="Input file (.csv or .jsonl)")
+    import_parser.add_argument('--workers', type=int, default=None, help="Validation processes (1 = inline)")
+    import_parser.add_argument('--batch-size', type=int, default=500, help="Leads per batched write")
+    import_parser.add_argument('--source', default=DEFAULT_IMPORT_SOURCE, help="Lead Source for rows without one")
+    import_parser.add_argument('--errors', default=None, help="Write rejected rows to this .jsonl file")
+    import_parser.add_argument('--dry-run', action='store_true', help="Validate without writing")
+    import_parser.add_argument('--no-estimate', action='store_true',
+                               help="Do not fill in missing Estimated Cost from the pricing table")
+
+    export_parser = subparsers.add_parser('export', help="Export all leads to a CSV or JSON-Lines file")
+    export_parser.add_argument('output', help="Output file (.csv or .jsonl)")
+
+    parser.add_argument('--quiet', action='store_true', help="No progress output")
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        enrich = None
+        if not args.no_estimate:
+            # Same pricing rules as /api/estimate (the backend's pricing database)
+            from data.lead_enrichment import enrich_leads as enrich
+        stats = import_leads(args.input, workers=args.workers, batch_size=args.batch_size, lead_source=args.source,
+                             errors_path=args.errors, dry_run=args.dry_run, progress=not args.quiet, enrich=enrich)
+        action = "Would import" if args.dry_run else "Imported"
+        print(f"{action} {stats['imported']:,} of {stats['rows']:,} rows "
+              f"({stats['duplicates']:,} duplicates, {stats['invalid']:,} invalid, {stats['enriched']:,} estimated) "
+              f"in {stats['seconds']:.2f}s - {stats['rows_per_second']:,.0f} rows/s")
+    else:
+        stats = export_leads(args.output, progress=not args.quiet)
+        print(f"Exported {stats['rows']:,} leads to {args.output} "
+              f"in {stats['seconds']:.2f}s - {stats['rows_per_second']:,.0f} rows/s")
+
+if __name__ == '__main__':
+    main()
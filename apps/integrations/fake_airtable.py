@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+RenovAI Canada - Fake Airtable Server
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+A small in-memory stand-in for the Airtable REST API, for local testing of
+the real-mode lead pipeline without an Airtable account. It supports
+creating records (at most 10 per request), listing them with offset
+pagination, and answers 429 when a base gets more than 5 requests per
+second, like Airtable does.
+
+Usage (from the apps/ directory):
+    python -m integrations.fake_airtable --port 8099
+    AIRTABLE_API_URL=http://127.0.0.1:8099/v0 AIRTABLE_API_KEY=test AIRTABLE_BASE_ID=appLocal uvicorn app:app
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+class FakeAirtableServer(ThreadingHTTPServer):
+    """HTTP server holding the fake tables and request log."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], rate_limit: int = 5):
+        super().__init__(address, FakeAirtableHandler)
+        self.rate_limit = rate_limit
+        self.tables: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        self.requests: List[Tuple[str, str]] = []
+        self.lock = threading.Lock()
+        self._recent: Dict[str, deque] = defaultdict(deque)
+
+    @property
+    def url(self) -> str:
+        """Value for AIRTABLE_API_URL."""
+        return f"http://{self.server_address[0]}:{self.server_address[1]}/v0"
+
+    def allow(self, base_id: str) -> bool:
+        """Sliding one-second window rate limit per base."""
+        now = time.monotonic()
+        with self.lock:
+            recent = self._recent[base_id]
+            while recent and now - recent[0] >= 1.0:
+                recent.popleft()
+            if len(recent) >= self.rate_limit:
+                return False
+            recent.append(now)
+            return True
+
+class FakeAirtableHandler(BaseHTTPRequestHandler):
+    """Request handler for /v0/<base>/<table>."""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+
+    def _route(self):
+        parsed = urlparse(self.path)
+        parts = [unquote(p) for p in parsed.path.strip('/').split('/')]
+        if len(parts) != 3 or parts[0] != 'v0':
+            self._reply(404, {'error': 'NOT_FOUND'})
+            return None
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self._reply(401, {'error': 'AUTHENTICATION_REQUIRED'})
+            return None
+        if not self.server.allow(parts[1]):
+            self._reply(429, {'errors': [{'error': 'RATE_LIMIT_REACHED'}]})
+            return None
+        with self.server.lock:
+            self.server.requests.append((self.command, parsed.path))
+        return (parts[1], parts[2]), parse_qs(parsed.query)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        route = self._route()
+        if route is None:
+            return
+        table, _ = route
+        try:
+            records = json.loads(body)['records']
+        except (ValueError, KeyError):
+            return self._reply(422, {'error': {'type': 'INVALID_REQUEST_UNKNOWN'}})
+        if len(records) > 10:
+            return self._reply(422, {'error': {'type': 'INVALID_RECORDS', 'message': 'Max 10 records'}})
+
+        created = []
+        with self.server.lock:
+            for record in records:
+                created.append({
+                    'id': 'rec' + uuid.uuid4().hex[:14],
+                    'createdTime': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+                    'fields': record.get('fields', {})
+                })
+            self.server.tables[table].extend(created)
+        self._reply(200, {'records': created})
+
+    def do_GET(self):
+        route = self._route()
+        if route is None:
+            return
+        table, query = route
+        page_size = min(int(query.get('pageSize', ['100'])[0]), 100)
+        start = int(query.get('offset', ['0'])[0])
+        with self.server.lock:
+            rows = self.server.tables[table]
+            page = rows[start:start + page_size]
+            more = start + page_size < len(rows)
+        payload = {'records': page}
+        if more:
+            payload['offset'] = str(start + page_size)
+        self._reply(200, payload)
+
+    def _reply(self, status: int, payload: Dict) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fake_airtable(port: int = 0, rate_limit: int = 5) -> FakeAirtableServer:
+    """
+    Start a fake Airtable server on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free one)
+        rate_limit: Requests per second allowed per base
+
+    Returns:
+        Running server; call shutdown() to stop it
+    """
+    server = FakeAirtableServer(('127.0.0.1', port), rate_limit=rate_limit)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an in-memory fake Airtable API")
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--rate-limit', type=int, default=5, help="Requests per second per base")
+    args = parser.parse_args()
+
+    server = FakeAirtableServer(('127.0.0.1', args.port), rate_limit=args.rate_limit)
+    print(f"🧪 Fake Airtable listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
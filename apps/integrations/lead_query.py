@@ -0,0 +1,258 @@
+"""
+RenovAI Canada - Lead Query Store
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module keeps a SQLite copy of the lead log for filtered listing (the
+sales dashboard). The log stays the source of truth: LeadDatabase follows
+it by byte offset like LeadCounts and LeadIndex, inserting only records
+appended since the last refresh, and rebuilds itself if the log is
+replaced or truncated. Every supported filter has a composite index ending
+in (created_at, id), and pages are fetched with keyset pagination, so a
+page costs the same no matter how many leads are stored or how deep the
+page is.
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from integrations.lead_store import LeadLog
+
+# Largest page a single query may return
+LEAD_QUERY_MAX_LIMIT = 200
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS leads (
+        id TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        status TEXT,
+        project_type TEXT,
+        postal_code TEXT,
+        record TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_leads_created ON leads (created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_leads_status ON leads (status, created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_leads_project_type ON leads (project_type, created_at, id);
+    CREATE INDEX IF NOT EXISTS idx_leads_postal_code ON leads (postal_code, created_at, id);
+    CREATE TABLE IF NOT EXISTS lead_log_state (
+        key TEXT PRIMARY KEY,
+        value
+    );
+'''
+
+def _normalize_postal_code(postal_code: Optional[str]) -> Optional[str]:
+    """Normalize a postal code or prefix ('v6b 1a1' -> 'V6B1A1')."""
+    return ''.join(postal_code.split()).upper() if postal_code else None
+
+def normalize_project_type(project_type: str) -> str:
+    """Map a project type code or display name to the stored display name ('full_home' -> 'Full Home')."""
+    return project_type.replace('_', ' ').title()
+
+def encode_cursor(created_at: str, record_id: str) -> str:
+    """Opaque pagination cursor pointing just past the given lead."""
+    return base64.urlsafe_b64encode(json.dumps([created_at, record_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(created_at, str) or not isinstance(record_id, str):
+        raise ValueError("Invalid cursor")
+    return created_at, record_id
+
+class LeadDatabase:
+    """Indexed, queryable SQLite copy of a LeadLog."""
+
+    def __init__(self, log: LeadLog, path: Optional[str] = None):
+        """
+        Initialize the query store (the database is created on first refresh).
+
+        Args:
+            log: Lead log to follow
+            path: SQLite file (default: <log name>.db next to the log)
+        """
+        self.log = log
+        self.path = path or os.path.splitext(log.path)[0] + '.db'
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # WAL lets queries run while another worker applies new leads
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.connection = conn
+        return conn
+
+    def refresh(self) -> int:
+        """
+        Insert records appended to the log since the last refresh.
+
+        The log position is stored in the database and updated in the same
+        transaction as the inserted rows, so workers sharing the database
+        never apply a record twice or skip one. When the log has not changed
+        since, nothing is written.
+
+        Returns:
+            Number of records inserted
+        """
+        try:
+            stat = os.stat(self.log.path)
+        except FileNotFoundError:
+            stat = None
+
+        with self._lock:
+            conn = self._connection()
+            # Usually nothing was appended: check without taking the write lock
+            state = dict(conn.execute('SELECT key, value FROM lead_log_state').fetchall())
+            if stat is None:
+                unchanged = state.get('inode') is None
+            else:
+                unchanged = (stat.st_ino, stat.st_size) == (state.get('inode'), state.get('offset'))
+            if unchanged:
+                return 0
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                state = dict(conn.execute('SELECT key, value FROM lead_log_state').fetchall())
+                inode, offset = state.get('inode'), state.get('offset', 0)
+                if stat is None or stat.st_ino != inode or stat.st_size < offset:
+                    # First run, or the log was replaced/truncated: rebuild from scratch
+                    conn.execute('DELETE FROM leads')
+                    inode, offset = (stat.st_ino if stat else None), 0
+                if stat is None or stat.st_size == offset:
+                    self._save_state(conn, inode, offset)
+                    conn.execute('COMMIT')
+                    return 0
+
+                rows = []
+                with open(self.log.path, 'rb') as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            break  # write in progress; read it next time
+                        offset += len(line)
+                        if not line.strip():
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        fields = record.get('fields', {})
+                        rows.append((
+                            record.get('id'), record.get('created_at') or '',
+                            fields.get('Status'), fields.get('Project Type'),
+                            _normalize_postal_code(fields.get('Postal Code')),
+                            line.decode('utf-8')
+                        ))
+                conn.executemany('INSERT OR IGNORE INTO leads VALUES (?, ?, ?, ?, ?, ?)', rows)
+                self._save_state(conn, inode, offset)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return len(rows)
+
+    @staticmethod
+    def _save_state(conn: sqlite3.Connection, inode: Optional[int], offset: int) -> None:
+        conn.executemany('INSERT OR REPLACE INTO lead_log_state VALUES (?, ?)',
+                         [('inode', inode), ('offset', offset)])
+
+    def query(self, status: Optional[str] = None, project_type: Optional[str] = None,
+              postal_prefix: Optional[str] = None, created_from: Optional[str] = None,
+              created_to: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None,
+              descending: bool = True) -> Dict[str, Any]:
+        """
+        List leads matching all given filters, one page at a time.
+
+        Args:
+            status: Exact 'Status' value (e.g. 'New')
+            project_type: Project type code or display name (e.g. 'full_home')
+            postal_prefix: Postal code prefix, e.g. 'V6B' (case and spaces ignored)
+            created_from: Earliest created_at, inclusive (ISO date or timestamp)
+            created_to: Latest created_at, exclusive (ISO date or timestamp)
+            limit: Page size (at most LEAD_QUERY_MAX_LIMIT)
+            cursor: next_cursor from the previous page
+            descending: Newest first (default) or oldest first
+
+        Returns:
+            Dictionary with leads (records as stored) and next_cursor (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        self.refresh()
+        limit = max(1, min(limit, LEAD_QUERY_MAX_LIMIT))
+
+        conditions, params = [], []
+        if status:
+            conditions.append('status = ?')
+            params.append(status)
+        if project_type:
+            conditions.append('project_type = ?')
+            params.append(normalize_project_type(project_type))
+        prefix = _normalize_postal_code(postal_prefix)
+        if prefix:
+            # Prefix match as an index range: prefix <= postal_code < prefix + U+10FFFF
+            conditions.append('postal_code >= ? AND postal_code < ?')
+            params.extend([prefix, prefix + '\U0010ffff'])
+        if created_from:
+            conditions.append('created_at >= ?')
+            params.append(created_from)
+        if created_to:
+            conditions.append('created_at < ?')
+            params.append(created_to)
+        if cursor:
+            conditions.append(f"(created_at, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        direction = 'DESC' if descending else 'ASC'
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        rows = self._connection().execute(
+            f'SELECT id, created_at, record FROM leads {where} '
+            f'ORDER BY created_at {direction}, id {direction} LIMIT ?',
+            (*params, limit + 1)
+        ).fetchall()
+
+        leads: List[Dict] = [json.loads(row['record']) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last['created_at'], last['id'])
+        return {'leads': leads, 'next_cursor': next_cursor}
+
+    def get(self, record_id: str) -> Optional[Dict]:
+        """
+        Look up one lead by record ID.
+
+        Args:
+            record_id: Local record ID
+
+        Returns:
+            The record as stored, or None if there is no such lead
+        """
+        self.refresh()
+        row = self._connection().execute('SELECT record FROM leads WHERE id = ?', (record_id,)).fetchone()
+        return json.loads(row['record']) if row else None
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
@@ -0,0 +1,104 @@
+"""
+RenovAI Canada - Lead Schema
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module defines the lead request model and its validation rules, and
+maps validated leads to Airtable field names. It has no side effects on
+import, so the API route and bulk tools (including process-pool workers)
+validate leads exactly the same way.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel, Field, EmailStr, validator
+
+# Accepted project types, in the order they are listed in error messages
+LEAD_PROJECT_TYPES = ('kitchen', 'bathroom', 'basement', 'full_home', 'addition', 'other')
+_LEAD_PROJECT_TYPE_SET = frozenset(LEAD_PROJECT_TYPES)
+_LEAD_PROJECT_TYPE_ERROR = f"Project type must be one of: {', '.join(LEAD_PROJECT_TYPES)}"
+
+# Lead Source recorded for leads submitted through the Custom GPT
+DEFAULT_LEAD_SOURCE = 'RenovAI ChatGPT Agent'
+
+def clean_phone(phone: str) -> str:
+    """
+    Remove common separators from a phone number.
+
+    Args:
+        phone: Phone number as entered, e.g. '+1 (604) 555-0123'
+
+    Returns:
+        Phone number without '-', ' ', '(', ')' and '+'
+    """
+    return phone.replace('-', '').replace(' ', '').replace('(', '').replace(')', '').replace('+', '')
+
+class LeadRequest(BaseModel):
+    """Request model for lead collection."""
+    name: str = Field(..., min_length=2, max_length=100, description="Customer's full name")
+    email: EmailStr = Field(..., description="Customer's email address")
+    phone: str = Field(..., min_length=10, max_length=20, description="Customer's phone number")
+    project_type: str = Field(..., description="Type of renovation project")
+    size_sqft: Optional[float] = Field(None, gt=0, description="Project size in square feet")
+    finish_level: Optional[str] = Field(None, description="Desired finish level")
+    postal_code: Optional[str] = Field(None, description="Project location postal code")
+    estimated_cost: Optional[float] = Field(None, description="Estimated cost from previous calculation")
+    project_notes: Optional[str] = Field(None, max_length=1000, description="Additional notes or requirements")
+
+    @validator('phone')
+    def validate_phone(cls, v):
+        """Basic phone number validation."""
+        cleaned = clean_phone(v)
+        if not cleaned.isdigit() or len(cleaned) < 10:
+            raise ValueError("Phone number must contain at least 10 digits")
+        return v
+
+    @validator('project_type')
+    def validate_project_type(cls, v):
+        """Validate project type."""
+        v = v.lower()
+        if v not in _LEAD_PROJECT_TYPE_SET:
+            raise ValueError(_LEAD_PROJECT_TYPE_ERROR)
+        return v
+
+def lead_fields(request: LeadRequest, lead_source: str = DEFAULT_LEAD_SOURCE,
+                submitted_at: Optional[str] = None) -> Dict:
+    """
+    Map a validated lead to Airtable fields, leaving out empty values.
+
+    Args:
+        request: Validated lead
+        lead_source: Value for the 'Lead Source' field
+        submitted_at: ISO timestamp for 'Submitted At' (defaults to now)
+
+    Returns:
+        Dictionary of Airtable field names to values
+    """
+    fields = {
+        'Name': request.name,
+        'Email': request.email,
+        'Phone': request.phone,
+        'Project Type': request.project_type.replace('_', ' ').title(),
+        'Size (sq ft)': request.size_sqft,
+        'Finish Level': request.finish_level.capitalize() if request.finish_level else None,
+        'Postal Code': request.postal_code,
+        'Estimated Cost': request.estimated_cost,
+        'Project Notes': request.project_notes,
+        'Lead Source': lead_source,
+        'Status': 'New',
+        'Submitted At': submitted_at or datetime.now().isoformat()
+    }
+    return {k: v for k, v in fields.items() if v is not None}
+
+def lead_key(email: str, phone: str) -> Tuple[str, str]:
+    """
+    Identity of a lead for de-duplication: lower-cased email and phone digits.
+
+    Args:
+        email: Email address
+        phone: Phone number in any common format
+
+    Returns:
+        Tuple of (normalized email, cleaned phone)
+    """
+    return (email or '').strip().lower(), clean_phone(phone or '')
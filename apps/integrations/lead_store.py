@@ -0,0 +1,495 @@
+"""
+RenovAI Canada - Lead Log Storage
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module provides an append-only JSON-Lines log for lead records. Each
+lead is one line appended under an exclusive file lock, so concurrent
+workers never lose writes and a write costs the same no matter how many
+leads are already stored. Lines are flushed to the OS immediately (safe
+against process crashes) and fsync'ed in batches (bounded loss on power
+failure). Reads stream the file line by line. LeadCounts keeps running
+totals per status and project type and LeadIndex maps hashed lead
+identities to record IDs, so neither counting nor de-duplication rescans
+the log.
+
+Usage (one-time conversion of the old JSON array file, from the apps/ directory):
+    python -m integrations.lead_store import integrations/mock_leads.json integrations/mock_leads.jsonl
+"""
+
+import abc
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from integrations.lead_schema import lead_key
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; fall back to in-process locking only
+    fcntl = None
+
+# fsync after this many appends or this many seconds, whichever comes first
+LEAD_LOG_FSYNC_EVERY = int(os.getenv('LEAD_LOG_FSYNC_EVERY', 16))
+LEAD_LOG_FSYNC_INTERVAL = float(os.getenv('LEAD_LOG_FSYNC_INTERVAL', 1.0))
+
+# Persist lead counters / the dedup index after this many new records (save() writes them at any time)
+LEAD_COUNTS_PERSIST_EVERY = int(os.getenv('LEAD_COUNTS_PERSIST_EVERY', 100))
+LEAD_INDEX_PERSIST_EVERY = int(os.getenv('LEAD_INDEX_PERSIST_EVERY', 1000))
+
+@contextmanager
+def _locked(f):
+    """Hold an exclusive advisory lock on an open file (no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _encode(record: Dict) -> bytes:
+    """Encode a record as one compact JSON line."""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+class LeadLog:
+    """Append-only JSON-Lines file of lead records."""
+
+    def __init__(self, path: str, fsync_every: int = LEAD_LOG_FSYNC_EVERY,
+                 fsync_interval: float = LEAD_LOG_FSYNC_INTERVAL):
+        """
+        Initialize the log (the file is created on first append).
+
+        Args:
+            path: Path to the .jsonl file
+            fsync_every: Appends between fsyncs (1 syncs every record)
+            fsync_interval: Maximum seconds between fsyncs, checked on append
+        """
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._lock = threading.RLock()
+        self._exclusive = False
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _open(self):
+        """Open the file for appending, terminating a torn last line if a crash left one."""
+        if self._file is None:
+            f = open(self.path, 'ab')
+            with _locked(f):
+                if f.tell() > 0:
+                    with open(self.path, 'rb') as reader:
+                        reader.seek(-1, os.SEEK_END)
+                        if reader.read(1) != b'\n':
+                            f.write(b'\n')
+                            f.flush()
+            self._file = f
+        return self._file
+
+    def _write(self, data: bytes, count: int) -> None:
+        """Append encoded lines under the file lock and fsync when the batch is due."""
+        with self._lock:
+            f = self._open()
+            if self._exclusive:
+                f.write(data)
+                f.flush()
+            else:
+                with _locked(f):
+                    f.write(data)
+                    f.flush()
+            self._unsynced += count
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+
+    def _sync(self) -> None:
+        """fsync pending appends (caller holds the lock)."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, record: Dict) -> None:
+        """
+        Append one record.
+
+        Args:
+            record: JSON-serializable lead record
+        """
+        self._write(_encode(record), 1)
+
+    def extend(self, records: Iterable[Dict]) -> int:
+        """
+        Append many records with a single locked write.
+
+        Args:
+            records: JSON-serializable lead records
+
+        Returns:
+            Number of records appended
+        """
+        lines = [_encode(record) for record in records]
+        if lines:
+            self._write(b''.join(lines), len(lines))
+        return len(lines)
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Hold the log's locks across several operations.
+
+        Other threads and processes cannot append until the block exits, so
+        a check of the log followed by an append (e.g. de-duplication) is
+        atomic. Appends made inside the block by this thread proceed.
+        """
+        with self._lock:
+            f = self._open()
+            with _locked(f):
+                self._exclusive = True
+                try:
+                    yield self
+                finally:
+                    self._exclusive = False
+
+    def sync(self) -> None:
+        """Force pending appends to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Sync and close the append handle (it reopens on the next append)."""
+        with self._lock:
+            self._sync()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __iter__(self) -> Iterator[Dict]:
+        """
+        Stream records in append order.
+
+        An unterminated last line (a write still in progress) and corrupt
+        lines are skipped.
+        """
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def count(self) -> int:
+        """Count records by streaming the file (no JSON parsing)."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return 0
+        with f:
+            return sum(1 for line in f if line.endswith(b'\n') and line.strip())
+
+class _LogFollower(abc.ABC):
+    """
+    State derived from a LeadLog and kept up to date incrementally.
+
+    The state remembers the byte offset of the log it has read up to and is
+    persisted next to the log. Refreshing only reads records appended since
+    then (by this or any other process), so the cost is O(1) per new lead. A
+    full rebuild happens only when the saved state is missing or stale: the
+    log file was replaced (different inode) or truncated.
+    """
+
+    suffix = ''
+
+    def __init__(self, log: LeadLog, path: Optional[str] = None, persist_every: int = 100):
+        """
+        Initialize the state, loading the persisted copy if there is one.
+
+        Args:
+            log: Lead log to follow
+            path: State file (default: <log name><suffix> next to the log)
+            persist_every: New records between saves of the state file
+        """
+        self.log = log
+        self.path = path or os.path.splitext(log.path)[0] + self.suffix
+        self.persist_every = max(1, persist_every)
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._reset()
+        self._load()
+
+    def _reset(self, inode: Optional[int] = None) -> None:
+        self.inode = inode
+        self.offset = 0
+        self._clear()
+
+    @abc.abstractmethod
+    def _clear(self) -> None:
+        """Reset the derived state to empty."""
+
+    @abc.abstractmethod
+    def _state(self) -> Dict[str, Any]:
+        """Derived state to persist."""
+
+    @abc.abstractmethod
+    def _restore(self, state: Dict[str, Any]) -> None:
+        """Load derived state saved by _state()."""
+
+    @abc.abstractmethod
+    def _add(self, record: Dict) -> None:
+        """Apply one record appended to the log."""
+
+    def _load(self) -> None:
+        """Load the persisted state; missing or unreadable files leave it empty."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.inode = state['inode']
+            self.offset = int(state['offset'])
+            self._restore(state)
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            self._reset()
+
+    def _save(self) -> None:
+        """Atomically write the state file (caller holds the lock)."""
+        state = {'inode': self.inode, 'offset': self.offset, **self._state()}
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def refresh(self) -> None:
+        """Apply records appended to the log since the last refresh."""
+        with self._lock:
+            try:
+                stat = os.stat(self.log.path)
+            except FileNotFoundError:
+                if self.offset:
+                    self._reset()
+                    self._save()
+                return
+            if stat.st_ino == self.inode and stat.st_size == self.offset:
+                return
+
+            rebuilt = stat.st_ino != self.inode or stat.st_size < self.offset
+            if rebuilt:
+                self._reset(stat.st_ino)
+
+            with open(self.log.path, 'rb') as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # write in progress; read it next time
+                    self.offset += len(line)
+                    if not line.strip():
+                        continue
+                    try:
+                        self._add(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+                    self._unsaved += 1
+
+            if rebuilt or self._unsaved >= self.persist_every:
+                self._save()
+
+    def save(self) -> None:
+        """Persist the state now."""
+        with self._lock:
+            self._save()
+
+class LeadCounts(_LogFollower):
+    """Running lead totals (overall, per status, per project type) for a LeadLog."""
+
+    suffix = '.counts.json'
+
+    def __init__(self, log: LeadLog, path: Optional[str] = None,
+                 persist_every: int = LEAD_COUNTS_PERSIST_EVERY):
+        super().__init__(log, path, persist_every)
+
+    def _clear(self) -> None:
+        self.total = 0
+        self.by_status: Counter = Counter()
+        self.by_project_type: Counter = Counter()
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'by_status': dict(self.by_status),
+            'by_project_type': dict(self.by_project_type),
+        }
+
+    def _restore(self, state: Dict[str, Any]) -> None:
+        self.total = int(state['total'])
+        self.by_status = Counter(state['by_status'])
+        self.by_project_type = Counter(state['by_project_type'])
+
+    def _add(self, record: Dict) -> None:
+        fields = record.get('fields', record)
+        self.total += 1
+        self.by_status[fields.get('Status') or 'Unknown'] += 1
+        self.by_project_type[fields.get('Project Type') or 'Unknown'] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get current totals (call refresh() first to include new records).
+
+        Returns:
+            Dictionary with total_leads, by_status and by_project_type
+        """
+        with self._lock:
+            return {
+                'total_leads': self.total,
+                'by_status': dict(self.by_status),
+                'by_project_type': dict(self.by_project_type),
+            }
+
+def _hash_key(*parts: str) -> str:
+    """Short hash of an index key, so the index file holds no contact details."""
+    return hashlib.blake2b('\n'.join(parts).encode('utf-8'), digest_size=10).hexdigest()
+
+class LeadIndex(_LogFollower):
+    """
+    Hashed lookup of existing leads for de-duplication.
+
+    Maps each lead's identity (normalized email + phone digits, see
+    lead_schema.lead_key) and each idempotency key to the first record
+    stored with it, so duplicate checks are a dictionary lookup instead of
+    a scan of the log.
+    """
+
+    suffix = '.index.json'
+
+    def __init__(self, log: LeadLog, path: Optional[str] = None,
+                 persist_every: int = LEAD_INDEX_PERSIST_EVERY):
+        super().__init__(log, path, persist_every)
+
+    def _clear(self) -> None:
+        self.by_identity: Dict[str, List[str]] = {}
+        self.by_idempotency_key: Dict[str, List[str]] = {}
+
+    def _state(self) -> Dict[str, Any]:
+        return {'by_identity': self.by_identity, 'by_idempotency_key': self.by_idempotency_key}
+
+    def _restore(self, state: Dict[str, Any]) -> None:
+        self.by_identity = dict(state['by_identity'])
+        self.by_idempotency_key = dict(state['by_idempotency_key'])
+
+    def _add(self, record: Dict) -> None:
+        fields = record.get('fields', {})
+        entry = [record.get('id'), record.get('created_at')]
+        identity = lead_key(fields.get('Email'), fields.get('Phone'))
+        if all(identity):
+            self.by_identity.setdefault(_hash_key(*identity), entry)
+        if record.get('idempotency_key'):
+            self.by_idempotency_key.setdefault(_hash_key(record['idempotency_key']), entry)
+
+    def find(self, identity: Optional[Tuple[str, str]] = None,
+             idempotency_key: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        Look up an existing lead (call refresh() first to include new records).
+
+        Args:
+            identity: Normalized (email, phone) of the lead
+            idempotency_key: Idempotency key sent with the request
+
+        Returns:
+            (record_id, created_at) of the existing lead, or None
+        """
+        with self._lock:
+            entry = None
+            if idempotency_key:
+                entry = self.by_idempotency_key.get(_hash_key(idempotency_key))
+            if entry is None and identity:
+                entry = self.by_identity.get(_hash_key(*identity))
+            return tuple(entry) if entry else None
+
+    def __len__(self) -> int:
+        return len(self.by_identity)
+
+def _file_mode(path: str) -> int:
+    """Permission bits for a file replacing path: the existing file's, else the umask default."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def import_json_array(json_path: str, log_path: str, overwrite: bool = False) -> Optional[int]:
+    """
+    Convert a JSON array of lead records (the old mock_leads.json) into a lead log.
+
+    The log is written to a temporary file and moved into place, so a
+    failed import never leaves a partial log behind.
+
+    Args:
+        json_path: Path to the JSON array file
+        log_path: Path of the .jsonl log to create
+        overwrite: Replace log_path if it already exists
+
+    Returns:
+        Number of records imported, or None if log_path exists and overwrite is False
+    """
+    if os.path.exists(log_path) and not overwrite:
+        return None
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        try:
+            records = json.load(f)
+        except json.JSONDecodeError:
+            records = []
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(log_path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for record in records:
+                out.write(_encode(record))
+            out.flush()
+            os.fsync(out.fileno())
+        # mkstemp creates the file 0600; give the log the permissions a normal open() would
+        os.chmod(tmp_path, _file_mode(log_path))
+        os.replace(tmp_path, log_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(records)
+
+def main():
+    parser = argparse.ArgumentParser(description="Lead log utilities")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import', help="Convert a JSON array file into a lead log")
+    import_parser.add_argument('json_path', help="Existing JSON array file (e.g. mock_leads.json)")
+    import_parser.add_argument('log_path', help="Lead log to create (e.g. mock_leads.jsonl)")
+    import_parser.add_argument('--overwrite', action='store_true', help="Replace an existing lead log")
+    count_parser = subparsers.add_parser('count', help="Count the records in a lead log")
+    count_parser.add_argument('log_path')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        imported = import_json_array(args.json_path, args.log_path, overwrite=args.overwrite)
+        if imported is None:
+            parser.error(f"{args.log_path} already exists (use --overwrite to replace it)")
+        print(f"Imported {imported} leads into {args.log_path}")
+    else:
+        print(LeadLog(args.log_path).count())
+
+if __name__ == '__main__':
+    main()
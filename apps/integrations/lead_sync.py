@@ -0,0 +1,330 @@
+"""
+RenovAI Canada - Background Lead Sync
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module forwards leads from the local lead log to Airtable in the
+background. The lead log is the durable queue: create_lead only appends
+to it and returns, and LeadSyncWorker sends the records appended since its
+saved cursor in batches of up to 10 (Airtable's per-request limit).
+
+Transient failures (network errors, 429 and 5xx responses) are retried
+with exponential backoff, honouring Retry-After, and the cursor only moves
+forward once a batch is accepted, so no lead is lost across restarts.
+Records Airtable rejects outright are written to a dead-letter file.
+
+Every worker process runs its own LeadSyncWorker over the shared log. A
+flush holds an exclusive file lock next to the cursor and re-reads the
+cursor under it, so each range of the log is sent by one process only.
+"""
+
+import asyncio
+import json
+import os
+import random
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from integrations.lead_store import LeadLog
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; fall back to in-process locking only
+    fcntl = None
+
+# Airtable accepts at most 10 records per create request
+AIRTABLE_MAX_BATCH = 10
+
+# Seconds between checks for new leads, and retry/backoff limits
+LEAD_SYNC_INTERVAL = float(os.getenv('LEAD_SYNC_INTERVAL', 1.0))
+LEAD_SYNC_MAX_RETRIES = int(os.getenv('LEAD_SYNC_MAX_RETRIES', 5))
+LEAD_SYNC_BACKOFF_BASE = float(os.getenv('LEAD_SYNC_BACKOFF_BASE', 1.0))
+LEAD_SYNC_BACKOFF_MAX = float(os.getenv('LEAD_SYNC_BACKOFF_MAX', 60.0))
+
+class LeadSyncError(Exception):
+    """A batch could not be delivered; retryable errors are tried again later."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Network errors, rate limiting and server errors are worth retrying."""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+class LeadSyncWorker:
+    """Sends new lead log records to Airtable from a background task."""
+
+    def __init__(self, log: LeadLog, send_batch: Callable[[List[Dict]], Awaitable[List[str]]],
+                 cursor_path: Optional[str] = None, batch_size: int = AIRTABLE_MAX_BATCH,
+                 interval: float = LEAD_SYNC_INTERVAL, max_retries: int = LEAD_SYNC_MAX_RETRIES,
+                 backoff_base: float = LEAD_SYNC_BACKOFF_BASE, backoff_max: float = LEAD_SYNC_BACKOFF_MAX):
+        """
+        Initialize the worker, resuming from the saved cursor.
+
+        Args:
+            log: Lead log to forward
+            send_batch: Coroutine function that creates records from a list of
+                field dicts and returns their remote IDs; raises LeadSyncError
+            cursor_path: Cursor file (default: <log name>.sync.json next to the log)
+            batch_size: Records per request (at most 10)
+            interval: Seconds between checks for new records
+            max_retries: Retries of a failing batch before waiting for the next interval
+            backoff_base: First retry delay in seconds (doubled on each retry)
+            backoff_max: Upper bound for a single retry delay
+        """
+        self.log = log
+        self.send_batch = send_batch
+        self.cursor_path = cursor_path or os.path.splitext(log.path)[0] + '.sync.json'
+        # The cursor file is replaced on every save, so processes lock a separate file
+        self.lock_path = self.cursor_path + '.lock'
+        self.failed_path = os.path.splitext(log.path)[0] + '.failed.jsonl'
+        self.batch_size = max(1, min(batch_size, AIRTABLE_MAX_BATCH))
+        self.interval = interval
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.offset = 0
+        self.sent = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._load_cursor()
+
+    def _read_cursor(self) -> Dict:
+        try:
+            with open(self.cursor_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return {'offset': int(state['offset']), 'sent': int(state.get('sent', 0)),
+                    'failed': int(state.get('failed', 0))}
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return {'offset': 0, 'sent': 0, 'failed': 0}
+
+    def _load_cursor(self) -> None:
+        state = self._read_cursor()
+        self.offset, self.sent, self.failed = state['offset'], state['sent'], state['failed']
+
+    def _save_cursor(self) -> None:
+        state = {'offset': self.offset, 'sent': self.sent, 'failed': self.failed}
+        tmp_path = f'{self.cursor_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.cursor_path)
+
+    @contextmanager
+    def _process_lock(self):
+        """
+        Hold the cross-process sync lock, or yield False if another process holds it.
+
+        Waiting is pointless: the holder sends everything up to the end of the log.
+        """
+        if fcntl is None:
+            yield True
+            return
+        with open(self.lock_path, 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_batch(self) -> Tuple[List[Tuple[Dict, int]], int]:
+        """
+        Read up to batch_size complete records after the cursor.
+
+        Returns:
+            Tuple of ((record, log offset just past its line) pairs,
+            log offset just past the last line read)
+        """
+        try:
+            size = os.path.getsize(self.log.path)
+        except FileNotFoundError:
+            return [], self.offset
+        if size < self.offset:
+            print("⚠️  Lead log shrank below the sync cursor; resending from the start")
+            self.offset = 0
+
+        records = []
+        end = self.offset
+        with open(self.log.path, 'rb') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                end += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    records.append((json.loads(line), end))
+                except json.JSONDecodeError:
+                    continue
+                if len(records) >= self.batch_size:
+                    break
+        return records, end
+
+    def pending(self) -> int:
+        """Count records not yet sent (streams the unsent part of the log)."""
+        offset = self._read_cursor()['offset']  # the saved cursor, which other processes also move
+        try:
+            with open(self.log.path, 'rb') as f:
+                f.seek(offset)
+                return sum(1 for line in f if line.endswith(b'\n') and line.strip())
+        except FileNotFoundError:
+            return 0
+
+    def _backoff(self, attempt: int, error: LeadSyncError) -> float:
+        """Delay before retry number attempt (Retry-After wins when given)."""
+        if error.retry_after is not None:
+            return error.retry_after
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay * (0.5 + random.random() / 2)  # jitter so workers do not retry in lockstep
+
+    async def _send(self, fields: List[Dict]) -> None:
+        """Send one batch, retrying transient errors; raises the last LeadSyncError."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.send_batch(fields)
+                return
+            except LeadSyncError as e:
+                if not e.retryable or attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, e)
+                print(f"⚠️  Airtable sync failed ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def _dead_letter(self, record: Dict, error: LeadSyncError) -> None:
+        with open(self.failed_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'record': record, 'error': str(error), 'status_code': error.status_code},
+                               ensure_ascii=False) + '\n')
+        self.failed += 1
+
+    async def _deliver(self, records: List[Tuple[Dict, int]]) -> None:
+        """
+        Deliver a batch; if Airtable rejects it, retry records one by one and dead-letter the bad ones.
+
+        In the one-by-one pass the cursor moves past each record as it is handled, so
+        a retryable error part-way through does not send the earlier records again.
+        """
+        try:
+            await self._send([record['fields'] for record, _ in records])
+            self.sent += len(records)
+        except LeadSyncError as e:
+            if e.retryable:
+                raise
+            if len(records) == 1:
+                self._dead_letter(records[0][0], e)
+                return
+            for record, end in records:
+                try:
+                    await self._send([record['fields']])
+                    self.sent += 1
+                except LeadSyncError as single_error:
+                    if single_error.retryable:
+                        raise
+                    self._dead_letter(record, single_error)
+                self.offset = end
+                await asyncio.to_thread(self._save_cursor)
+
+    async def flush(self) -> int:
+        """
+        Send every record appended since the cursor.
+
+        Only one process flushes a log at a time; in the others this returns 0
+        right away.
+
+        Returns:
+            Number of records sent or dead-lettered in this call
+
+        Raises:
+            LeadSyncError: If a batch still fails after all retries (the cursor
+                stays before it, so it is sent again on the next flush)
+        """
+        handled = 0
+        async with self._flush_lock:
+            with self._process_lock() as acquired:
+                if not acquired:
+                    return handled
+                # Another process may have sent records since this one last looked
+                await asyncio.to_thread(self._load_cursor)
+                while True:
+                    records, end = await asyncio.to_thread(self._read_batch)
+                    if not records:
+                        if end != self.offset:  # skipped blank or corrupt lines
+                            self.offset = end
+                            await asyncio.to_thread(self._save_cursor)
+                        return handled
+                    await self._deliver(records)
+                    self.offset = end
+                    handled += len(records)
+                    await asyncio.to_thread(self._save_cursor)
+
+    def notify(self) -> None:
+        """Wake the worker to flush now instead of at the next interval (thread-safe)."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self) -> None:
+        """Flush until cancelled, waking every interval or on notify(); errors are retried on the next wake."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await self.flush()
+                self.last_error = None
+            except LeadSyncError as e:
+                self.last_error = str(e)
+                print(f"❌ Airtable sync paused: {e}")
+            except Exception as e:
+                # A bug or an unexpected error must not end the task and leave leads unsent
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"❌ Airtable sync failed unexpectedly: {self.last_error}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> asyncio.Task:
+        """Start run() as a task on the current event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background task after one last flush attempt of at most timeout seconds."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except (LeadSyncError, asyncio.TimeoutError) as e:
+            print(f"⚠️  {self.pending()} lead(s) left for the next sync: {e or 'timed out'}")
+
+    def stats(self) -> Dict:
+        """
+        Get sync progress.
+
+        Returns:
+            Dictionary with sent, failed and pending counts and the last error
+        """
+        state = self._read_cursor()
+        return {
+            'sent': state['sent'],
+            'failed': state['failed'],
+            'pending': self.pending(),
+            'last_error': self.last_error,
+        }
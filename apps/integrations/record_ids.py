@@ -0,0 +1,91 @@
+"""
+RenovAI Canada - Record ID Generator
+Copyright (c) 2025 Saeed Alaediny. All rights reserved.
+
+This module generates ULIDs: 26-character, Crockford base32 identifiers
+made of a 48-bit millisecond timestamp followed by 80 random bits. They
+sort by creation time as plain strings, and 80 bits of randomness make
+collisions between threads, processes or servers practically impossible.
+
+Within a process, IDs are strictly increasing: when several are created
+in the same millisecond the random part is incremented instead of redrawn.
+The state is reset in forked children, so uvicorn/gunicorn workers never
+continue the same sequence as their parent.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Crockford's base32 alphabet (no I, L, O, U)
+_ENCODING = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_DECODING = {c: i for i, c in enumerate(_ENCODING)}
+# Two characters per 10 bits: 13 table lookups encode the 130-bit (26-character) ID
+_PAIRS = [a + b for a in _ENCODING for b in _ENCODING]
+_PAIR_SHIFTS = tuple(range(120, -1, -10))
+_RANDOM_BITS = 80
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_random = 0
+
+def _reset_after_fork() -> None:
+    global _lock, _last_ms, _last_random
+    _lock = threading.Lock()
+    _last_ms = -1
+    _last_random = 0
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def new_ulid() -> str:
+    """
+    Generate a new ULID.
+
+    Returns:
+        26-character ID, greater than every ID generated before it in this process
+    """
+    global _last_ms, _last_random
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _last_ms:
+            # Same millisecond (or the clock stepped back): stay monotonic
+            ms = _last_ms
+            random_part = _last_random + 1
+            if random_part >> _RANDOM_BITS:
+                ms += 1
+                random_part = int.from_bytes(os.urandom(10), 'big')
+        else:
+            random_part = int.from_bytes(os.urandom(10), 'big')
+        _last_ms, _last_random = ms, random_part
+
+    value = (ms << _RANDOM_BITS) | random_part
+    return ''.join([_PAIRS[(value >> shift) & 1023] for shift in _PAIR_SHIFTS])
+
+def new_record_id(prefix: str = 'rec') -> str:
+    """
+    Generate a record ID such as 'rec01JA2B3C4D5E6F7G8H9J0KMNPQ'.
+
+    Args:
+        prefix: Prefix identifying the record type
+
+    Returns:
+        Prefixed ULID
+    """
+    return prefix + new_ulid()
+
+def ulid_timestamp(ulid: str) -> datetime:
+    """
+    Get the creation time encoded in a ULID (or a prefixed record ID).
+
+    Args:
+        ulid: ULID, optionally with a prefix
+
+    Returns:
+        UTC creation time with millisecond precision
+    """
+    value = 0
+    for char in ulid[-26:-16]:
+        value = value * 32 + _DECODING[char.upper()]
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc)